@@ -0,0 +1,20 @@
+import statistics
+
+PLATFORMS = ["YouTube Shorts", "LinkedIn Video", "TikTok", "Pinterest Idea", "Twitter"]
+
+# Accounts, profiles and videos created by the bench scripts start with this
+BENCH_PREFIX = "bench-"
+
+def arg(argv, name, default):
+    """Value after `name` in argv, converted to the type of `default`"""
+    if name in argv:
+        return type(default)(argv[argv.index(name) + 1])
+    return default
+
+def percentile(values, pct):
+    """pct-th percentile of a sorted list (None when empty)"""
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
@@ -0,0 +1,149 @@
+import sys
+import json
+import time
+import shutil
+import socket
+import tempfile
+import threading
+import subprocess
+import requests
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from playwright.sync_api import sync_playwright
+
+DEFAULT_PORT = 54399
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+class FakeBitBrowser:
+    """
+    Local stand-in for the BitBrowser API: /browser/open launches a headless
+    Chromium with remote debugging and returns its CDP websocket, just like
+    BitBrowser does for a real profile. /browser/close and
+    /browser/pids/alive work the same way too.
+    """
+
+    def __init__(self, port=DEFAULT_PORT, open_delay=0.0):
+        self.port = port
+        self.open_delay = open_delay
+        self.profiles = {}        # profile_id -> (process, user data dir, ws url)
+        self.lock = threading.Lock()
+        self.opens = 0
+        with sync_playwright() as p:
+            self.chromium = p.chromium.executable_path
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+
+    @property
+    def api_url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def _launch(self, profile_id):
+        debug_port = free_port()
+        data_dir = tempfile.mkdtemp(prefix="fakebit-")
+        proc = subprocess.Popen([
+            self.chromium,
+            "--headless=new",
+            f"--remote-debugging-port={debug_port}",
+            f"--user-data-dir={data_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "about:blank",
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        deadline = time.monotonic() + 20
+        while time.monotonic() < deadline:
+            try:
+                info = requests.get(f"http://127.0.0.1:{debug_port}/json/version", timeout=1).json()
+                return proc, data_dir, info["webSocketDebuggerUrl"]
+            except (requests.RequestException, ValueError, KeyError):
+                time.sleep(0.1)
+
+        proc.kill()
+        shutil.rmtree(data_dir, ignore_errors=True)
+        raise RuntimeError("Chromium did not expose a CDP endpoint in 20s")
+
+    def open(self, profile_id):
+        with self.lock:
+            if profile_id in self.profiles and self.profiles[profile_id][0].poll() is None:
+                return self.profiles[profile_id][2]
+        time.sleep(self.open_delay)
+        proc, data_dir, ws = self._launch(profile_id)
+        with self.lock:
+            self.profiles[profile_id] = (proc, data_dir, ws)
+            self.opens += 1
+        return ws
+
+    def close(self, profile_id):
+        with self.lock:
+            entry = self.profiles.pop(profile_id, None)
+        if entry is None:
+            return
+        proc, data_dir, _ = entry
+        proc.terminate()
+        try:
+            proc.wait(5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    def alive_pids(self, profile_ids):
+        with self.lock:
+            return {
+                pid: entry[0].pid for pid, entry in self.profiles.items()
+                if pid in profile_ids and entry[0].poll() is None
+            }
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                try:
+                    if self.path == "/browser/open":
+                        reply = {"success": True, "data": {"ws": fake.open(body["id"])}}
+                    elif self.path == "/browser/close":
+                        fake.close(body["id"])
+                        reply = {"success": True}
+                    elif self.path == "/browser/pids/alive":
+                        reply = {"success": True, "data": fake.alive_pids(body.get("ids", []))}
+                    else:
+                        reply = {"success": False, "msg": f"Unknown endpoint {self.path}"}
+                except Exception as e:
+                    reply = {"success": False, "msg": str(e)}
+
+                data = json.dumps(reply).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print(f"🧪 Fake BitBrowser listening on {self.api_url}")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        for profile_id in list(self.profiles):
+            self.close(profile_id)
+
+if __name__ == "__main__":
+    port = int(sys.argv[sys.argv.index("--port") + 1]) if "--port" in sys.argv else DEFAULT_PORT
+    fake = FakeBitBrowser(port).start()
+    print("Point API_URL in config.py here. Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        fake.stop()
+        print("\nFake BitBrowser stopped.")
\ No newline at end of file
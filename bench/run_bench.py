@@ -0,0 +1,262 @@
+import os
+import sys
+import time
+import tempfile
+import threading
+from urllib.parse import urlparse
+import core.db as db
+import core.db_scheduler as scheduler
+import config.config as config
+import utils.waits as waits
+import utils.spans as spans
+import utils.profile_sessions as profile_sessions
+from bench.fake_bitbrowser import FakeBitBrowser, DEFAULT_PORT
+from bench.common import PLATFORMS, BENCH_PREFIX, arg, percentile
+
+# Failed posts come back after a backoff (next_attempt_at); stop waiting for them after this
+DEFAULT_DEADLINE_SECONDS = 600
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Host each bot navigates to -> fixture page served in its place
+FIXTURE_HOSTS = {
+    "studio.youtube.com": "youtube.html",
+    "www.linkedin.com": "linkedin.html",
+    "www.tiktok.com": "tiktok.html",
+    "www.pinterest.com": "pinterest.html",
+    "x.com": "twitter.html",
+}
+
+def load_fixtures(upload_ms):
+    fixtures = {}
+    for host, name in FIXTURE_HOSTS.items():
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+            fixtures[host] = f.read().replace("__UPLOAD_MS__", str(upload_ms))
+    return fixtures
+
+class FixtureSessionManager(profile_sessions.ProfileSessionManager):
+    """ProfileSessionManager whose pages get the fixture sites instead of the real ones"""
+
+    def __init__(self, fixtures, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fixtures = fixtures
+
+    def _open(self, profile_id):
+        session = super()._open(profile_id)
+        session.browser.contexts[0].route("**/*", self._serve)
+        return session
+
+    def _serve(self, route):
+        host = urlparse(route.request.url).hostname
+        if route.request.resource_type == "document" and host in self.fixtures:
+            route.fulfill(status=200, content_type="text/html", body=self.fixtures[host])
+        else:
+            route.fulfill(status=204, body="")
+
+def check_scratch_database(conn):
+    """
+    Bench workers claim any due post (claim_due_posts), so refuse to run next
+    to posts they could pick up: those of any enabled account, including
+    bench accounts kept from an earlier run, that are due within a day.
+    """
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT COUNT(*)
+        FROM platform_schedules ps
+        JOIN social_accounts sa ON ps.account_id = sa.id
+        WHERE ps.posted = FALSE AND ps.retry_count < 3
+          AND sa.enabled = TRUE
+          AND COALESCE(ps.next_attempt_at, ps.scheduled_time) <= NOW() + INTERVAL '1 day'
+    """)
+    claimable = cur.fetchone()[0]
+    cur.close()
+    return claimable == 0
+
+def enqueue(conn, videos, accounts, media_path):
+    """Create bench accounts and videos and make every resulting post due now"""
+    cur = conn.cursor()
+    run_id = int(time.time())
+
+    cur.execute("""
+        INSERT INTO social_accounts (platform, account_name, bitbrowser_profile_id)
+        SELECT * FROM unnest(%s::varchar[], %s::varchar[], %s::varchar[])
+        RETURNING id
+    """, (
+        [PLATFORMS[i % len(PLATFORMS)] for i in range(accounts)],
+        [f"{BENCH_PREFIX}{run_id}-account-{i}" for i in range(accounts)],
+        [f"{BENCH_PREFIX}{run_id}-profile-{i}" for i in range(accounts)],
+    ))
+    account_ids = [row[0] for row in cur.fetchall()]
+
+    cur.execute("""
+        INSERT INTO social_queue (video_path, title, description)
+        SELECT %s, 'Bench video ' || n, 'Benchmark run #bench'
+        FROM generate_series(1, %s) n
+        RETURNING id
+    """, (media_path, videos))
+    job_ids = [row[0] for row in cur.fetchall()]
+    conn.commit()
+
+    scheduler.create_schedules_for_jobs(conn, job_ids, account_ids)
+
+    cur.execute("""
+        UPDATE platform_schedules SET scheduled_time = NOW() - INTERVAL '1 second'
+        WHERE queue_id = ANY(%s) AND account_id = ANY(%s)
+        RETURNING id
+    """, (job_ids, account_ids))
+    schedule_ids = [row[0] for row in cur.fetchall()]
+    conn.commit()
+    cur.close()
+
+    return job_ids, account_ids, schedule_ids
+
+def pending_count(schedule_ids):
+    with db.connection() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT COUNT(*) FROM platform_schedules
+            WHERE id = ANY(%s) AND posted = FALSE AND retry_count < 3
+        """, (schedule_ids,))
+        count = cur.fetchone()[0]
+        cur.close()
+        return count
+
+def bench_worker(worker_id, fixtures, schedule_ids, deadline):
+    """
+    worker_loop without the idle waits: stop once every bench post is done,
+    or at `deadline` (time.monotonic()) if failed posts are still backed off
+    """
+    tag = f"[B{worker_id}] "
+    sessions = FixtureSessionManager(fixtures, scheduler.WARM_PROFILES_PER_WORKER, scheduler.WARM_IDLE_SECONDS)
+
+    try:
+        while True:
+            scheduler.sync_warm_profiles(worker_id, sessions)
+            post = scheduler.claim_post(worker_id, tag)
+
+            if not post:
+                pending = pending_count(schedule_ids)
+                if pending == 0:
+                    break
+                if time.monotonic() >= deadline:
+                    print(f"⏰ {tag}Deadline reached with {pending} bench post(s) still waiting for a retry")
+                    break
+                time.sleep(0.5)
+                continue
+
+            try:
+                scheduler.run_post(post, sessions, worker_id, tag)
+            finally:
+                scheduler.sync_warm_profiles(worker_id, sessions)
+                scheduler.release_post(post)
+    finally:
+        sessions.close_all()
+
+def report(conn, schedule_ids, elapsed, fake):
+    cur = conn.cursor()
+    columns = ["total"] + spans.STAGES
+    cur.execute(f"""
+        SELECT platform, outcome, {", ".join(f"{column}_ms" for column in columns)}
+        FROM post_attempts
+        WHERE schedule_id = ANY(%s)
+    """, (schedule_ids,))
+    rows = cur.fetchall()
+    cur.close()
+
+    succeeded = sum(1 for row in rows if row[1] == "success")
+
+    print("\n" + "=" * 60)
+    print("🏁 BENCHMARK RESULTS")
+    print("=" * 60)
+    print(f"Posts:               {succeeded} ok / {len(rows)} attempts")
+    print(f"Wall time:           {elapsed:.1f}s")
+    print(f"Throughput:          {succeeded / (elapsed / 60):.1f} posts/min")
+    print(f"Browser launches:    {fake.opens}")
+
+    for platform in sorted({row[0] for row in rows}):
+        platform_rows = [row for row in rows if row[0] == platform]
+        print(f"\n🎯 {platform} ({len(platform_rows)} attempts)")
+        print(f"   {'Stage':<14}{'p50':>9}{'p95':>9}")
+        for i, column in enumerate(columns):
+            values = sorted(row[2 + i] for row in platform_rows if row[2 + i] is not None)
+            p50, p95 = percentile(values, 50), percentile(values, 95)
+            p50 = f"{p50 / 1000:.2f}s" if p50 is not None else "-"
+            p95 = f"{p95 / 1000:.2f}s" if p95 is not None else "-"
+            print(f"   {column:<14}{p50:>9}{p95:>9}")
+
+    print("=" * 60)
+
+def cleanup(conn, job_ids, account_ids, schedule_ids):
+    cur = conn.cursor()
+    cur.execute("DELETE FROM post_attempts WHERE schedule_id = ANY(%s)", (schedule_ids,))
+    cur.execute("DELETE FROM social_queue WHERE id = ANY(%s)", (job_ids,))
+    cur.execute("DELETE FROM social_accounts WHERE id = ANY(%s)", (account_ids,))
+    conn.commit()
+    cur.close()
+    print("🧹 Removed bench videos, accounts and attempts")
+
+def main(argv):
+    videos = arg(argv, "--videos", 5)
+    accounts = arg(argv, "--accounts", 5)
+    workers = arg(argv, "--workers", 2)
+    upload_ms = arg(argv, "--upload-ms", 1500)
+    port = arg(argv, "--port", DEFAULT_PORT)
+    deadline_seconds = arg(argv, "--deadline", DEFAULT_DEADLINE_SECONDS)
+
+    print("=" * 60)
+    print("🧪 OFFLINE POSTING BENCHMARK")
+    print(f"  {videos} video(s) × {accounts} account(s), {workers} worker(s), {upload_ms}ms fake uploads")
+    print("=" * 60)
+
+    with db.connection() as conn:
+        if not check_scratch_database(conn):
+            print("❌ This database has posts due for enabled accounts. Point db_config.py at a scratch copy first,")
+            print(f"   and delete bench accounts kept from earlier runs ('{BENCH_PREFIX}%' profiles).")
+            return
+
+    fake = FakeBitBrowser(port).start()
+    config.API_URL = fake.api_url
+
+    # Post as fast as the pages allow unless we are measuring the human pacing too
+    scheduler.PRE_POST_WAIT = (0, 0)
+    scheduler.rate_limiter.enabled = False
+    if "--no-jitter" in argv:
+        config.HUMAN_JITTER = {name: {"scale": 0, "budget": 0} for name in waits.PLATFORM_JITTER}
+
+    media = tempfile.NamedTemporaryFile(prefix="bench-", suffix=".mp4", delete=False)
+    media.write(os.urandom(256 * 1024))
+    media.close()
+
+    with db.connection() as conn:
+        job_ids, account_ids, schedule_ids = enqueue(conn, videos, accounts, media.name)
+    print(f"📥 Enqueued {len(schedule_ids)} post(s)")
+
+    fixtures = load_fixtures(upload_ms)
+    started = time.monotonic()
+    threads = [
+        threading.Thread(target=bench_worker, args=(worker_id, fixtures, schedule_ids, started + deadline_seconds))
+        for worker_id in range(1, workers + 1)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - started
+
+    try:
+        with db.connection() as conn:
+            report(conn, schedule_ids, elapsed, fake)
+            if "--keep" not in argv:
+                cleanup(conn, job_ids, account_ids, schedule_ids)
+    finally:
+        fake.stop()
+        os.unlink(media.name)
+
+if __name__ == "__main__":
+    if "--help" in sys.argv:
+        print("Usage:")
+        print("  python bench/run_bench.py [--videos N] [--accounts M] [--workers W]")
+        print("                            [--upload-ms MS] [--port PORT] [--deadline S] [--no-jitter] [--keep]")
+        print("Runs against the database in db_config.py. Use a scratch copy.")
+    else:
+        main(sys.argv)
\ No newline at end of file
@@ -0,0 +1,274 @@
+import os
+import sys
+import time
+import random
+import datetime
+import contextlib
+from collections import Counter
+import core.db as db
+import core.db_scheduler as scheduler
+import utils.clock as clock
+from bench.common import PLATFORMS, BENCH_PREFIX, arg, percentile
+
+OPERATIONS = ["create_schedules_for_job", "fetch_next_pending_post", "update_post_status"]
+
+def say(message):
+    """Progress output (the scheduler's own prints are silenced during the run)"""
+    print(message, file=sys.__stdout__, flush=True)
+
+def check_scratch_database(conn):
+    """
+    create_schedules_for_job schedules every enabled account and
+    fetch_next_pending_post posts for any of them, so no enabled account may
+    exist before the run: neither real ones nor sim accounts left over from
+    an interrupted run. The simulation then only sees its own rows.
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT COUNT(*) FROM social_accounts WHERE enabled = TRUE")
+    enabled_accounts = cur.fetchone()[0]
+    cur.close()
+    return enabled_accounts == 0
+
+def create_accounts(conn, accounts):
+    cur = conn.cursor()
+    run_id = int(time.time())
+    cur.execute("""
+        INSERT INTO social_accounts (platform, account_name, bitbrowser_profile_id)
+        SELECT * FROM unnest(%s::varchar[], %s::varchar[], %s::varchar[])
+        RETURNING id
+    """, (
+        [PLATFORMS[i % len(PLATFORMS)] for i in range(accounts)],
+        [f"{BENCH_PREFIX}sim-{run_id}-account-{i}" for i in range(accounts)],
+        [f"{BENCH_PREFIX}sim-{run_id}-profile-{i}" for i in range(accounts)],
+    ))
+    account_ids = [row[0] for row in cur.fetchall()]
+    conn.commit()
+    cur.close()
+    return account_ids
+
+def add_job(conn, n):
+    cur = conn.cursor()
+    cur.execute("""
+        INSERT INTO social_queue (video_path, title, description)
+        VALUES (%s, %s, 'Simulated video')
+        RETURNING id
+    """, (f"{BENCH_PREFIX}sim-{n}.mp4", f"Simulated video {n}"))
+    job_id = cur.fetchone()[0]
+    conn.commit()
+    cur.close()
+    return job_id
+
+def next_scheduled_after(conn, moment, account_ids):
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT MIN(COALESCE(next_attempt_at, scheduled_time)) FROM platform_schedules
+        WHERE posted = FALSE AND retry_count < 3 AND COALESCE(next_attempt_at, scheduled_time) > %s
+          AND account_id = ANY(%s)
+    """, (moment, account_ids))
+    value = cur.fetchone()[0]
+    cur.close()
+    return value
+
+def pending_count(conn, account_ids):
+    """Posts of the sim accounts that fetch_next_pending_post can still hand out"""
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT COUNT(*) FROM platform_schedules
+        WHERE posted = FALSE AND retry_count < 3 AND account_id = ANY(%s)
+    """, (account_ids,))
+    value = cur.fetchone()[0]
+    cur.close()
+    return value
+
+class Simulation:
+    """
+    Replays job arrivals and posting through the real scheduler functions in
+    virtual time. `workers` posts can be in flight at once, each taking
+    `post_seconds` of virtual time, and posts spend the scheduler's rate-limit tokens.
+    """
+
+    def __init__(self, conn, account_ids, jobs, days, workers, post_seconds, fail_rate):
+        self.conn = conn
+        self.account_ids = account_ids
+        self.jobs = jobs
+        self.workers = workers
+        self.post_seconds = post_seconds
+        self.fail_rate = fail_rate
+
+        start = datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.clock = clock.VirtualClock(start)
+        self.start = start
+        spacing = days * 86400 / max(jobs, 1)
+        self.arrivals = [start + datetime.timedelta(seconds=i * spacing) for i in range(jobs)]
+
+        self.next_job = 0
+        self.in_flight = []          # (finishes_at, post)
+        self.limiter = scheduler.rate_limiter
+        scheduler.capacity_workers = workers
+        scheduler.load_rate_limits(conn)
+        self.db_times = {op: [] for op in OPERATIONS}
+        self.lags = []
+        self.outcomes = Counter()
+        self.posts_per_day = Counter()
+        self.wall_seconds = 0
+        self.virtual_seconds = 0
+
+    def timed(self, operation, fn, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.db_times[operation].append((time.perf_counter() - started) * 1000)
+
+    def arrive_jobs(self, now):
+        while self.next_job < self.jobs and self.arrivals[self.next_job] <= now:
+            job_id = add_job(self.conn, self.next_job)
+            self.timed("create_schedules_for_job", scheduler.create_schedules_for_job, self.conn, job_id)
+            self.next_job += 1
+
+    def finish_posts(self, now):
+        for finishes_at, post in [item for item in self.in_flight if item[0] <= now]:
+            self.in_flight.remove((finishes_at, post))
+            success = random.random() >= self.fail_rate
+            self.timed("update_post_status", scheduler.update_post_status,
+                       self.conn, post['schedule_id'], success, None if success else "simulated failure")
+            self.outcomes["posted" if success else "failed"] += 1
+            if success:
+                self.posts_per_day[(finishes_at - self.start).days + 1] += 1
+
+    def dispatch(self, now):
+        while len(self.in_flight) < self.workers:
+            limited_accounts, limited_platforms = self.limiter.blocked(now)
+            busy_accounts = [post['account_id'] for _, post in self.in_flight]
+            busy_profiles = [post['profile_id'] for _, post in self.in_flight]
+            post = self.timed("fetch_next_pending_post", scheduler.fetch_next_pending_post,
+                              self.conn, busy_profiles, limited_accounts + busy_accounts, limited_platforms)
+            if not post:
+                return
+            self.limiter.take(post['account_id'], post['platform'], now)
+            self.lags.append((now - post['scheduled_time']).total_seconds())
+            self.in_flight.append((now + datetime.timedelta(seconds=self.post_seconds), post))
+
+    def next_event(self, now):
+        """Earliest moment after `now` when something can change"""
+        candidates = [finishes_at for finishes_at, _ in self.in_flight]
+        if self.next_job < self.jobs:
+            candidates.append(self.arrivals[self.next_job])
+        ready = self.limiter.next_ready(now)
+        if ready:
+            candidates.append(ready)
+        upcoming = next_scheduled_after(self.conn, now, self.account_ids)
+        if upcoming:
+            candidates.append(upcoming)
+        candidates = [moment for moment in candidates if moment > now]
+        return min(candidates) if candidates else None
+
+    def run(self):
+        clock.set_clock(self.clock)
+        day = 0
+        wall_start = time.monotonic()
+
+        while True:
+            now = self.clock.now()
+            self.arrive_jobs(now)
+            self.finish_posts(now)
+            self.dispatch(now)
+
+            if (now - self.start).days > day:
+                day = (now - self.start).days
+                say(f"📆 Day {day}: {self.next_job} jobs in, {self.outcomes['posted']} posted, "
+                    f"{len(self.in_flight)} in flight ({time.monotonic() - wall_start:.0f}s wall)")
+
+            upcoming = self.next_event(now)
+            if upcoming is None:
+                if self.next_job >= self.jobs and not self.in_flight and pending_count(self.conn, self.account_ids) == 0:
+                    break
+                upcoming = now + datetime.timedelta(seconds=60)
+
+            # Virtual sleep: jumps straight to the next event
+            clock.sleep((upcoming - now).total_seconds())
+
+        self.wall_seconds = time.monotonic() - wall_start
+        self.virtual_seconds = (self.clock.now() - self.start).total_seconds()
+
+    def report(self):
+        say("\n" + "=" * 60)
+        say("🧮 SIMULATION RESULTS")
+        say("=" * 60)
+        say(f"Jobs:                {self.jobs}")
+        say(f"Posted / failed:     {self.outcomes['posted']} / {self.outcomes['failed']}")
+        say(f"Virtual time:        {self.virtual_seconds / 86400:.1f} days")
+        say(f"Wall time:           {self.wall_seconds:.1f}s")
+        virtual_hours = max(self.virtual_seconds / 3600, 1e-9)
+        say(f"Throughput:          {self.outcomes['posted'] / virtual_hours:.1f} posts/virtual hour")
+
+        lags = sorted(self.lags)
+        say("\n⏳ Queue lag (post start - scheduled time)")
+        for pct in (50, 95, 99):
+            value = percentile(lags, pct)
+            say(f"   p{pct}: {value / 60:.1f} min" if value is not None else f"   p{pct}: -")
+        if lags:
+            say(f"   max: {lags[-1] / 60:.1f} min")
+
+        say("\n📆 Posts per virtual day")
+        for day in sorted(self.posts_per_day):
+            say(f"   Day {day}: {self.posts_per_day[day]}")
+
+        say("\n🗄️ Database time per operation")
+        say(f"   {'Operation':<26}{'calls':>8}{'mean':>10}{'p95':>10}{'total':>10}")
+        for op in OPERATIONS:
+            times = sorted(self.db_times[op])
+            if not times:
+                continue
+            mean = sum(times) / len(times)
+            say(f"   {op:<26}{len(times):>8}{mean:>8.2f}ms{percentile(times, 95):>8.2f}ms{sum(times) / 1000:>9.1f}s")
+        say("=" * 60)
+
+def cleanup(conn, account_ids):
+    cur = conn.cursor()
+    cur.execute("DELETE FROM social_queue WHERE video_path LIKE %s", (BENCH_PREFIX + "sim-%",))
+    cur.execute("DELETE FROM social_accounts WHERE id = ANY(%s)", (account_ids,))
+    conn.commit()
+    cur.close()
+    say("🧹 Removed simulated videos and accounts")
+
+def main(argv):
+    jobs = arg(argv, "--jobs", 1000)
+    accounts = arg(argv, "--accounts", 100)
+    days = arg(argv, "--days", 7)
+    workers = arg(argv, "--workers", 4)
+    post_seconds = arg(argv, "--post-seconds", 60)
+    fail_rate = arg(argv, "--fail-rate", 0.02)
+
+    say("=" * 60)
+    say("🧮 SCHEDULER SIMULATION (virtual time)")
+    say(f"  {jobs} job(s) over {days} day(s) × {accounts} account(s)")
+    say(f"  {workers} worker(s), {post_seconds}s per post, {fail_rate:.0%} failures")
+    say("=" * 60)
+
+    with db.connection() as conn:
+        if not check_scratch_database(conn):
+            say("❌ This database has enabled accounts. Point db_config.py at a scratch copy first,")
+            say(f"   and delete accounts left over from earlier runs ('{BENCH_PREFIX}sim-%' profiles).")
+            return
+
+        account_ids = create_accounts(conn, accounts)
+        sim = Simulation(conn, account_ids, jobs, days, workers, post_seconds, fail_rate)
+
+        try:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                sim.run()
+            sim.report()
+        finally:
+            clock.set_clock(clock.SystemClock())
+            if "--keep" not in argv:
+                cleanup(conn, account_ids)
+
+if __name__ == "__main__":
+    if "--help" in sys.argv:
+        print("Usage:")
+        print("  python bench/simulate.py [--jobs N] [--accounts M] [--days D] [--workers W]")
+        print("                           [--post-seconds S] [--fail-rate F] [--keep]")
+        print("Full scale: --jobs 100000 --accounts 1000. Use a scratch database.")
+    else:
+        main(sys.argv)
\ No newline at end of file
@@ -1,34 +1,214 @@
-import time
-import random
 from playwright.sync_api import sync_playwright
 import config.config as config
+import utils.waits as waits
+import utils.keystrokes as keystrokes
+import utils.spans as spans
+import utils.bitbrowser as bitbrowser
 
 # --- HUMAN HELPER FUNCTIONS ---
-def human_delay(min_seconds=1.5, max_seconds=4.0):
-    """Sleeps for a random amount of time to mimic human hesitation."""
-    sleep_time = random.uniform(min_seconds, max_seconds)
-    time.sleep(sleep_time)
-
 def type_like_human(page, selector, text):
-    """Types text one character at a time with variable speed."""
+    """Types text with human-like per-key timing (batched, see utils/keystrokes.py)."""
     # Click the element first to focus
     page.locator(selector).first.click()
     
-    for char in text:
-        # Most keys take 50ms-150ms
-        delay = random.uniform(0.05, 0.15)
-        
-        # Occasionally pause for "thinking" (every 10-20 chars)
-        if random.random() < 0.08: 
-            delay += random.uniform(0.3, 0.8)
-            
-        page.keyboard.type(char)
-        time.sleep(delay)
-
-def run_linkedin_bot():
+    keystrokes.type_text(page, text, "linkedin")
+
+def post_linkedin(page, media_path, caption):
+    """Run the LinkedIn video flow on a page already connected to the profile"""
+    jitter = waits.JitterBudget("linkedin")
+    try:
+        spans.mark("navigate")
+        print("Navigating to LinkedIn...")
+        page.goto("https://www.linkedin.com/feed/", timeout=60000)
+        video_btn = page.locator("button:has-text('Video')").first
+        waits.wait_visible(video_btn, 30000) # Wait for feed to load
+        jitter.pause(3, 6)
+
+        # 2. Trigger "Video" Mode
+        print("Clicking 'Video' button...")
+        try:
+            video_btn.click()
+        except:
+            print("Video button fallback...")
+            page.locator(".share-box-feed-entry__trigger").click()
+
+        waits.wait_visible(page.locator("input[type='file']"), 15000)
+        jitter.pause(2, 4)
+
+        # 3. Upload Media (Direct Injection)
+        spans.mark("upload")
+        print(f"Uploading media: {media_path}")
+        try:
+            page.locator("input[type='file']").first.set_input_files(media_path)
+            print("File injected successfully.")
+        except Exception as e:
+            print(f"Upload failed: {e}")
+            return
+
+        # 4. Handle 'Editor' Preview Screen
+        print("Waiting for 'Next' button...")
+        try:
+            next_btn = page.locator("button span:has-text('Next')").first
+            next_btn.wait_for(state="visible", timeout=30000)
+
+            # Human pause before clicking Next
+            jitter.pause(1.5, 3.0)
+            next_btn.click()
+            print("Clicked 'Next' on preview screen.")
+        except:
+            print("No 'Next' button found. Moving on...")
+
+        editor = page.locator("div.ql-editor")
+        waits.wait_visible(editor, 15000)
+        jitter.pause(2, 4)
+
+        # 5. Fill Caption (Human Typing)
+        spans.mark("caption")
+        print("Typing caption...")
+        try:
+            # We use the new human typing function here
+            type_like_human(page, "div.ql-editor", caption)
+        except:
+            # Fallback if specific editor not found
+            page.keyboard.type(caption)
+
+        jitter.pause(2, 5) # Reviewing the post
+
+        # 6. Click Post
+        spans.mark("publish")
+        print("Clicking Post...")
+        post_btn = page.locator("button.share-actions__primary-action")
+
+        # Wait for button to be clickable (it stays disabled while the video uploads)
+        waits.wait_enabled(post_btn, 120000)
+
+        # Final hesitation before committing
+        jitter.pause(1, 2)
+        post_btn.click()
+
+        # 7. Verification
+        spans.mark("verify")
+        print("Waiting for confirmation...")
+        try:
+            page.wait_for_selector("text=Post successful", timeout=15000)
+            print("SUCCESS: LinkedIn post submitted.")
+        except:
+            if not page.locator("div.ql-editor").is_visible():
+                 print("SUCCESS: Post modal closed (Implicit Success).")
+            else:
+                 print("WARNING: Modal still open. Post might have failed.")
+
+    except Exception as e:
+        print(f"LINKEDIN ERROR: {e}")
+        page.screenshot(path="linkedin_error.png")
+        raise
+
+async def type_like_human_async(page, selector, text):
+    """Async version of type_like_human for the asyncio engine"""
+    # Click the element first to focus
+    await page.locator(selector).first.click()
+    
+    await keystrokes.type_text_async(page, text, "linkedin")
+
+async def post_linkedin_async(page, media_path, caption):
+    """Async version of post_linkedin: run the LinkedIn video flow on a page already connected to the profile"""
+    jitter = waits.JitterBudget("linkedin")
+    try:
+        spans.mark("navigate")
+        print("Navigating to LinkedIn...")
+        await page.goto("https://www.linkedin.com/feed/", timeout=60000)
+        video_btn = page.locator("button:has-text('Video')").first
+        await waits.wait_visible_async(video_btn, 30000) # Wait for feed to load
+        await jitter.pause_async(3, 6)
+
+        # 2. Trigger "Video" Mode
+        print("Clicking 'Video' button...")
+        try:
+            await video_btn.click()
+        except:
+            print("Video button fallback...")
+            await page.locator(".share-box-feed-entry__trigger").click()
+
+        await waits.wait_visible_async(page.locator("input[type='file']"), 15000)
+        await jitter.pause_async(2, 4)
+
+        # 3. Upload Media (Direct Injection)
+        spans.mark("upload")
+        print(f"Uploading media: {media_path}")
+        try:
+            await page.locator("input[type='file']").first.set_input_files(media_path)
+            print("File injected successfully.")
+        except Exception as e:
+            print(f"Upload failed: {e}")
+            return
+
+        # 4. Handle 'Editor' Preview Screen
+        print("Waiting for 'Next' button...")
+        try:
+            next_btn = page.locator("button span:has-text('Next')").first
+            await next_btn.wait_for(state="visible", timeout=30000)
+
+            # Human pause before clicking Next
+            await jitter.pause_async(1.5, 3.0)
+            await next_btn.click()
+            print("Clicked 'Next' on preview screen.")
+        except:
+            print("No 'Next' button found. Moving on...")
+
+        editor = page.locator("div.ql-editor")
+        await waits.wait_visible_async(editor, 15000)
+        await jitter.pause_async(2, 4)
+
+        # 5. Fill Caption (Human Typing)
+        spans.mark("caption")
+        print("Typing caption...")
+        try:
+            # We use the new human typing function here
+            await type_like_human_async(page, "div.ql-editor", caption)
+        except:
+            # Fallback if specific editor not found
+            await page.keyboard.type(caption)
+
+        await jitter.pause_async(2, 5) # Reviewing the post
+
+        # 6. Click Post
+        spans.mark("publish")
+        print("Clicking Post...")
+        post_btn = page.locator("button.share-actions__primary-action")
+
+        # Wait for button to be clickable (it stays disabled while the video uploads)
+        await waits.wait_enabled_async(post_btn, 120000)
+
+        # Final hesitation before committing
+        await jitter.pause_async(1, 2)
+        await post_btn.click()
+
+        # 7. Verification
+        spans.mark("verify")
+        print("Waiting for confirmation...")
+        try:
+            await page.wait_for_selector("text=Post successful", timeout=15000)
+            print("SUCCESS: LinkedIn post submitted.")
+        except:
+            if not await page.locator("div.ql-editor").is_visible():
+                 print("SUCCESS: Post modal closed (Implicit Success).")
+            else:
+                 print("WARNING: Modal still open. Post might have failed.")
+
+    except Exception as e:
+        print(f"LINKEDIN ERROR: {e}")
+        await page.screenshot(path="linkedin_error.png")
+        raise
+
+def run_linkedin_bot(profile_id=None, media_path=None, caption=None):
+    """Post a video. Arguments default to the LI_* values in config."""
+    profile_id = profile_id or config.LI_PROFILE_ID
+    media_path = media_path or config.LI_MEDIA_PATH
+    caption = caption if caption is not None else config.LI_CAPTION
+
     print("--- Opening Profile (LinkedIn) ---")
     try:
-        ws_url = config.open_browser(config.LI_PROFILE_ID)
+        ws_url = bitbrowser.open_profile(profile_id)
     except Exception as e:
         print(f"SKIPPING: Could not open browser. {e}")
         return
@@ -39,86 +219,9 @@ def run_linkedin_bot():
             context = browser.contexts[0]
             page = context.pages[0] if context.pages else context.new_page()
 
-            print("Navigating to LinkedIn...")
-            page.goto("https://www.linkedin.com/feed/", timeout=60000)
-            human_delay(3, 6) # Wait for feed to load
-
-            # 2. Trigger "Video" Mode
-            print("Clicking 'Video' button...")
-            try:
-                page.locator("button:has-text('Video')").first.click()
-            except:
-                print("Video button fallback...")
-                page.locator(".share-box-feed-entry__trigger").click()
-            
-            human_delay(2, 4)
-
-            # 3. Upload Media (Direct Injection)
-            print(f"Uploading media: {config.LI_MEDIA_PATH}")
-            try:
-                page.locator("input[type='file']").first.set_input_files(config.LI_MEDIA_PATH)
-                print("File injected successfully.")
-            except Exception as e:
-                print(f"Upload failed: {e}")
-                return
-
-            # 4. Handle 'Editor' Preview Screen
-            print("Waiting for 'Next' button...")
-            try:
-                next_btn = page.locator("button span:has-text('Next')").first
-                next_btn.wait_for(state="visible", timeout=30000)
-                
-                # Human pause before clicking Next
-                human_delay(1.5, 3.0) 
-                next_btn.click()
-                print("Clicked 'Next' on preview screen.")
-            except:
-                print("No 'Next' button found. Moving on...")
-
-            human_delay(2, 4)
-
-            # 5. Fill Caption (Human Typing)
-            print("Typing caption...")
-            try:
-                # We use the new human typing function here
-                type_like_human(page, "div.ql-editor", config.LI_CAPTION)
-            except:
-                # Fallback if specific editor not found
-                page.keyboard.type(config.LI_CAPTION)
-
-            human_delay(2, 5) # Reviewing the post
-
-            # 6. Click Post
-            print("Clicking Post...")
-            post_btn = page.locator("button.share-actions__primary-action")
-            
-            # Wait for button to be clickable
-            for i in range(10):
-                if not post_btn.is_disabled():
-                    break
-                time.sleep(1)
-            
-            # Final hesitation before committing
-            human_delay(1, 2)
-            post_btn.click()
-
-            # 7. Verification
-            print("Waiting for confirmation...")
-            try:
-                page.wait_for_selector("text=Post successful", timeout=15000)
-                print("SUCCESS: LinkedIn post submitted.")
-            except:
-                if not page.locator("div.ql-editor").is_visible():
-                     print("SUCCESS: Post modal closed (Implicit Success).")
-                else:
-                     print("WARNING: Modal still open. Post might have failed.")
-
-        except Exception as e:
-            print(f"LINKEDIN ERROR: {e}")
-            page.screenshot(path="linkedin_error.png")
-
+            post_linkedin(page, media_path, caption)
         finally:
-            config.close_browser(config.LI_PROFILE_ID)
+            bitbrowser.close_profile(profile_id)
 
 if __name__ == "__main__":
     run_linkedin_bot()
\ No newline at end of file
@@ -1,9 +1,232 @@
-import time
 from playwright.sync_api import sync_playwright
-import config.config as config 
+import config.config as config
+import utils.waits as waits
+import utils.keystrokes as keystrokes
+import utils.spans as spans
+import utils.bitbrowser as bitbrowser
 
-def run_pinterest_bot():
-    ws_url = config.open_browser(config.PIN_PROFILE_ID)
+def post_pinterest(page, media_path, title, description, board, link):
+    """Run the Pin Builder flow on a page already connected to the profile"""
+    jitter = waits.JitterBudget("pinterest")
+    try:
+        spans.mark("navigate")
+        print("Navigating to Pinterest Builder...")
+        page.goto("https://www.pinterest.com/pin-builder/", timeout=60000)
+
+        # --- CHECK FOR LOGIN ---
+        file_input = page.locator("input[type='file']")
+        login_link = page.get_by_text("Log in", exact=True)
+        if waits.wait_any([file_input, login_link], 15000) == 1 or "login" in page.url:
+            print("⚠️ ALERT: You seem to be logged out. Please log in manually.")
+            print("Waiting up to 60s for you to log in...")
+            waits.wait_visible(file_input, 60000)
+
+        # 1. Upload Media
+        spans.mark("upload")
+        print(f"Uploading media: {media_path}")
+        try:
+            page.wait_for_selector("text=Drag and drop", timeout=15000)
+        except:
+            print("Warning: 'Drag and drop' text not found, trying upload anyway...")
+
+        file_input.first.set_input_files(media_path)
+
+        print("Waiting for upload preview...")
+        title_box = page.get_by_placeholder("Add a title")
+        title_box.wait_for(state="visible", timeout=30000)
+        jitter.pause(1.5, 2.5)
+
+        # 2. Fill Details (Tab Strategy)
+        spans.mark("caption")
+        print("Filling Title...")
+        title_box.click()
+        title_box.fill(title)
+        jitter.pause(0.5, 1.5)
+
+        print("Filling Description (via Tab)...")
+        page.keyboard.press("Tab")
+        jitter.pause(0.3, 0.7)
+        keystrokes.insert_text(page, description)
+        jitter.pause(0.5, 1.5)
+
+        if link:
+            print("Filling Link (via Tab)...")
+            page.keyboard.press("Tab")
+            jitter.pause(0.3, 0.7)
+            keystrokes.insert_text(page, link)
+        else:
+            print("No Link provided in config, skipping...")
+
+        # 3. Select Board
+        print(f"Selecting Board: '{board}'...")
+
+        # Click the dropdown
+        board_dropdown = page.locator('[data-test-id="board-dropdown-select-button"]')
+        board_dropdown.click()
+
+        # Search for board (Using the ID fix)
+        search_field = page.locator("#pickerSearchField")
+        waits.wait_visible(search_field, 10000)
+        search_field.fill(board)
+
+        # Click the result
+        board_option = page.locator(f'[title="{board}"]').first
+        waits.wait_visible(board_option, 10000)
+        jitter.pause(1, 2)
+        board_option.click()
+        waits.wait_hidden(search_field, 5000)
+        jitter.pause(1, 2)
+
+        # 4. Publish (THE FIX)
+        spans.mark("publish")
+        print("Clicking Publish...")
+
+        # We look for the main button in the top header.
+        # Usually named "Publish" or "Save". We try both to be safe.
+        try:
+            # Try explicit 'Publish' button first
+            publish_btn = page.get_by_role("button", name="Publish").first
+            publish_btn.click()
+        except:
+            print("Publish button not found, trying 'Save'...")
+            save_btn = page.get_by_role("button", name="Save").first
+            save_btn.click()
+
+        # 5. Verification
+        spans.mark("verify")
+        print("Waiting for confirmation...")
+        try:
+            # Wait for "Saved" text or toast
+            page.wait_for_selector("text=Saved", timeout=30000)
+            print("SUCCESS: Pinterest pin saved.")
+        except:
+            # Sometimes Pinterest redirects you to the new pin
+            if waits.wait_url_leaves(page, "pin-builder", 5000):
+                print("SUCCESS: Redirect detected (Implicit Success).")
+            else:
+                print("SUCCESS: Post clicked (Implicit).")
+
+    except Exception as e:
+        print(f"PINTEREST ERROR: {e}")
+        page.screenshot(path="pin_error.png")
+        raise
+
+async def post_pinterest_async(page, media_path, title, description, board, link):
+    """Async version of post_pinterest: run the Pin Builder flow on a page already connected to the profile"""
+    jitter = waits.JitterBudget("pinterest")
+    try:
+        spans.mark("navigate")
+        print("Navigating to Pinterest Builder...")
+        await page.goto("https://www.pinterest.com/pin-builder/", timeout=60000)
+
+        # --- CHECK FOR LOGIN ---
+        file_input = page.locator("input[type='file']")
+        login_link = page.get_by_text("Log in", exact=True)
+        if await waits.wait_any_async([file_input, login_link], 15000) == 1 or "login" in page.url:
+            print("⚠️ ALERT: You seem to be logged out. Please log in manually.")
+            print("Waiting up to 60s for you to log in...")
+            await waits.wait_visible_async(file_input, 60000)
+
+        # 1. Upload Media
+        spans.mark("upload")
+        print(f"Uploading media: {media_path}")
+        try:
+            await page.wait_for_selector("text=Drag and drop", timeout=15000)
+        except:
+            print("Warning: 'Drag and drop' text not found, trying upload anyway...")
+
+        await file_input.first.set_input_files(media_path)
+
+        print("Waiting for upload preview...")
+        title_box = page.get_by_placeholder("Add a title")
+        await title_box.wait_for(state="visible", timeout=30000)
+        await jitter.pause_async(1.5, 2.5)
+
+        # 2. Fill Details (Tab Strategy)
+        spans.mark("caption")
+        print("Filling Title...")
+        await title_box.click()
+        await title_box.fill(title)
+        await jitter.pause_async(0.5, 1.5)
+
+        print("Filling Description (via Tab)...")
+        await page.keyboard.press("Tab")
+        await jitter.pause_async(0.3, 0.7)
+        await keystrokes.insert_text_async(page, description)
+        await jitter.pause_async(0.5, 1.5)
+
+        if link:
+            print("Filling Link (via Tab)...")
+            await page.keyboard.press("Tab")
+            await jitter.pause_async(0.3, 0.7)
+            await keystrokes.insert_text_async(page, link)
+        else:
+            print("No Link provided in config, skipping...")
+
+        # 3. Select Board
+        print(f"Selecting Board: '{board}'...")
+
+        # Click the dropdown
+        board_dropdown = page.locator('[data-test-id="board-dropdown-select-button"]')
+        await board_dropdown.click()
+
+        # Search for board (Using the ID fix)
+        search_field = page.locator("#pickerSearchField")
+        await waits.wait_visible_async(search_field, 10000)
+        await search_field.fill(board)
+
+        # Click the result
+        board_option = page.locator(f'[title="{board}"]').first
+        await waits.wait_visible_async(board_option, 10000)
+        await jitter.pause_async(1, 2)
+        await board_option.click()
+        await waits.wait_hidden_async(search_field, 5000)
+        await jitter.pause_async(1, 2)
+
+        # 4. Publish (THE FIX)
+        spans.mark("publish")
+        print("Clicking Publish...")
+
+        # We look for the main button in the top header.
+        # Usually named "Publish" or "Save". We try both to be safe.
+        try:
+            # Try explicit 'Publish' button first
+            publish_btn = page.get_by_role("button", name="Publish").first
+            await publish_btn.click()
+        except:
+            print("Publish button not found, trying 'Save'...")
+            save_btn = page.get_by_role("button", name="Save").first
+            await save_btn.click()
+
+        # 5. Verification
+        spans.mark("verify")
+        print("Waiting for confirmation...")
+        try:
+            # Wait for "Saved" text or toast
+            await page.wait_for_selector("text=Saved", timeout=30000)
+            print("SUCCESS: Pinterest pin saved.")
+        except:
+            # Sometimes Pinterest redirects you to the new pin
+            if await waits.wait_url_leaves_async(page, "pin-builder", 5000):
+                print("SUCCESS: Redirect detected (Implicit Success).")
+            else:
+                print("SUCCESS: Post clicked (Implicit).")
+
+    except Exception as e:
+        print(f"PINTEREST ERROR: {e}")
+        await page.screenshot(path="pin_error.png")
+        raise
+
+def run_pinterest_bot(profile_id=None, media_path=None, title=None, description=None, board=None, link=None):
+    """Create an Idea pin. Arguments default to the PIN_* values in config."""
+    profile_id = profile_id or config.PIN_PROFILE_ID
+    media_path = media_path or config.PIN_MEDIA_PATH
+    title = title if title is not None else config.PIN_TITLE
+    description = description if description is not None else config.PIN_DESCRIPTION
+    board = board or config.PIN_BOARD
+    link = link if link is not None else getattr(config, 'PIN_LINK', None)
+
+    ws_url = bitbrowser.open_profile(profile_id)
     if not ws_url:
         return
 
@@ -13,102 +236,10 @@ def run_pinterest_bot():
         page = context.pages[0] if context.pages else context.new_page()
 
         try:
-            print("Navigating to Pinterest Builder...")
-            page.goto("https://www.pinterest.com/pin-builder/", timeout=60000)
-            
-            # --- CHECK FOR LOGIN ---
-            time.sleep(5)
-            if page.get_by_text("Log in", exact=True).is_visible() or "login" in page.url:
-                print("⚠️ ALERT: You seem to be logged out. Please log in manually.")
-                print("Waiting 60s for you to log in...")
-                time.sleep(60)
-
-            # 1. Upload Media
-            print(f"Uploading media: {config.PIN_MEDIA_PATH}")
-            try:
-                page.wait_for_selector("text=Drag and drop", timeout=15000)
-            except:
-                print("Warning: 'Drag and drop' text not found, trying upload anyway...")
-
-            file_input = page.locator("input[type='file']").first
-            file_input.set_input_files(config.PIN_MEDIA_PATH)
-            
-            print("Waiting for upload preview...")
-            page.get_by_placeholder("Add a title").wait_for(state="visible", timeout=30000)
-            time.sleep(2)
-
-            # 2. Fill Details (Tab Strategy)
-            print("Filling Title...")
-            page.get_by_placeholder("Add a title").click()
-            page.get_by_placeholder("Add a title").fill(config.PIN_TITLE)
-            time.sleep(1)
-            
-            print("Filling Description (via Tab)...")
-            page.keyboard.press("Tab")
-            time.sleep(0.5)
-            page.keyboard.type(config.PIN_DESCRIPTION)
-            time.sleep(1)
-
-            pin_link = getattr(config, 'PIN_LINK', None)
-            if pin_link:
-                print("Filling Link (via Tab)...")
-                page.keyboard.press("Tab")
-                time.sleep(0.5)
-                page.keyboard.type(pin_link)
-            else:
-                print("No Link provided in config, skipping...")
-
-            # 3. Select Board
-            print(f"Selecting Board: '{config.PIN_BOARD}'...")
-            
-            # Click the dropdown
-            board_dropdown = page.locator('[data-test-id="board-dropdown-select-button"]')
-            board_dropdown.click()
-            time.sleep(2)
-
-            # Search for board (Using the ID fix)
-            page.locator("#pickerSearchField").fill(config.PIN_BOARD)
-            time.sleep(2)
-
-            # Click the result
-            page.locator(f'[title="{config.PIN_BOARD}"]').first.click()
-            time.sleep(2)
-
-            # 4. Publish (THE FIX)
-            print("Clicking Publish...")
-            
-            # We look for the main button in the top header.
-            # Usually named "Publish" or "Save". We try both to be safe.
-            try:
-                # Try explicit 'Publish' button first
-                publish_btn = page.get_by_role("button", name="Publish").first
-                publish_btn.click()
-            except:
-                print("Publish button not found, trying 'Save'...")
-                save_btn = page.get_by_role("button", name="Save").first
-                save_btn.click()
-
-            # 5. Verification
-            print("Waiting for confirmation...")
-            try:
-                # Wait for "Saved" text or toast
-                page.wait_for_selector("text=Saved", timeout=30000)
-                print("SUCCESS: Pinterest pin saved.")
-            except:
-                # Sometimes Pinterest redirects you to the new pin
-                time.sleep(5)
-                if "pin-builder" not in page.url:
-                    print("SUCCESS: Redirect detected (Implicit Success).")
-                else:
-                    print("SUCCESS: Post clicked (Implicit).")
-
-        except Exception as e:
-            print(f"PINTEREST ERROR: {e}")
-            page.screenshot(path="pin_error.png")
-
+            post_pinterest(page, media_path, title, description, board, link)
         finally:
             browser.close()
-            config.close_browser(config.PIN_PROFILE_ID)
+            bitbrowser.close_profile(profile_id)
 
 if __name__ == "__main__":
     run_pinterest_bot()
\ No newline at end of file
@@ -1,26 +1,235 @@
-import time
-import random
 from playwright.sync_api import sync_playwright
 import config.config as config
+import utils.waits as waits
+import utils.keystrokes as keystrokes
+import utils.spans as spans
+import utils.bitbrowser as bitbrowser
 
 # --- HUMAN HELPER FUNCTIONS ---
-def human_delay(min_seconds=1.5, max_seconds=4.0):
-    sleep_time = random.uniform(min_seconds, max_seconds)
-    time.sleep(sleep_time)
-
 def type_like_human(page, selector, text):
     try:
         page.locator(selector).first.click()
     except:
         pass
-    for char in text:
-        delay = random.uniform(0.05, 0.15)
-        if random.random() < 0.1: delay += random.uniform(0.2, 0.5)
-        page.keyboard.type(char)
-        time.sleep(delay)
-
-def run_tiktok_bot():
-    ws_url = config.open_browser(config.TT_PROFILE_ID)
+    keystrokes.type_text(page, text, "tiktok")
+
+def post_tiktok(page, media_path, caption):
+    """Run the TikTok upload flow on a page already connected to the profile"""
+    jitter = waits.JitterBudget("tiktok")
+    try:
+        spans.mark("navigate")
+        print("Navigating to TikTok Upload...")
+        page.goto("https://www.tiktok.com/creator-center/upload", timeout=60000)
+        file_input = page.locator("input[type='file']")
+        if waits.wait_any([file_input, page.frame_locator("iframe").first.locator("input[type='file']")], 20000) is None:
+            waits.wait_network_idle(page)
+        jitter.pause(5, 8)
+
+        # 1. Upload Media
+        spans.mark("upload")
+        print(f"Uploading media: {media_path}")
+        try:
+            file_input.first.set_input_files(media_path)
+            print("File injected.")
+        except:
+            page.frame_locator("iframe").first.locator("input[type='file']").first.set_input_files(media_path)
+            print("File injected (Iframe).")
+
+        print("Waiting for video to process...")
+        editor = page.locator("div.public-DraftEditor-content")
+        waits.wait_visible(editor, 60000)
+        jitter.pause(8, 12)
+
+        # 2. Caption
+        spans.mark("caption")
+        print("Typing caption...")
+        try:
+            type_like_human(page, "div.public-DraftEditor-content", caption)
+        except:
+            page.keyboard.type(caption)
+        jitter.pause(2, 4)
+
+        # 3. Wait for Initial Check (the Post button stays disabled until upload + checks finish)
+        spans.mark("publish")
+        print("Waiting for Copyright Check...")
+        page.mouse.wheel(0, 500)
+        post_btn = page.locator("button:has-text('Post')").last
+
+        if waits.wait_enabled(post_btn, 120000):
+            print("Main Post Button ready.")
+        else:
+            print("Post button still disabled after 120s, trying anyway...")
+
+        # --- THE DOUBLE-TAP FIX ---
+        print("Clicking Main Post Button...")
+        post_btn.click()
+
+        # Handle the "Post now" Popup
+        try:
+            post_now_btn = page.locator("button:has-text('Post now')")
+            manage_posts = page.locator("text=Manage your posts")
+
+            if waits.wait_any([post_now_btn, manage_posts], 5000) == 0:
+                print("⚠️ Popup detected! Executing Double-Tap Strategy...")
+
+                # CLICK 1
+                print("Clicking 'Post now' (1st time)...")
+                post_now_btn.click()
+
+                # CLICK 2 (If still there)
+                if not waits.wait_hidden(post_now_btn, 2000):
+                    print("Clicking 'Post now' (2nd time)...")
+                    post_now_btn.click()
+                    waits.wait_hidden(post_now_btn, 2000)
+                else:
+                    print("Popup disappeared after 1st click.")
+
+        except Exception as e:
+            print(f"Popup handling error: {e}")
+
+        # Final Verification Loop
+        spans.mark("verify")
+        print("Verifying success...")
+        for i in range(5):
+            # If we are redirected, it worked
+            if "upload" not in page.url:
+                print("✅ Success! Redirected to new page.")
+                break
+
+            # If the Manage Posts text appears, it worked
+            if waits.wait_visible(page.locator("text=Manage your posts"), 3000):
+                print("✅ Success! Found 'Manage your posts'.")
+                break
+
+            # If the 'Post' button is STILL visible and enabled, try clicking it one last time
+            if post_btn.is_visible() and not post_btn.is_disabled():
+                print("⚠️ Main Post button still here. Clicking it again...")
+                post_btn.click()
+
+        # Let the post request finish before the profile is reused
+        waits.wait_network_idle(page, 5000)
+
+    except Exception as e:
+        print(f"TIKTOK ERROR: {e}")
+        page.screenshot(path="tiktok_error.png")
+        raise
+
+async def type_like_human_async(page, selector, text):
+    """Async version of type_like_human for the asyncio engine"""
+    try:
+        await page.locator(selector).first.click()
+    except:
+        pass
+    await keystrokes.type_text_async(page, text, "tiktok")
+
+async def post_tiktok_async(page, media_path, caption):
+    """Async version of post_tiktok: run the TikTok upload flow on a page already connected to the profile"""
+    jitter = waits.JitterBudget("tiktok")
+    try:
+        spans.mark("navigate")
+        print("Navigating to TikTok Upload...")
+        await page.goto("https://www.tiktok.com/creator-center/upload", timeout=60000)
+        file_input = page.locator("input[type='file']")
+        if await waits.wait_any_async([file_input, page.frame_locator("iframe").first.locator("input[type='file']")], 20000) is None:
+            await waits.wait_network_idle_async(page)
+        await jitter.pause_async(5, 8)
+
+        # 1. Upload Media
+        spans.mark("upload")
+        print(f"Uploading media: {media_path}")
+        try:
+            await file_input.first.set_input_files(media_path)
+            print("File injected.")
+        except:
+            await page.frame_locator("iframe").first.locator("input[type='file']").first.set_input_files(media_path)
+            print("File injected (Iframe).")
+
+        print("Waiting for video to process...")
+        editor = page.locator("div.public-DraftEditor-content")
+        await waits.wait_visible_async(editor, 60000)
+        await jitter.pause_async(8, 12)
+
+        # 2. Caption
+        spans.mark("caption")
+        print("Typing caption...")
+        try:
+            await type_like_human_async(page, "div.public-DraftEditor-content", caption)
+        except:
+            await page.keyboard.type(caption)
+        await jitter.pause_async(2, 4)
+
+        # 3. Wait for Initial Check (the Post button stays disabled until upload + checks finish)
+        spans.mark("publish")
+        print("Waiting for Copyright Check...")
+        await page.mouse.wheel(0, 500)
+        post_btn = page.locator("button:has-text('Post')").last
+
+        if await waits.wait_enabled_async(post_btn, 120000):
+            print("Main Post Button ready.")
+        else:
+            print("Post button still disabled after 120s, trying anyway...")
+
+        # --- THE DOUBLE-TAP FIX ---
+        print("Clicking Main Post Button...")
+        await post_btn.click()
+
+        # Handle the "Post now" Popup
+        try:
+            post_now_btn = page.locator("button:has-text('Post now')")
+            manage_posts = page.locator("text=Manage your posts")
+
+            if await waits.wait_any_async([post_now_btn, manage_posts], 5000) == 0:
+                print("⚠️ Popup detected! Executing Double-Tap Strategy...")
+
+                # CLICK 1
+                print("Clicking 'Post now' (1st time)...")
+                await post_now_btn.click()
+
+                # CLICK 2 (If still there)
+                if not await waits.wait_hidden_async(post_now_btn, 2000):
+                    print("Clicking 'Post now' (2nd time)...")
+                    await post_now_btn.click()
+                    await waits.wait_hidden_async(post_now_btn, 2000)
+                else:
+                    print("Popup disappeared after 1st click.")
+
+        except Exception as e:
+            print(f"Popup handling error: {e}")
+
+        # Final Verification Loop
+        spans.mark("verify")
+        print("Verifying success...")
+        for i in range(5):
+            # If we are redirected, it worked
+            if "upload" not in page.url:
+                print("✅ Success! Redirected to new page.")
+                break
+
+            # If the Manage Posts text appears, it worked
+            if await waits.wait_visible_async(page.locator("text=Manage your posts"), 3000):
+                print("✅ Success! Found 'Manage your posts'.")
+                break
+
+            # If the 'Post' button is STILL visible and enabled, try clicking it one last time
+            if await post_btn.is_visible() and not await post_btn.is_disabled():
+                print("⚠️ Main Post button still here. Clicking it again...")
+                await post_btn.click()
+
+        # Let the post request finish before the profile is reused
+        await waits.wait_network_idle_async(page, 5000)
+
+    except Exception as e:
+        print(f"TIKTOK ERROR: {e}")
+        await page.screenshot(path="tiktok_error.png")
+        raise
+
+def run_tiktok_bot(profile_id=None, media_path=None, caption=None):
+    """Post a video. Arguments default to the TT_* values in config."""
+    profile_id = profile_id or config.TT_PROFILE_ID
+    media_path = media_path or config.TT_MEDIA_PATH
+    caption = caption if caption is not None else config.TT_CAPTION
+
+    ws_url = bitbrowser.open_profile(profile_id)
     if not ws_url: return
 
     with sync_playwright() as p:
@@ -29,100 +238,10 @@ def run_tiktok_bot():
         page = context.pages[0] if context.pages else context.new_page()
 
         try:
-            print("Navigating to TikTok Upload...")
-            page.goto("https://www.tiktok.com/creator-center/upload", timeout=60000)
-            human_delay(5, 8)
-
-            # 1. Upload Media
-            print(f"Uploading media: {config.TT_MEDIA_PATH}")
-            try:
-                page.locator("input[type='file']").first.set_input_files(config.TT_MEDIA_PATH)
-                print("File injected.")
-            except:
-                page.frame_locator("iframe").first.locator("input[type='file']").first.set_input_files(config.TT_MEDIA_PATH)
-                print("File injected (Iframe).")
-
-            print("Waiting for video to process...")
-            human_delay(8, 12)
-
-            # 2. Caption
-            print("Typing caption...")
-            try:
-                type_like_human(page, "div.public-DraftEditor-content", config.TT_CAPTION)
-            except:
-                page.keyboard.type(config.TT_CAPTION)
-            human_delay(2, 4)
-
-            # 3. Wait for Initial Check
-            print("Waiting for Copyright Check...")
-            page.mouse.wheel(0, 500)
-            post_btn = page.locator("button:has-text('Post')").last
-            
-            for i in range(20):
-                if not post_btn.is_disabled():
-                    print("Main Post Button ready.")
-                    break
-                if i % 3 == 0: print(f"Waiting... {i*3}s")
-                time.sleep(3)
-
-            # --- THE DOUBLE-TAP FIX ---
-            print("Clicking Main Post Button...")
-            post_btn.click()
-            time.sleep(3) # Wait for popup to appear
-
-            # Handle the "Post now" Popup
-            try:
-                post_now_btn = page.locator("button:has-text('Post now')")
-                
-                if post_now_btn.is_visible():
-                    print("⚠️ Popup detected! Executing Double-Tap Strategy...")
-                    
-                    # CLICK 1
-                    print("Clicking 'Post now' (1st time)...")
-                    post_now_btn.click()
-                    time.sleep(2)
-                    
-                    # CLICK 2 (If still there)
-                    if post_now_btn.is_visible():
-                        print("Clicking 'Post now' (2nd time)...")
-                        post_now_btn.click()
-                        time.sleep(2)
-                    else:
-                        print("Popup disappeared after 1st click.")
-
-            except Exception as e:
-                print(f"Popup handling error: {e}")
-
-            # Final Verification Loop
-            print("Verifying success...")
-            for i in range(5):
-                # If we are redirected, it worked
-                if "upload" not in page.url:
-                    print("✅ Success! Redirected to new page.")
-                    break
-                
-                # If the Manage Posts text appears, it worked
-                if page.locator("text=Manage your posts").is_visible():
-                    print("✅ Success! Found 'Manage your posts'.")
-                    break
-
-                # If the 'Post' button is STILL visible and enabled, try clicking it one last time
-                if post_btn.is_visible() and not post_btn.is_disabled():
-                    print("⚠️ Main Post button still here. Clicking it again...")
-                    post_btn.click()
-                
-                time.sleep(3)
-            
-            # Final Safety Wait
-            time.sleep(2)
-
-        except Exception as e:
-            print(f"TIKTOK ERROR: {e}")
-            page.screenshot(path="tiktok_error.png")
-
+            post_tiktok(page, media_path, caption)
         finally:
             browser.close()
-            config.close_browser(config.TT_PROFILE_ID)
+            bitbrowser.close_profile(profile_id)
 
 if __name__ == "__main__":
     run_tiktok_bot()
\ No newline at end of file
@@ -1,30 +1,180 @@
-import time
-import random
 from playwright.sync_api import sync_playwright
 import config.config as config
+import utils.waits as waits
+import utils.keystrokes as keystrokes
+import utils.spans as spans
+import utils.bitbrowser as bitbrowser
 
 # --- HUMAN HELPER FUNCTIONS ---
-def human_delay(min_seconds=1.5, max_seconds=4.0):
-    """Sleeps for a random amount of time to mimic human hesitation."""
-    sleep_time = random.uniform(min_seconds, max_seconds)
-    time.sleep(sleep_time)
-
 def type_like_human(page, selector, text):
-    """Types text one character at a time with variable speed."""
+    """Types text with human-like per-key timing (batched, see utils/keystrokes.py)."""
     try:
         page.locator(selector).first.click()
     except:
         pass
     
-    for char in text:
-        delay = random.uniform(0.05, 0.15)
-        if random.random() < 0.1: 
-            delay += random.uniform(0.2, 0.5)
-        page.keyboard.type(char)
-        time.sleep(delay)
-
-def run_twitter_bot():
-    ws_url = config.open_browser(config.TWITTER_PROFILE_ID)
+    keystrokes.type_text(page, text, "twitter")
+
+def post_twitter(page, media_path, caption):
+    """Run the X compose flow on a page already connected to the profile"""
+    jitter = waits.JitterBudget("twitter")
+    try:
+        spans.mark("navigate")
+        print("Navigating to X (Twitter)...")
+        page.goto("https://x.com/home", timeout=60000)
+
+        # 1. Find the Tweet Box
+        print("Looking for composer...")
+        # X uses specific data-testids. This is the main input box.
+        input_selector = "div[data-testid='tweetTextarea_0']"
+        composer = page.locator(input_selector)
+        side_post = page.locator("a[data-testid='SideNav_NewTweet_Button']")
+        found = waits.wait_any([composer, side_post], 30000)
+        jitter.pause(4, 7)
+
+        # Sometimes the composer isn't open, we might need to click "Post" side button
+        if found != 0 and not composer.is_visible():
+            print("Composer not visible. Clicking side 'Post' button...")
+            side_post.click()
+            waits.wait_visible(composer, 10000)
+            jitter.pause(2, 3)
+
+        # 2. Upload Media (Direct Injection)
+        spans.mark("upload")
+        if media_path:
+            print(f"Uploading media: {media_path}")
+            try:
+                # Twitter's file input is hidden but accessible
+                page.locator("input[data-testid='fileInput']").first.set_input_files(media_path)
+
+                # Wait for upload preview to appear
+                print("Waiting for media preview...")
+                page.locator("div[data-testid='attachments']").wait_for(state="visible", timeout=20000)
+                jitter.pause(3, 5) # Simulate looking at the preview
+            except Exception as e:
+                print(f"Media upload failed (or skipped): {e}")
+
+        # 3. Type Caption (Human)
+        spans.mark("caption")
+        print("Typing tweet...")
+        type_like_human(page, input_selector, caption)
+        jitter.pause(2, 4)
+
+        # 4. Click Post
+        spans.mark("publish")
+        print("Clicking Post...")
+        post_btn = page.locator("button[data-testid='tweetButtonInline']")
+
+        # Wait for button to enable (it's disabled while uploading)
+        waits.wait_enabled(post_btn, 60000)
+
+        jitter.pause(1, 2)
+        post_btn.click()
+
+        # 5. Verification
+        spans.mark("verify")
+        print("Waiting for confirmation...")
+        # We look for the "Your post was sent" toast or the text to appear in feed
+        try:
+            # X shows a "Your post was sent" toast at the bottom
+            page.wait_for_selector("div[data-testid='toast']", timeout=10000)
+            print("SUCCESS: Twitter post sent.")
+        except:
+            print("SUCCESS: Post clicked (Implicit).")
+
+    except Exception as e:
+        print(f"TWITTER ERROR: {e}")
+        page.screenshot(path="twitter_error.png")
+        raise
+
+async def type_like_human_async(page, selector, text):
+    """Async version of type_like_human for the asyncio engine"""
+    try:
+        await page.locator(selector).first.click()
+    except:
+        pass
+    
+    await keystrokes.type_text_async(page, text, "twitter")
+
+async def post_twitter_async(page, media_path, caption):
+    """Async version of post_twitter: run the X compose flow on a page already connected to the profile"""
+    jitter = waits.JitterBudget("twitter")
+    try:
+        spans.mark("navigate")
+        print("Navigating to X (Twitter)...")
+        await page.goto("https://x.com/home", timeout=60000)
+
+        # 1. Find the Tweet Box
+        print("Looking for composer...")
+        # X uses specific data-testids. This is the main input box.
+        input_selector = "div[data-testid='tweetTextarea_0']"
+        composer = page.locator(input_selector)
+        side_post = page.locator("a[data-testid='SideNav_NewTweet_Button']")
+        found = await waits.wait_any_async([composer, side_post], 30000)
+        await jitter.pause_async(4, 7)
+
+        # Sometimes the composer isn't open, we might need to click "Post" side button
+        if found != 0 and not await composer.is_visible():
+            print("Composer not visible. Clicking side 'Post' button...")
+            await side_post.click()
+            await waits.wait_visible_async(composer, 10000)
+            await jitter.pause_async(2, 3)
+
+        # 2. Upload Media (Direct Injection)
+        spans.mark("upload")
+        if media_path:
+            print(f"Uploading media: {media_path}")
+            try:
+                # Twitter's file input is hidden but accessible
+                await page.locator("input[data-testid='fileInput']").first.set_input_files(media_path)
+
+                # Wait for upload preview to appear
+                print("Waiting for media preview...")
+                await page.locator("div[data-testid='attachments']").wait_for(state="visible", timeout=20000)
+                await jitter.pause_async(3, 5) # Simulate looking at the preview
+            except Exception as e:
+                print(f"Media upload failed (or skipped): {e}")
+
+        # 3. Type Caption (Human)
+        spans.mark("caption")
+        print("Typing tweet...")
+        await type_like_human_async(page, input_selector, caption)
+        await jitter.pause_async(2, 4)
+
+        # 4. Click Post
+        spans.mark("publish")
+        print("Clicking Post...")
+        post_btn = page.locator("button[data-testid='tweetButtonInline']")
+
+        # Wait for button to enable (it's disabled while uploading)
+        await waits.wait_enabled_async(post_btn, 60000)
+
+        await jitter.pause_async(1, 2)
+        await post_btn.click()
+
+        # 5. Verification
+        spans.mark("verify")
+        print("Waiting for confirmation...")
+        # We look for the "Your post was sent" toast or the text to appear in feed
+        try:
+            # X shows a "Your post was sent" toast at the bottom
+            await page.wait_for_selector("div[data-testid='toast']", timeout=10000)
+            print("SUCCESS: Twitter post sent.")
+        except:
+            print("SUCCESS: Post clicked (Implicit).")
+
+    except Exception as e:
+        print(f"TWITTER ERROR: {e}")
+        await page.screenshot(path="twitter_error.png")
+        raise
+
+def run_twitter_bot(profile_id=None, media_path=None, caption=None):
+    """Post a tweet. Arguments default to the TWITTER_* values in config."""
+    profile_id = profile_id or config.TWITTER_PROFILE_ID
+    media_path = media_path if media_path is not None else config.TWITTER_MEDIA_PATH
+    caption = caption if caption is not None else config.TWITTER_CAPTION
+
+    ws_url = bitbrowser.open_profile(profile_id)
     if not ws_url:
         return
 
@@ -34,70 +184,10 @@ def run_twitter_bot():
         page = context.pages[0] if context.pages else context.new_page()
 
         try:
-            print("Navigating to X (Twitter)...")
-            page.goto("https://x.com/home", timeout=60000)
-            human_delay(4, 7)
-
-            # 1. Find the Tweet Box
-            print("Looking for composer...")
-            # X uses specific data-testids. This is the main input box.
-            input_selector = "div[data-testid='tweetTextarea_0']"
-            
-            # Sometimes the composer isn't open, we might need to click "Post" side button
-            if not page.locator(input_selector).is_visible():
-                print("Composer not visible. Clicking side 'Post' button...")
-                page.locator("a[data-testid='SideNav_NewTweet_Button']").click()
-                human_delay(2, 3)
-
-            # 2. Upload Media (Direct Injection)
-            if config.TWITTER_MEDIA_PATH:
-                print(f"Uploading media: {config.TWITTER_MEDIA_PATH}")
-                try:
-                    # Twitter's file input is hidden but accessible
-                    page.locator("input[data-testid='fileInput']").first.set_input_files(config.TWITTER_MEDIA_PATH)
-                    
-                    # Wait for upload preview to appear
-                    print("Waiting for media preview...")
-                    page.locator("div[data-testid='attachments']").wait_for(state="visible", timeout=20000)
-                    human_delay(3, 5) # Simulate looking at the preview
-                except Exception as e:
-                    print(f"Media upload failed (or skipped): {e}")
-
-            # 3. Type Caption (Human)
-            print("Typing tweet...")
-            type_like_human(page, input_selector, config.TWITTER_CAPTION)
-            human_delay(2, 4)
-
-            # 4. Click Post
-            print("Clicking Post...")
-            post_btn = page.locator("button[data-testid='tweetButtonInline']")
-            
-            # Wait for button to enable (it's disabled while uploading)
-            for i in range(10):
-                if not post_btn.is_disabled():
-                    break
-                time.sleep(1)
-            
-            human_delay(1, 2)
-            post_btn.click()
-
-            # 5. Verification
-            print("Waiting for confirmation...")
-            # We look for the "Your post was sent" toast or the text to appear in feed
-            try:
-                # X shows a "Your post was sent" toast at the bottom
-                page.wait_for_selector("div[data-testid='toast']", timeout=10000)
-                print("SUCCESS: Twitter post sent.")
-            except:
-                print("SUCCESS: Post clicked (Implicit).")
-
-        except Exception as e:
-            print(f"TWITTER ERROR: {e}")
-            page.screenshot(path="twitter_error.png")
-
+            post_twitter(page, media_path, caption)
         finally:
             browser.close()
-            config.close_browser(config.TWITTER_PROFILE_ID)
+            bitbrowser.close_profile(profile_id)
 
 if __name__ == "__main__":
     run_twitter_bot()
\ No newline at end of file
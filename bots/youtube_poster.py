@@ -1,16 +1,13 @@
-import time
-import random
 from playwright.sync_api import sync_playwright
 import config.config as config
+import utils.waits as waits
+import utils.keystrokes as keystrokes
+import utils.spans as spans
+import utils.bitbrowser as bitbrowser
 
 # --- HUMAN HELPER FUNCTIONS ---
-def human_delay(min_seconds=1.5, max_seconds=4.0):
-    """Sleeps for a random amount of time to mimic human hesitation."""
-    sleep_time = random.uniform(min_seconds, max_seconds)
-    time.sleep(sleep_time)
-
 def type_like_human(page, selector, text):
-    """Types text one character at a time with variable speed."""
+    """Types text with human-like per-key timing (batched, see utils/keystrokes.py)."""
     # Click the element first to focus
     page.locator(selector).first.click()
     
@@ -18,19 +15,210 @@ def type_like_human(page, selector, text):
     page.keyboard.press("Control+A")
     page.keyboard.press("Backspace")
     
-    for char in text:
-        # Standard keystroke (50ms - 150ms)
-        delay = random.uniform(0.05, 0.15)
-        
-        # Occasional "thinking" pause (every 15-25 chars)
-        if random.random() < 0.05: 
-            delay += random.uniform(0.3, 0.7)
-            
-        page.keyboard.type(char)
-        time.sleep(delay)
-
-def run_youtube_bot():
-    ws_url = config.open_browser(config.YT_PROFILE_ID)
+    keystrokes.type_text(page, text, "youtube")
+
+def post_youtube(page, video_path, title):
+    """Run the YouTube Studio upload flow on a page already connected to the profile"""
+    jitter = waits.JitterBudget("youtube")
+    try:
+        spans.mark("navigate")
+        print("Navigating to YouTube Studio...")
+        page.goto("https://studio.youtube.com", timeout=60000)
+        create_btn = page.get_by_role("button", name="Create", exact=True)
+        waits.wait_visible(create_btn, 30000) # Wait for dashboard to load
+        jitter.pause(3, 6)
+
+        # 1. Click Create
+        print("Clicking Create...")
+        create_btn.click()
+        upload_item = page.get_by_role("menuitem", name="Upload videos")
+        waits.wait_visible(upload_item, 10000) # Menu drops down
+        jitter.pause(0.5, 1.5)
+
+        print("Clicking Upload videos...")
+        upload_item.click()
+        select_btn = page.get_by_role("button", name="Select files")
+        waits.wait_visible(select_btn, 15000) # Wait for modal
+        jitter.pause(2, 4)
+
+        # 2. Upload File
+        spans.mark("upload")
+        print(f"Uploading file: {video_path}")
+        with page.expect_file_chooser() as fc_info:
+            select_btn.click()
+
+        file_chooser = fc_info.value
+        file_chooser.set_files(video_path)
+
+        # The details form opens as soon as the upload starts
+        print("Processing upload...")
+        title_box = page.locator("#textbox").first
+        waits.wait_visible(title_box, 60000)
+
+        # 3. Fill Title (Human Typing)
+        spans.mark("caption")
+        print("Setting Title...")
+        waits.wait_enabled(title_box, 30000)
+
+        # Use the human typing function
+        type_like_human(page, "#textbox", title)
+
+        jitter.pause(2, 4) # Review what was typed
+
+        # 4. Handle "Not for Kids"
+        print("Selecting 'Not made for kids'...")
+        page.get_by_role("radio", name="No, it's not made for kids").first.click()
+        jitter.pause(1, 2)
+
+        # 5. Click Next, Next, Next...
+        print("Clicking through steps...")
+        next_btn = page.get_by_role("button", name="Next").first
+        for i in range(3):
+            waits.wait_enabled(next_btn, 15000)
+            next_btn.click()
+            jitter.pause(2, 4) # Pause between pages to "read" checks
+
+        # 6. Set Visibility to Public
+        spans.mark("publish")
+        print("Setting Public...")
+        public_radio = page.get_by_role("radio", name="Public").first
+        waits.wait_visible(public_radio, 15000)
+        public_radio.click()
+        jitter.pause(1, 2)
+
+        # 7. Publish (enabled once the upload reaches 100%)
+        print("Waiting for upload to finish...")
+        if not waits.wait_text(page, r"Upload complete|Checks complete|100%", 300000):
+            print("Upload progress not confirmed, trying Publish anyway...")
+        publish_btn = page.get_by_role("button", name="Publish").first
+        waits.wait_enabled(publish_btn, 30000)
+
+        print("Clicking Publish...")
+        # Final hesitation
+        jitter.pause(2, 3)
+        publish_btn.click()
+
+        # 8. Wait for "Video Published" Dialog
+        spans.mark("verify")
+        print("Waiting for success dialog...")
+        page.wait_for_selector("text=Video published", timeout=60000)
+        print("SUCCESS: YouTube video done.")
+
+    except Exception as e:
+        print(f"YOUTUBE ERROR: {e}")
+        page.screenshot(path="yt_error.png")
+        raise
+
+async def type_like_human_async(page, selector, text):
+    """Async version of type_like_human for the asyncio engine"""
+    # Click the element first to focus
+    await page.locator(selector).first.click()
+    
+    # Clear existing text first (Ctrl+A, Delete)
+    await page.keyboard.press("Control+A")
+    await page.keyboard.press("Backspace")
+    
+    await keystrokes.type_text_async(page, text, "youtube")
+
+async def post_youtube_async(page, video_path, title):
+    """Async version of post_youtube: run the YouTube Studio upload flow on a page already connected to the profile"""
+    jitter = waits.JitterBudget("youtube")
+    try:
+        spans.mark("navigate")
+        print("Navigating to YouTube Studio...")
+        await page.goto("https://studio.youtube.com", timeout=60000)
+        create_btn = page.get_by_role("button", name="Create", exact=True)
+        await waits.wait_visible_async(create_btn, 30000) # Wait for dashboard to load
+        await jitter.pause_async(3, 6)
+
+        # 1. Click Create
+        print("Clicking Create...")
+        await create_btn.click()
+        upload_item = page.get_by_role("menuitem", name="Upload videos")
+        await waits.wait_visible_async(upload_item, 10000) # Menu drops down
+        await jitter.pause_async(0.5, 1.5)
+
+        print("Clicking Upload videos...")
+        await upload_item.click()
+        select_btn = page.get_by_role("button", name="Select files")
+        await waits.wait_visible_async(select_btn, 15000) # Wait for modal
+        await jitter.pause_async(2, 4)
+
+        # 2. Upload File
+        spans.mark("upload")
+        print(f"Uploading file: {video_path}")
+        async with page.expect_file_chooser() as fc_info:
+            await select_btn.click()
+
+        file_chooser = await fc_info.value
+        await file_chooser.set_files(video_path)
+
+        # The details form opens as soon as the upload starts
+        print("Processing upload...")
+        title_box = page.locator("#textbox").first
+        await waits.wait_visible_async(title_box, 60000)
+
+        # 3. Fill Title (Human Typing)
+        spans.mark("caption")
+        print("Setting Title...")
+        await waits.wait_enabled_async(title_box, 30000)
+
+        # Use the human typing function
+        await type_like_human_async(page, "#textbox", title)
+
+        await jitter.pause_async(2, 4) # Review what was typed
+
+        # 4. Handle "Not for Kids"
+        print("Selecting 'Not made for kids'...")
+        await page.get_by_role("radio", name="No, it's not made for kids").first.click()
+        await jitter.pause_async(1, 2)
+
+        # 5. Click Next, Next, Next...
+        print("Clicking through steps...")
+        next_btn = page.get_by_role("button", name="Next").first
+        for i in range(3):
+            await waits.wait_enabled_async(next_btn, 15000)
+            await next_btn.click()
+            await jitter.pause_async(2, 4) # Pause between pages to "read" checks
+
+        # 6. Set Visibility to Public
+        spans.mark("publish")
+        print("Setting Public...")
+        public_radio = page.get_by_role("radio", name="Public").first
+        await waits.wait_visible_async(public_radio, 15000)
+        await public_radio.click()
+        await jitter.pause_async(1, 2)
+
+        # 7. Publish (enabled once the upload reaches 100%)
+        print("Waiting for upload to finish...")
+        if not await waits.wait_text_async(page, r"Upload complete|Checks complete|100%", 300000):
+            print("Upload progress not confirmed, trying Publish anyway...")
+        publish_btn = page.get_by_role("button", name="Publish").first
+        await waits.wait_enabled_async(publish_btn, 30000)
+
+        print("Clicking Publish...")
+        # Final hesitation
+        await jitter.pause_async(2, 3)
+        await publish_btn.click()
+
+        # 8. Wait for "Video Published" Dialog
+        spans.mark("verify")
+        print("Waiting for success dialog...")
+        await page.wait_for_selector("text=Video published", timeout=60000)
+        print("SUCCESS: YouTube video done.")
+
+    except Exception as e:
+        print(f"YOUTUBE ERROR: {e}")
+        await page.screenshot(path="yt_error.png")
+        raise
+
+def run_youtube_bot(profile_id=None, video_path=None, title=None):
+    """Post a Short. Arguments default to the YT_* values in config."""
+    profile_id = profile_id or config.YT_PROFILE_ID
+    video_path = video_path or config.YT_VIDEO_PATH
+    title = title if title is not None else config.YT_TITLE
+
+    ws_url = bitbrowser.open_profile(profile_id)
     if not ws_url:
         return
 
@@ -40,76 +228,10 @@ def run_youtube_bot():
         page = context.pages[0] if context.pages else context.new_page()
 
         try:
-            print("Navigating to YouTube Studio...")
-            page.goto("https://studio.youtube.com", timeout=60000)
-            human_delay(3, 6) # Wait for dashboard to load
-
-            # 1. Click Create
-            print("Clicking Create...")
-            page.get_by_role("button", name="Create", exact=True).click()
-            human_delay(0.5, 1.5) # Quick pause for menu to drop down
-            
-            print("Clicking Upload videos...")
-            page.get_by_role("menuitem", name="Upload videos").click()
-            human_delay(2, 4) # Wait for modal
-
-            # 2. Upload File
-            print(f"Uploading file: {config.YT_VIDEO_PATH}")
-            with page.expect_file_chooser() as fc_info:
-                page.get_by_role("button", name="Select files").click()
-            
-            file_chooser = fc_info.value
-            file_chooser.set_files(config.YT_VIDEO_PATH)
-            
-            # Simulate waiting for the "Processing" bar
-            print("Processing upload...")
-            human_delay(6, 10) 
-
-            # 3. Fill Title (Human Typing)
-            print("Setting Title...")
-            # Wait for the title box to actually be editable
-            title_box = page.locator("#textbox").first
-            title_box.wait_for(state="visible")
-            
-            # Use the human typing function
-            type_like_human(page, "#textbox", config.YT_TITLE)
-            
-            human_delay(2, 4) # Review what was typed
-
-            # 4. Handle "Not for Kids"
-            print("Selecting 'Not made for kids'...")
-            page.get_by_role("radio", name="No, it's not made for kids").first.click()
-            human_delay(1, 2)
-
-            # 5. Click Next, Next, Next...
-            print("Clicking through steps...")
-            for i in range(3):
-                page.get_by_role("button", name="Next").first.click()
-                human_delay(2, 4) # Pause between pages to "read" checks
-
-            # 6. Set Visibility to Public
-            print("Setting Public...")
-            page.get_by_role("radio", name="Public").first.click()
-            human_delay(1, 2)
-
-            # 7. Publish
-            print("Clicking Publish...")
-            # Final hesitation
-            human_delay(2, 3)
-            page.get_by_role("button", name="Publish").first.click()
-
-            # 8. Wait for "Video Published" Dialog
-            print("Waiting for success dialog...")
-            page.wait_for_selector("text=Video published", timeout=60000)
-            print("SUCCESS: YouTube video done.")
-
-        except Exception as e:
-            print(f"YOUTUBE ERROR: {e}")
-            page.screenshot(path="yt_error.png")
-
+            post_youtube(page, video_path, title)
         finally:
             browser.close()
-            config.close_browser(config.YT_PROFILE_ID)
+            bitbrowser.close_profile(profile_id)
 
 if __name__ == "__main__":
     run_youtube_bot()
\ No newline at end of file
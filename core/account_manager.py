@@ -1,5 +1,4 @@
-import psycopg2
-import config.db_config as db_config
+import core.db as db
 
 def add_account_interactive():
     """Interactive tool to add accounts"""
@@ -58,31 +57,23 @@ def add_account_interactive():
     
     # Add to database
     try:
-        conn = psycopg2.connect(
-            host=db_config.DB_HOST,
-            database=db_config.DB_NAME,
-            user=db_config.DB_USER,
-            password=db_config.DB_PASS,
-            port=db_config.DB_PORT
-        )
-        
-        cur = conn.cursor()
-        
-        cur.execute("""
-            INSERT INTO social_accounts (platform, account_name, bitbrowser_profile_id, enabled)
-            VALUES (%s, %s, %s, TRUE)
-            ON CONFLICT (platform, account_name) 
-            DO UPDATE SET bitbrowser_profile_id = EXCLUDED.bitbrowser_profile_id
-            RETURNING id
-        """, (platform, account_name, profile_id))
-        
-        account_id = cur.fetchone()[0]
-        conn.commit()
-        
-        print(f"\n✅ Account added successfully! (ID: {account_id})")
-        
-        cur.close()
-        conn.close()
+        with db.connection() as conn:
+            cur = conn.cursor()
+            
+            cur.execute("""
+                INSERT INTO social_accounts (platform, account_name, bitbrowser_profile_id, enabled)
+                VALUES (%s, %s, %s, TRUE)
+                ON CONFLICT (platform, account_name) 
+                DO UPDATE SET bitbrowser_profile_id = EXCLUDED.bitbrowser_profile_id
+                RETURNING id
+            """, (platform, account_name, profile_id))
+            
+            account_id = cur.fetchone()[0]
+            conn.commit()
+            
+            print(f"\n✅ Account added successfully! (ID: {account_id})")
+            
+            cur.close()
         
     except Exception as e:
         print(f"\n❌ Database Error: {e}")
@@ -91,47 +82,41 @@ def list_accounts():
     """List all accounts"""
     
     try:
-        conn = psycopg2.connect(
-            host=db_config.DB_HOST,
-            database=db_config.DB_NAME,
-            user=db_config.DB_USER,
-            password=db_config.DB_PASS,
-            port=db_config.DB_PORT
-        )
-        
-        cur = conn.cursor()
-        
-        cur.execute("""
-            SELECT id, platform, account_name, bitbrowser_profile_id, enabled
-            FROM social_accounts
-            ORDER BY platform, account_name
-        """)
-        
-        rows = cur.fetchall()
-        
-        print("\n" + "=" * 80)
-        print("📋 YOUR SOCIAL MEDIA ACCOUNTS")
-        print("=" * 80)
-        
-        if not rows:
-            print("\n📭 No accounts found. Add some using option 1!")
-        else:
-            current_platform = None
-            for row in rows:
-                account_id, platform, name, profile_id, enabled = row
-                
-                if platform != current_platform:
-                    print(f"\n🎯 {platform}:")
-                    current_platform = platform
-                
-                status = "✅ Active" if enabled else "⏸️  Disabled"
-                profile_short = profile_id[:20] + "..." if len(profile_id) > 20 else profile_id
-                print(f"   [{account_id}] {name} - {profile_short} - {status}")
-        
-        print("\n" + "=" * 80)
-        
-        cur.close()
-        conn.close()
+        with db.connection() as conn:
+            cur = conn.cursor()
+            
+            cur.execute("""
+                SELECT sa.id, sa.platform, sa.account_name, sa.bitbrowser_profile_id, sa.enabled,
+                       COALESCE(st.posted, 0), COALESCE(st.pending, 0), COALESCE(st.failed, 0)
+                FROM social_accounts sa
+                LEFT JOIN account_stats st ON sa.id = st.account_id
+                ORDER BY sa.platform, sa.account_name
+            """)
+            
+            rows = cur.fetchall()
+            
+            print("\n" + "=" * 80)
+            print("📋 YOUR SOCIAL MEDIA ACCOUNTS")
+            print("=" * 80)
+            
+            if not rows:
+                print("\n📭 No accounts found. Add some using option 1!")
+            else:
+                current_platform = None
+                for row in rows:
+                    account_id, platform, name, profile_id, enabled, posted, pending, failed = row
+                    
+                    if platform != current_platform:
+                        print(f"\n🎯 {platform}:")
+                        current_platform = platform
+                    
+                    status = "✅ Active" if enabled else "⏸️  Disabled"
+                    profile_short = profile_id[:20] + "..." if len(profile_id) > 20 else profile_id
+                    print(f"   [{account_id}] {name} - {profile_short} - {status} - {posted} posted, {pending} pending, {failed} failed")
+            
+            print("\n" + "=" * 80)
+            
+            cur.close()
         
     except Exception as e:
         print(f"\n❌ Database Error: {e}")
@@ -148,36 +133,28 @@ def toggle_account():
         return
     
     try:
-        conn = psycopg2.connect(
-            host=db_config.DB_HOST,
-            database=db_config.DB_NAME,
-            user=db_config.DB_USER,
-            password=db_config.DB_PASS,
-            port=db_config.DB_PORT
-        )
-        
-        cur = conn.cursor()
-        
-        # Toggle
-        cur.execute("""
-            UPDATE social_accounts 
-            SET enabled = NOT enabled
-            WHERE id = %s
-            RETURNING account_name, enabled
-        """, (account_id,))
-        
-        result = cur.fetchone()
-        
-        if result:
-            name, enabled = result
-            status = "ENABLED" if enabled else "DISABLED"
-            print(f"\n✅ Account '{name}' is now {status}")
-            conn.commit()
-        else:
-            print(f"\n❌ Account ID {account_id} not found!")
-        
-        cur.close()
-        conn.close()
+        with db.connection() as conn:
+            cur = conn.cursor()
+            
+            # Toggle
+            cur.execute("""
+                UPDATE social_accounts 
+                SET enabled = NOT enabled
+                WHERE id = %s
+                RETURNING account_name, enabled
+            """, (account_id,))
+            
+            result = cur.fetchone()
+            
+            if result:
+                name, enabled = result
+                status = "ENABLED" if enabled else "DISABLED"
+                print(f"\n✅ Account '{name}' is now {status}")
+                conn.commit()
+            else:
+                print(f"\n❌ Account ID {account_id} not found!")
+            
+            cur.close()
         
     except Exception as e:
         print(f"\n❌ Database Error: {e}")
@@ -200,33 +177,57 @@ def delete_account():
         return
     
     try:
-        conn = psycopg2.connect(
-            host=db_config.DB_HOST,
-            database=db_config.DB_NAME,
-            user=db_config.DB_USER,
-            password=db_config.DB_PASS,
-            port=db_config.DB_PORT
-        )
-        
-        cur = conn.cursor()
-        
-        cur.execute("""
-            DELETE FROM social_accounts 
-            WHERE id = %s
-            RETURNING account_name
-        """, (account_id,))
-        
-        result = cur.fetchone()
+        with db.connection() as conn:
+            cur = conn.cursor()
+            
+            cur.execute("""
+                DELETE FROM social_accounts 
+                WHERE id = %s
+                RETURNING account_name
+            """, (account_id,))
+            
+            result = cur.fetchone()
+            
+            if result:
+                name = result[0]
+                print(f"\n✅ Account '{name}' deleted!")
+                conn.commit()
+            else:
+                print(f"\n❌ Account ID {account_id} not found!")
+            
+            cur.close()
         
-        if result:
-            name = result[0]
-            print(f"\n✅ Account '{name}' deleted!")
+    except Exception as e:
+        print(f"\n❌ Database Error: {e}")
+
+def resume_account():
+    """Un-park an account's posts after logging its profile back in"""
+    
+    list_accounts()
+    
+    account_id = input("\nEnter account ID you logged back in: ").strip()
+    
+    if not account_id.isdigit():
+        print("❌ Invalid ID!")
+        return
+    
+    try:
+        with db.connection() as conn:
+            cur = conn.cursor()
+            
+            # Parked posts wait on next_attempt_at; make them due at their own time again
+            cur.execute("""
+                UPDATE platform_schedules 
+                SET next_attempt_at = NULL
+                WHERE account_id = %s
+                  AND posted = FALSE
+                  AND retry_count < 3
+                  AND next_attempt_at IS NOT NULL
+            """, (account_id,))
+            
+            print(f"\n✅ {cur.rowcount} post(s) of account #{account_id} are due again")
             conn.commit()
-        else:
-            print(f"\n❌ Account ID {account_id} not found!")
-        
-        cur.close()
-        conn.close()
+            cur.close()
         
     except Exception as e:
         print(f"\n❌ Database Error: {e}")
@@ -240,9 +241,10 @@ def main():
         print("2. List all accounts")
         print("3. Enable/Disable account")
         print("4. Delete account")
-        print("5. Exit")
+        print("5. Resume parked account (after logging back in)")
+        print("6. Exit")
         
-        choice = input("\nEnter choice (1-5): ").strip()
+        choice = input("\nEnter choice (1-6): ").strip()
         
         if choice == '1':
             add_account_interactive()
@@ -253,6 +255,8 @@ def main():
         elif choice == '4':
             delete_account()
         elif choice == '5':
+            resume_account()
+        elif choice == '6':
             print("\n👋 Goodbye!")
             break
         else:
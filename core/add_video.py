@@ -1,52 +1,81 @@
-import psycopg2
-import config.db_config as db_config
+import core.db as db
+import utils.content_hash as content_hash
+import utils.preflight as preflight
+import psycopg2.extras
 import sys
 import os
+import csv
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".m4v", ".webm")
+VALIDATE_WORKERS = 16      # Files checked in parallel (network shares are slow)
+WATCH_SECONDS = 10         # How often --watch rescans the folder
+
+# Content hashes of files seen before, keyed by (path, size, mtime)
+_hash_cache = None
+
+def get_hash_cache():
+    global _hash_cache
+    if _hash_cache is None:
+        _hash_cache = content_hash.HashCache()
+    return _hash_cache
 
 def add_video_to_queue(video_path, title, description="", link=""):
     """Add a new video to the posting queue"""
     
-    # Validate file exists
-    if not os.path.exists(video_path):
-        print(f"❌ Error: File not found: {video_path}")
+    # Validate, hash and probe the file
+    video = {"path": video_path, "title": title, "description": description, "link": link}
+    reason = check_video(video)
+    get_hash_cache().save()
+    preflight.get_cache().save()
+    if reason:
+        print(f"❌ Error: {video_path}: {reason}")
         return False
+    digest = video["content_hash"]
     
     try:
-        conn = psycopg2.connect(
-            host=db_config.DB_HOST,
-            database=db_config.DB_NAME,
-            user=db_config.DB_USER,
-            password=db_config.DB_PASS,
-            port=db_config.DB_PORT
-        )
-        
-        cur = conn.cursor()
-        
-        # Insert into queue
-        cur.execute("""
-            INSERT INTO social_queue 
-            (video_path, title, description, link)
-            VALUES (%s, %s, %s, %s)
-            RETURNING id
-        """, (video_path, title, description, link))
-        
-        job_id = cur.fetchone()[0]
-        conn.commit()
-        
-        print("=" * 60)
-        print("✅ VIDEO ADDED TO QUEUE")
-        print("=" * 60)
-        print(f"Job ID: #{job_id}")
-        print(f"Title: {title}")
-        print(f"File: {video_path}")
-        print(f"Description: {description[:50]}..." if len(description) > 50 else f"Description: {description}")
-        print("\n📅 The scheduler will automatically create random posting times")
-        print("   for all platforms when it next runs.")
-        print("=" * 60)
-        
-        cur.close()
-        conn.close()
+        with db.connection() as conn:
+            cur = conn.cursor()
+            
+            # Insert into queue (the same clip is only ever queued once)
+            cur.execute("""
+                INSERT INTO social_queue 
+                (video_path, title, description, link, content_hash, media_info, skip_platforms)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (content_hash) DO NOTHING
+                RETURNING id
+            """, (video_path, title, description, link, digest,
+                  psycopg2.extras.Json(video["media_info"]), list(video["skip_platforms"])))
+            
+            row = cur.fetchone()
+            conn.commit()
+            
+            if row is None:
+                cur.execute("SELECT id, video_path FROM social_queue WHERE content_hash = %s", (digest,))
+                existing_id, existing_path = cur.fetchone()
+                print(f"⚠️ This video is already queued as job #{existing_id} ({existing_path})")
+                cur.close()
+                return False
+            
+            job_id = row[0]
+            
+            print("=" * 60)
+            print("✅ VIDEO ADDED TO QUEUE")
+            print("=" * 60)
+            print(f"Job ID: #{job_id}")
+            print(f"Title: {title}")
+            print(f"File: {video_path}")
+            print(f"Description: {description[:50]}..." if len(description) > 50 else f"Description: {description}")
+            print(f"Media: {preflight.describe(video['media_info'])}")
+            for platform, problems in video["skip_platforms"].items():
+                print(f"⏭️ Not for {platform}: {', '.join(problems)}")
+            print("\n📅 A running scheduler creates random posting times for all")
+            print("   platforms right away (or the next time it starts).")
+            print("=" * 60)
+            
+            cur.close()
         return True
         
     except Exception as e:
@@ -76,37 +105,272 @@ def interactive_add():
     
     add_video_to_queue(video_path, title, description, link)
 
+def read_manifest(path):
+    """
+    Read videos from a CSV (header: path,title,description,link) or JSONL
+    file (one {"path": ..., "title": ...} object per line).
+    """
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+    
+    return [
+        {
+            "path": (row.get("path") or row.get("video_path") or "").strip(),
+            "title": (row.get("title") or "").strip(),
+            "description": (row.get("description") or row.get("desc") or "").strip(),
+            "link": (row.get("link") or "").strip(),
+        }
+        for row in rows
+    ]
+
+def title_from_filename(path):
+    """'2024-01-26_Cat_Tricks.mp4' -> '2024-01-26 Cat Tricks'"""
+    return os.path.splitext(os.path.basename(path))[0].replace("_", " ").strip()
+
+def scan_dir(folder):
+    """Video files directly inside `folder` with their current size"""
+    found = {}
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(VIDEO_EXTENSIONS):
+                found[entry.path] = entry.stat().st_size
+    return found
+
+def check_video(video):
+    """
+    Return None if the video can be queued, otherwise why not. Sets
+    video['content_hash'], video['media_info'] and video['skip_platforms']
+    (platforms whose limits it breaks, with the reasons).
+    """
+    path = video["path"]
+    
+    if not path:
+        return "no path"
+    if not video["title"]:
+        return "no title"
+    if not os.path.isfile(path):
+        return "file not found"
+    if os.path.getsize(path) == 0:
+        return "empty file"
+    try:
+        video["content_hash"] = get_hash_cache().hash(path)
+        video["media_info"] = preflight.probe(path)
+    except OSError as e:
+        return f"not readable ({e.strerror})"
+    
+    info = video["media_info"]
+    if info and "error" in info:
+        return f"broken video: {info['error']}"
+    video["skip_platforms"] = preflight.blocked_platforms(info)
+    if len(video["skip_platforms"]) == len(preflight.PLATFORM_RULES):
+        return "fits no platform (" + "; ".join(
+            f"{platform}: {', '.join(problems)}" for platform, problems in video["skip_platforms"].items()
+        ) + ")"
+    return None
+
+def validate_videos(videos):
+    """
+    Check and hash every file in a thread pool; returns (accepted, rejected
+    with reasons). A clip listed twice is only accepted the first time.
+    """
+    with ThreadPoolExecutor(VALIDATE_WORKERS) as pool:
+        reasons = list(pool.map(check_video, videos))
+    get_hash_cache().save()
+    preflight.get_cache().save()
+    
+    accepted, rejected = [], []
+    first_path = {}
+    for video, reason in zip(videos, reasons):
+        if reason is None and video["content_hash"] in first_path:
+            reason = f"same video as {first_path[video['content_hash']]}"
+        if reason is None:
+            first_path[video["content_hash"]] = video["path"]
+            accepted.append(video)
+        else:
+            rejected.append((video, reason))
+    return accepted, rejected
+
+def insert_videos(videos):
+    """
+    Queue all videos in one transaction. Videos whose content is already in
+    social_queue (or, for rows from before content hashes, whose path is)
+    are skipped. Returns (new job ids, skipped videos).
+    """
+    with db.connection() as conn:
+        cur = conn.cursor()
+        
+        cur.execute("""
+            SELECT video_path, content_hash FROM social_queue
+            WHERE content_hash = ANY(%s)
+               OR (content_hash IS NULL AND video_path = ANY(%s))
+        """, ([v["content_hash"] for v in videos], [v["path"] for v in videos]))
+        queued = set()
+        for path, digest in cur.fetchall():
+            queued.add(digest or path)
+        fresh = [v for v in videos if v["content_hash"] not in queued and v["path"] not in queued]
+        
+        inserted = set()
+        job_ids = []
+        if fresh:
+            # ON CONFLICT covers a clip queued by someone else since the SELECT
+            rows = psycopg2.extras.execute_values(cur, """
+                INSERT INTO social_queue
+                    (video_path, title, description, link, content_hash, media_info, skip_platforms)
+                VALUES %s
+                ON CONFLICT (content_hash) DO NOTHING
+                RETURNING id, content_hash
+            """, [
+                (v["path"], v["title"], v["description"], v["link"], v["content_hash"],
+                 psycopg2.extras.Json(v["media_info"]), list(v["skip_platforms"]))
+                for v in fresh
+            ],
+                page_size=1000, fetch=True)
+            job_ids = sorted(row[0] for row in rows)
+            inserted = {row[1] for row in rows}
+        
+        conn.commit()
+        cur.close()
+    
+    skipped = [v for v in videos if v["content_hash"] not in inserted]
+    return job_ids, skipped
+
+def print_report(accepted, job_ids, rejected):
+    print("=" * 60)
+    print(f"✅ Queued {len(job_ids)} video(s)" + (f" (jobs #{job_ids[0]} - #{job_ids[-1]})" if job_ids else ""))
+    if len(accepted) <= 20:
+        for video in accepted:
+            print(f"   • {video['title'][:50]}  ({video['path']})")
+    
+    partial = [v for v in accepted if v["skip_platforms"]]
+    if partial:
+        print(f"\n⏭️ {len(partial)} video(s) will skip some platforms:")
+        for video in partial[:20]:
+            skipped = "; ".join(f"{p}: {', '.join(problems)}" for p, problems in video["skip_platforms"].items())
+            print(f"   • {video['path']}: {skipped}")
+    
+    if rejected:
+        print(f"\n❌ Rejected {len(rejected)} file(s):")
+        for video, reason in rejected:
+            print(f"   • {video['path'] or '(no path)'}: {reason}")
+    print("=" * 60)
+
+def ingest(videos):
+    """Validate in parallel, insert in one transaction, report. Returns (queued, rejected)."""
+    started = time.monotonic()
+    accepted, rejected = validate_videos(videos)
+    
+    job_ids = []
+    if accepted:
+        try:
+            job_ids, skipped = insert_videos(accepted)
+        except Exception as e:
+            print(f"❌ Database Error: {e}")
+            return [], [(v, "database error") for v in videos]
+        skipped_paths = {v["path"] for v in skipped}
+        rejected += [(v, "already in queue") for v in skipped]
+        accepted = [v for v in accepted if v["path"] not in skipped_paths]
+    
+    print_report(accepted, job_ids, rejected)
+    print(f"⏱️ {len(videos)} file(s) processed in {time.monotonic() - started:.1f}s")
+    return accepted, rejected
+
+def add_manifest(path):
+    """Queue every video listed in a CSV or JSONL manifest"""
+    try:
+        videos = read_manifest(path)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read manifest: {e}")
+        return
+    
+    print(f"\n📦 Manifest {path}: {len(videos)} video(s)\n")
+    ingest(videos)
+
+def add_dir(folder, watch=False):
+    """
+    Queue every video file in `folder`, titled after its filename.
+    With watch=True keep rescanning; a file is only picked up once its size
+    has stopped changing between two scans (i.e. the copy has finished).
+    """
+    if not os.path.isdir(folder):
+        print(f"❌ Folder not found: {folder}")
+        return
+    
+    seen = set()       # queued now or already in the queue
+    failed = {}        # rejected path -> size, retried once the file changes
+    last_sizes = {}
+    
+    if watch:
+        print(f"👀 Watching {folder} every {WATCH_SECONDS}s. Ctrl+C to stop.")
+    
+    try:
+        while True:
+            sizes = scan_dir(folder)
+            ready = [
+                path for path, size in sorted(sizes.items())
+                if path not in seen and failed.get(path) != size
+                and (not watch or last_sizes.get(path) == size)
+            ]
+            last_sizes = sizes
+            
+            if ready:
+                print(f"\n📦 {len(ready)} new file(s) in {folder}\n")
+                videos = [
+                    {"path": path, "title": title_from_filename(path), "description": "", "link": ""}
+                    for path in ready
+                ]
+                accepted, rejected = ingest(videos)
+                seen.update(video["path"] for video in accepted)
+                for video, reason in rejected:
+                    if reason == "already in queue":
+                        seen.add(video["path"])
+                    else:
+                        failed[video["path"]] = sizes[video["path"]]
+            
+            if not watch:
+                break
+            time.sleep(WATCH_SECONDS)
+    except KeyboardInterrupt:
+        print("\nWatcher stopped.")
+
 def batch_add():
-    """Example of batch adding multiple videos"""
+    """Example of batch adding multiple videos (see --manifest for real batches)"""
     videos = [
         {
             "path": r"C:\Users\Sharmayn\Downloads\cat_video_1.mp4",
             "title": "Amazing Cat Does Backflip! 🐱",
-            "desc": "You won't believe what this cat can do! #cats #amazing",
+            "description": "You won't believe what this cat can do! #cats #amazing",
             "link": ""
         },
         {
             "path": r"C:\Users\Sharmayn\Downloads\cat_video_2.mp4",
             "title": "Funny Cat Compilation 😂",
-            "desc": "The funniest cat moments ever! #funny #pets",
+            "description": "The funniest cat moments ever! #funny #pets",
             "link": ""
         }
     ]
     
     print(f"\n📦 Batch adding {len(videos)} videos...\n")
-    
-    for v in videos:
-        add_video_to_queue(v['path'], v['title'], v['desc'], v['link'])
-        print()
+    ingest(videos)
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
         if sys.argv[1] == "--batch":
             batch_add()
+        elif sys.argv[1] == "--manifest" and len(sys.argv) > 2:
+            add_manifest(sys.argv[2])
+        elif sys.argv[1] == "--dir" and len(sys.argv) > 2:
+            add_dir(sys.argv[2], "--watch" in sys.argv)
         elif sys.argv[1] == "--help":
             print("Usage:")
-            print("  python add_video.py              # Interactive mode")
-            print("  python add_video.py --batch      # Batch mode (edit script first)")
-            print("  python add_video.py --help       # Show this help")
+            print("  python add_video.py                          # Interactive mode")
+            print("  python add_video.py --manifest videos.csv    # Queue a CSV/JSONL manifest")
+            print("  python add_video.py --dir FOLDER [--watch]   # Queue every video in a folder")
+            print("  python add_video.py --batch                  # Batch mode (edit script first)")
+            print("  python add_video.py --help                   # Show this help")
+        else:
+            print("❌ Unknown option. Run with --help")
     else:
         interactive_add()
\ No newline at end of file
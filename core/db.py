@@ -0,0 +1,156 @@
+import time
+import threading
+from contextlib import contextmanager
+import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
+import config.db_config as db_config
+
+# Pool settings (override in db_config.py)
+POOL_MIN = getattr(db_config, "DB_POOL_MIN", 1)
+POOL_MAX = getattr(db_config, "DB_POOL_MAX", 10)
+
+# Seconds to wait between reconnect attempts
+RETRY_BACKOFF = [1, 2, 5, 10, 30]
+
+# Hot queries, prepared once per connection with PREPARE and run with EXECUTE
+PREPARED_STATEMENTS = {}
+
+_pool = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(POOL_MAX)
+
+class PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers which statements it has prepared"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+def _connect_kwargs():
+    return {
+        "host": db_config.DB_HOST,
+        "database": db_config.DB_NAME,
+        "user": db_config.DB_USER,
+        "password": db_config.DB_PASS,
+        "port": db_config.DB_PORT,
+        "connection_factory": PooledConnection,
+    }
+
+def _with_backoff(action, what):
+    """Run `action`, retrying with RETRY_BACKOFF delays on connection errors"""
+    for attempt, delay in enumerate(RETRY_BACKOFF + [None], start=1):
+        try:
+            return action()
+        except psycopg2.OperationalError as e:
+            if delay is None:
+                raise
+            print(f"⚠️ {what} failed (attempt {attempt}): {e}. Retrying in {delay}s...")
+            time.sleep(delay)
+
+def connect():
+    """Open a dedicated (unpooled) connection, e.g. for LISTEN"""
+    return _with_backoff(lambda: psycopg2.connect(**_connect_kwargs()), "Database connect")
+
+def get_pool():
+    """Create the shared connection pool on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _with_backoff(
+                lambda: psycopg2.pool.ThreadedConnectionPool(POOL_MIN, POOL_MAX, **_connect_kwargs()),
+                "Database pool",
+            )
+        return _pool
+
+def is_healthy(conn):
+    """Cheap liveness check before handing a pooled connection out"""
+    if conn.closed:
+        return False
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT 1")
+        cur.close()
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+def get_connection():
+    """
+    Borrow a healthy connection from the pool.
+    Blocks while all POOL_MAX connections are in use, replaces dead
+    connections and reconnects with backoff if the server went away.
+    """
+    _slots.acquire()
+    try:
+        pool = get_pool()
+
+        def checkout():
+            conn = pool.getconn()
+            if not is_healthy(conn):
+                pool.putconn(conn, close=True)
+                conn = pool.getconn()
+                if not is_healthy(conn):
+                    pool.putconn(conn, close=True)
+                    raise psycopg2.OperationalError("pooled connection failed health check")
+            return conn
+
+        return _with_backoff(checkout, "Database checkout")
+    except Exception:
+        _slots.release()
+        raise
+
+def release_connection(conn):
+    """Return a connection to the pool (broken ones are discarded)"""
+    if conn is None:
+        return
+    try:
+        if conn.closed:
+            get_pool().putconn(conn, close=True)
+            return
+        if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            conn.rollback()
+        get_pool().putconn(conn)
+    except psycopg2.Error:
+        get_pool().putconn(conn, close=True)
+    finally:
+        _slots.release()
+
+def get_db_connection():
+    """Borrow a pooled connection, or print the error and return None"""
+    try:
+        return get_connection()
+    except Exception as e:
+        print(f"❌ Database Connection Failed: {e}")
+        return None
+
+@contextmanager
+def connection():
+    """`with db.connection() as conn:` borrows and always returns a connection"""
+    conn = get_connection()
+    try:
+        yield conn
+    finally:
+        release_connection(conn)
+
+def prepare(name, sql):
+    """
+    Register a hot query as a server-side prepared statement.
+    `sql` must be a full PREPARE body, e.g. "(int) AS SELECT ... WHERE id = $1".
+    """
+    PREPARED_STATEMENTS[name] = sql
+
+def execute_prepared(cur, name, params=()):
+    """EXECUTE a registered statement, preparing it on this connection first if needed"""
+    conn = cur.connection
+
+    if name not in conn.prepared:
+        cur.execute(f"PREPARE {name} {PREPARED_STATEMENTS[name]}")
+        conn.prepared.add(name)
+
+    if params:
+        placeholders = ", ".join(["%s"] * len(params))
+        cur.execute(f"EXECUTE {name} ({placeholders})", params)
+    else:
+        cur.execute(f"EXECUTE {name}")
\ No newline at end of file
@@ -1,9 +1,21 @@
-import time
+import asyncio
 import datetime
 import random
-import psycopg2
+import threading
+import socket
+import os
+import select
+import psycopg2.extensions
 import sys
-import config.db_config as db_config
+import core.db as db
+import utils.clock as clock
+import utils.spans as spans
+import utils.preflight as preflight
+import utils.media_stage as media_stage
+import utils.error_classifier as error_classifier
+import utils.rate_limit as rate_limit
+import utils.planner as planner
+import psycopg2.extras
 
 # Import your bots
 try:
@@ -12,37 +24,193 @@ try:
     import bots.tiktok_poster as tiktok_poster
     import bots.pinterest_poster as pinterest_poster
     import bots.twitter_poster as twitter_poster
-    import utils.force_reset as force_reset
+    import utils.profile_sessions as profile_sessions
+    import utils.async_engine as async_engine
 except ImportError as e:
     print(f"ERROR: Missing bot file. {e}")
     sys.exit()
 
-# Platform to bot mapping
-BOT_MAP = {
-    "YouTube Shorts": youtube_poster.run_youtube_bot,
-    "LinkedIn Video": linkedin_poster.run_linkedin_bot,
-    "TikTok": tiktok_poster.run_tiktok_bot,
-    "Pinterest Idea": pinterest_poster.run_pinterest_bot,
-    "Twitter": twitter_poster.run_twitter_bot
+# Platform to bot flow mapping (flows run on an already connected page)
+FLOW_MAP = {
+    "YouTube Shorts": youtube_poster.post_youtube,
+    "LinkedIn Video": linkedin_poster.post_linkedin,
+    "TikTok": tiktok_poster.post_tiktok,
+    "Pinterest Idea": pinterest_poster.post_pinterest,
+    "Twitter": twitter_poster.post_twitter
 }
 
-def get_db_connection():
-    try:
-        conn = psycopg2.connect(
-            host=db_config.DB_HOST,
-            database=db_config.DB_NAME,
-            user=db_config.DB_USER,
-            password=db_config.DB_PASS,
-            port=db_config.DB_PORT
-        )
-        return conn
-    except Exception as e:
-        print(f"❌ Database Connection Failed: {e}")
-        return None
+# Same flows for the asyncio engine (--async)
+ASYNC_FLOW_MAP = {
+    "YouTube Shorts": youtube_poster.post_youtube_async,
+    "LinkedIn Video": linkedin_poster.post_linkedin_async,
+    "TikTok": tiktok_poster.post_tiktok_async,
+    "Pinterest Idea": pinterest_poster.post_pinterest_async,
+    "Twitter": twitter_poster.post_twitter_async
+}
+
+# Worker pool settings
+DEFAULT_WORKERS = 1
+IDLE_POLL_SECONDS = 300      # Worker sleep when nothing is due
+JOB_CHECK_SECONDS = 60       # How often the main thread looks for new jobs
+SWEEP_SECONDS = 3600         # How often the full unscheduled-job sweep runs
+LEASE_SECONDS = 1800         # How long a claimed post stays reserved for its worker
+ARCHIVE_AFTER_HOURS = 24     # Finished schedules move to platform_schedules_archive after this
+ARCHIVE_BATCH = 5000         # Rows moved per archive transaction
+STAGE_LOOKAHEAD_MINUTES = 30 # Copy media of posts due this soon to the local cache
+PREFETCH_SECONDS = 60        # How often the prefetcher looks ahead
+ERROR_BACKOFF_SECONDS = 30   # Pause after an unexpected error before a loop carries on
+NOTIFY_CHANNEL = "sm_bot_changes"  # Filled by the triggers in setup.sql
+WARM_PROFILES_PER_WORKER = 3 # Profiles a worker keeps open between posts
+WARM_IDLE_SECONDS = 600      # Close a warm profile after this long unused
+ASYNC_MAX_OPEN = 10          # Profiles the asyncio engine keeps connected
+PRE_POST_WAIT = (10, 30)     # Seconds to wait before each post (human behavior)
+DEFAULT_POST_SECONDS = 180   # Planning guess for one post until post_attempts has data
+
+# Shared worker state. A profile is never handed to two workers at once, and
+# each account/platform spends a token from rate_limiter for every post
+# (spacing from platform_windows.min_delay_minutes/max_delay_minutes).
+_dispatch_lock = threading.Lock()
+_busy_profiles = set()
+rate_limiter = rate_limit.RateLimiter()
+capacity_workers = DEFAULT_WORKERS   # Workers the planner fills slots for (set by main)
+_warm_profiles = {}   # profile_id -> worker_id holding it open
+
+# Idle workers wait on this and are woken early by database notifications
+_wakeup = threading.Condition()
+_async_wakeups = []   # (event loop, asyncio.Event) pairs for --async workers
+
+# Hot queries run as server-side prepared statements (see core/db.py)
+db.prepare("sched_fetch_next", """(text[], int[], timestamp, text[]) AS
+        SELECT ps.id, ps.queue_id, ps.account_id, ps.platform, ps.scheduled_time,
+               sq.video_path, sq.title, sq.description, sq.link,
+               sa.account_name, sa.bitbrowser_profile_id
+        FROM platform_schedules ps
+        JOIN social_queue sq ON ps.queue_id = sq.id
+        JOIN social_accounts sa ON ps.account_id = sa.id
+        WHERE ps.posted = FALSE 
+          AND COALESCE(ps.next_attempt_at, ps.scheduled_time) <= $3
+          AND ps.retry_count < 3
+          AND sa.enabled = TRUE
+          AND NOT (sa.bitbrowser_profile_id = ANY($1))
+          AND NOT (ps.account_id = ANY($2))
+          AND NOT (ps.platform = ANY($4))
+        ORDER BY COALESCE(ps.next_attempt_at, ps.scheduled_time) ASC
+        LIMIT 1
+""")
+
+db.prepare("sched_claim_candidates", """(text[], int[], int, timestamp, text[]) AS
+        SELECT id, profile_id
+        FROM (
+            SELECT DISTINCT ON (sa.bitbrowser_profile_id)
+                   ps.id, sa.bitbrowser_profile_id AS profile_id,
+                   COALESCE(ps.next_attempt_at, ps.scheduled_time) AS due
+            FROM platform_schedules ps
+            JOIN social_accounts sa ON ps.account_id = sa.id
+            WHERE ps.posted = FALSE
+              AND COALESCE(ps.next_attempt_at, ps.scheduled_time) <= $4
+              AND ps.retry_count < 3
+              AND sa.enabled = TRUE
+              AND (ps.lease_expires_at IS NULL OR ps.lease_expires_at < $4)
+              AND NOT (sa.bitbrowser_profile_id = ANY($1))
+              AND NOT (ps.account_id = ANY($2))
+              AND NOT (ps.platform = ANY($5))
+              AND NOT EXISTS (
+                  SELECT 1 FROM profile_leases pl
+                  WHERE pl.bitbrowser_profile_id = sa.bitbrowser_profile_id
+                    AND pl.lease_expires_at >= $4
+              )
+            ORDER BY sa.bitbrowser_profile_id, COALESCE(ps.next_attempt_at, ps.scheduled_time) ASC
+        ) per_profile
+        ORDER BY due ASC
+        LIMIT $3
+""")
+
+# Takes the profile unless another worker holds a live lease on it. A claim of
+# the same profile still in flight in another transaction makes this wait for
+# that transaction, then skip the profile.
+db.prepare("sched_lease_profile", """(text, int, text, timestamp, timestamp) AS
+        INSERT INTO profile_leases (bitbrowser_profile_id, schedule_id, claimed_by, lease_expires_at)
+        VALUES ($1, $2, $3, $4)
+        ON CONFLICT (bitbrowser_profile_id) DO UPDATE
+        SET schedule_id = EXCLUDED.schedule_id,
+            claimed_by = EXCLUDED.claimed_by,
+            lease_expires_at = EXCLUDED.lease_expires_at
+        WHERE profile_leases.lease_expires_at < $5
+        RETURNING bitbrowser_profile_id
+""")
+
+db.prepare("sched_claim_post", """(int, text, timestamp, timestamp) AS
+        UPDATE platform_schedules ps
+        SET claimed_by = $2,
+            lease_expires_at = $3
+        FROM social_queue sq, social_accounts sa
+        WHERE ps.id = $1
+          AND ps.posted = FALSE
+          AND ps.retry_count < 3
+          AND (ps.lease_expires_at IS NULL OR ps.lease_expires_at < $4)
+          AND sq.id = ps.queue_id
+          AND sa.id = ps.account_id
+        RETURNING ps.id, ps.queue_id, ps.account_id, ps.platform, ps.scheduled_time,
+                  sq.video_path, sq.title, sq.description, sq.link,
+                  sa.account_name, sa.bitbrowser_profile_id
+""")
+
+db.prepare("sched_release_profile", """(int) AS
+        DELETE FROM profile_leases WHERE schedule_id = $1
+""")
+
+db.prepare("sched_mark_posted", """(int, timestamp) AS
+        UPDATE platform_schedules 
+        SET posted = TRUE, posted_at = $2,
+            claimed_by = NULL, lease_expires_at = NULL
+        WHERE id = $1
+""")
+
+# $3 is the error_classifier action: "fail" uses up the retries, "park" keeps them
+db.prepare("sched_mark_failed", """(text, int, text, text, timestamp) AS
+        UPDATE platform_schedules 
+        SET retry_count = CASE $3 WHEN 'fail' THEN GREATEST(retry_count + 1, 3)
+                                  WHEN 'park' THEN retry_count
+                                  ELSE retry_count + 1 END,
+            error_message = $1,
+            error_class = $4,
+            next_attempt_at = $5,
+            claimed_by = NULL, lease_expires_at = NULL
+        WHERE id = $2
+""")
+
+# Mark the post's video complete once none of its posts is left to go out.
+# Two posts of a video finishing together can both miss this; the hourly
+# complete_finished_jobs() catches those.
+db.prepare("sched_complete_job", """(int, timestamp) AS
+        UPDATE social_queue sq
+        SET completed_at = $2
+        FROM platform_schedules ps
+        WHERE ps.id = $1
+          AND sq.id = ps.queue_id
+          AND sq.completed_at IS NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM platform_schedules other
+              WHERE other.queue_id = sq.id
+                AND other.posted = FALSE
+                AND other.retry_count < 3
+          )
+""")
 
-def generate_random_time_today(min_hour, max_hour):
+# Hold every pending post of a logged-out account until $2
+db.prepare("sched_park_account", """(int, timestamp) AS
+        UPDATE platform_schedules 
+        SET next_attempt_at = GREATEST(COALESCE(next_attempt_at, scheduled_time), $2)
+        WHERE account_id = $1
+          AND posted = FALSE
+          AND retry_count < 3
+          AND claimed_by IS NULL
+""")
+
+def generate_random_time_today(min_hour, max_hour, now=None):
     """Generate a random time within specified hours for today"""
-    now = datetime.datetime.now()
+    if now is None:
+        now = clock.now()
     
     # Calculate window
     window_start = now.replace(hour=min_hour, minute=0, second=0, microsecond=0)
@@ -71,64 +239,205 @@ def generate_random_time_today(min_hour, max_hour):
     
     return scheduled
 
+def preflight_jobs(conn, job_ids):
+    """
+    Platforms each job must skip ({job_id: set}). Jobs added without
+    add_video.py (e.g. plain SQL) are probed here first and the result is
+    stored, so it only happens once per job. A file that fails to probe
+    (often a copy still in progress) skips every platform for now and
+    nothing is stored; the hourly sweep_unscheduled_jobs probes it again.
+    """
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT id, video_path, media_info IS NOT NULL, COALESCE(skip_platforms, '{}')
+        FROM social_queue WHERE id = ANY(%s)
+    """, (list(job_ids),))
+    rows = cur.fetchall()
+    
+    skips = {}
+    for job_id, path, probed, skip_platforms in rows:
+        if not probed:
+            try:
+                info = preflight.probe(path)
+            except OSError:
+                # File not visible from here; run_post checks again before posting
+                skips[job_id] = set()
+                continue
+            if info and "error" in info:
+                print(f"   ⏳ Job #{job_id} not scheduled yet: {info['error']}")
+                skips[job_id] = set(preflight.PLATFORM_RULES)
+                continue
+            blocked = preflight.blocked_platforms(info)
+            skip_platforms = list(blocked)
+            cur.execute(
+                "UPDATE social_queue SET media_info = %s, skip_platforms = %s WHERE id = %s",
+                (psycopg2.extras.Json(info), skip_platforms, job_id)
+            )
+            for platform, problems in blocked.items():
+                print(f"   ⏭️ Job #{job_id} skips {platform}: {', '.join(problems)}")
+        skips[job_id] = set(skip_platforms)
+    
+    conn.commit()
+    cur.close()
+    preflight.get_cache().save()
+    return skips
+
+def post_seconds_estimate(cur):
+    """Average wall time of a post over the last week, including the pre-post wait"""
+    cur.execute("""
+        SELECT AVG(total_ms) FROM post_attempts
+        WHERE started_at >= %s AND total_ms IS NOT NULL
+    """, (clock.now() - datetime.timedelta(days=7),))
+    avg_ms = cur.fetchone()[0]
+    seconds = float(avg_ms) / 1000 if avg_ms else DEFAULT_POST_SECONDS
+    return seconds + sum(PRE_POST_WAIT) / 2
+
+def load_planner(cur, now):
+    """
+    A SchedulePlanner holding everything already pending for the next
+    planner.MAX_DAYS days: posts per slot, and which slots each account and
+    profile already use. Overdue posts count as a backlog starting now.
+    """
+    slot_capacity = capacity_workers * planner.SLOT_MINUTES * 60 / post_seconds_estimate(cur)
+    plan = planner.SchedulePlanner(now, max(1, int(slot_capacity)))
+    
+    cur.execute("""
+        SELECT ps.account_id, sa.bitbrowser_profile_id,
+               date_trunc('hour', due) + floor(date_part('minute', due) / %(slot)s) * %(slot)s * INTERVAL '1 minute',
+               due < %(now)s,
+               COUNT(*)
+        FROM platform_schedules ps
+        JOIN social_accounts sa ON sa.id = ps.account_id
+        CROSS JOIN LATERAL (SELECT COALESCE(ps.next_attempt_at, ps.scheduled_time) AS due) d
+        WHERE ps.posted = FALSE
+          AND ps.retry_count < 3
+          AND COALESCE(ps.next_attempt_at, ps.scheduled_time) < %(horizon)s
+        GROUP BY 1, 2, 3, 4
+    """, {"slot": planner.SLOT_MINUTES, "now": now,
+          "horizon": now + datetime.timedelta(days=planner.MAX_DAYS)})
+    
+    backlog = 0
+    for account_id, profile_id, slot, overdue, count in cur.fetchall():
+        if overdue:
+            plan.occupy(planner.slot_of(now), account_id, profile_id)
+            backlog += count
+        else:
+            plan.occupy(slot, account_id, profile_id)
+            plan.add_load(slot, count)
+    plan.add_backlog(backlog)
+    return plan
+
 def create_schedules_for_job(conn, job_id):
     """Create randomized schedules for all enabled accounts"""
+    create_schedules_for_jobs(conn, [job_id])
+
+def create_schedules_for_jobs(conn, job_ids, account_ids=None, mark_through=None):
+    """
+    Create randomized schedules for many jobs × enabled accounts at once.
+    Times come from a SchedulePlanner (utils/planner.py) loaded with what is
+    already pending, so posts spread over the platform windows at the rate the
+    workers can post them, and the whole batch is written in a single
+    INSERT ... SELECT FROM unnest().
+    Platforms a job's file can't go to (see preflight_jobs) are left out.
+    Pass `account_ids` to limit the accounts, and `mark_through` to advance
+    their scheduled_through marker in the same transaction.
+    """
+    if not job_ids:
+        return 0
+    
     cur = conn.cursor()
     
     # Get all enabled accounts
     cur.execute("""
-        SELECT sa.id, sa.platform, sa.account_name, pw.min_hour, pw.max_hour
+        SELECT sa.id, sa.platform, sa.account_name, pw.min_hour, pw.max_hour,
+               sa.bitbrowser_profile_id, pw.min_delay_minutes
         FROM social_accounts sa
         JOIN platform_windows pw ON sa.platform = pw.platform
         WHERE sa.enabled = TRUE AND pw.enabled = TRUE
-    """)
+          AND (%s::int[] IS NULL OR sa.id = ANY(%s::int[]))
+    """, (account_ids, account_ids))
     
     accounts = cur.fetchall()
     
     if not accounts:
         print("   ⚠️ No enabled accounts found!")
         cur.close()
-        return
+        return 0
+    
+    skips = preflight_jobs(conn, job_ids)
     
-    print(f"\n📅 Creating schedules for Job #{job_id} across {len(accounts)} accounts:")
+    now = clock.now()
+    queue_ids, row_account_ids, platforms, times = [], [], [], []
     
-    for account_id, platform, account_name, min_hour, max_hour in accounts:
-        scheduled_time = generate_random_time_today(min_hour, max_hour)
+    try:
+        plan = load_planner(cur, now)
         
-        try:
+        for job_id in job_ids:
+            for account_id, platform, account_name, min_hour, max_hour, profile_id, spacing in accounts:
+                if platform in skips.get(job_id, ()):
+                    continue
+                scheduled = plan.plan(account_id, profile_id, min_hour, max_hour, spacing or 0)
+                queue_ids.append(job_id)
+                row_account_ids.append(account_id)
+                platforms.append(platform)
+                times.append(scheduled or generate_random_time_today(min_hour, max_hour, now))
+        
+        cur.execute("""
+            INSERT INTO platform_schedules (queue_id, account_id, platform, scheduled_time, posted)
+            SELECT q, a, p, t, FALSE
+            FROM unnest(%s::int[], %s::int[], %s::varchar[], %s::timestamp[]) AS v(q, a, p, t)
+            WHERE NOT EXISTS (
+                SELECT 1 FROM platform_schedules_archive psa
+                WHERE psa.queue_id = v.q AND psa.account_id = v.a
+            )
+            ON CONFLICT (queue_id, account_id) DO NOTHING
+            RETURNING queue_id, account_id, scheduled_time
+        """, (queue_ids, row_account_ids, platforms, times))
+        created = cur.fetchall()
+        
+        if mark_through is not None:
             cur.execute("""
-                INSERT INTO platform_schedules (queue_id, account_id, platform, scheduled_time, posted)
-                VALUES (%s, %s, %s, %s, FALSE)
-                ON CONFLICT (queue_id, account_id) DO NOTHING
-            """, (job_id, account_id, platform, scheduled_time))
-            
-            print(f"   ✅ {platform} ({account_name}): {scheduled_time.strftime('%I:%M %p on %b %d')}")
-        except Exception as e:
-            print(f"   ⚠️ Failed to schedule {platform} ({account_name}): {e}")
+                UPDATE social_accounts
+                SET scheduled_through = GREATEST(scheduled_through, %s)
+                WHERE id = ANY(%s)
+            """, (mark_through, [a[0] for a in accounts]))
+        
+        conn.commit()
+    except Exception as e:
+        print(f"   ⚠️ Failed to create schedules: {e}")
+        conn.rollback()
+        cur.close()
+        return 0
     
-    conn.commit()
     cur.close()
+    
+    names = {account[0]: (account[1], account[2]) for account in accounts}
+    by_job = {}
+    for queue_id, account_id, scheduled_time in created:
+        by_job.setdefault(queue_id, []).append((account_id, scheduled_time))
+    
+    # Per-account detail for small batches, one line per job otherwise
+    detailed = len(created) <= 50
+    for job_id in job_ids:
+        rows = sorted(by_job.get(job_id, []), key=lambda r: r[1])
+        print(f"\n📅 Created {len(rows)} schedules for Job #{job_id} across {len(accounts)} accounts")
+        if detailed:
+            for account_id, scheduled_time in rows:
+                platform, account_name = names[account_id]
+                print(f"   ✅ {platform} ({account_name}): {scheduled_time.strftime('%I:%M %p on %b %d')}")
+        elif rows:
+            print(f"   🕐 {rows[0][1].strftime('%I:%M %p on %b %d')} → {rows[-1][1].strftime('%I:%M %p on %b %d')}")
+    
+    return len(created)
 
-def fetch_next_pending_post(conn):
-    """Fetch the next post that's ready to go"""
+def fetch_next_pending_post(conn, exclude_profiles=None, exclude_accounts=None, exclude_platforms=None):
+    """Fetch the next post that's ready to go, skipping busy profiles and rate-limited accounts/platforms"""
     cur = conn.cursor()
     
-    query = """
-        SELECT ps.id, ps.queue_id, ps.account_id, ps.platform, ps.scheduled_time,
-               sq.video_path, sq.title, sq.description, sq.link,
-               sa.account_name, sa.bitbrowser_profile_id
-        FROM platform_schedules ps
-        JOIN social_queue sq ON ps.queue_id = sq.id
-        JOIN social_accounts sa ON ps.account_id = sa.id
-        WHERE ps.posted = FALSE 
-          AND ps.scheduled_time <= NOW()
-          AND ps.retry_count < 3
-          AND sa.enabled = TRUE
-        ORDER BY ps.scheduled_time ASC
-        LIMIT 1
-    """
-    
-    cur.execute(query)
+    db.execute_prepared(cur, "sched_fetch_next", (
+        list(exclude_profiles or []), list(exclude_accounts or []), clock.now(),
+        list(exclude_platforms or [])
+    ))
     row = cur.fetchone()
     cur.close()
     
@@ -148,27 +457,132 @@ def fetch_next_pending_post(conn):
         }
     return None
 
-def update_post_status(conn, schedule_id, success=True, error_msg=None):
-    """Update schedule status"""
+def claim_due_posts(conn, worker_name, limit=1, exclude_profiles=None, exclude_accounts=None,
+                    lease_seconds=LEASE_SECONDS, exclude_platforms=None):
+    """
+    Lease up to `limit` due posts to `worker_name`, at most one per profile.
+    Each post's profile is taken in profile_leases first, so two schedulers
+    can never post with the same profile at once; rows whose lease has
+    expired are claimable again. Profiles are leased in id order so
+    concurrent claims can't deadlock.
+    """
+    cur = conn.cursor()
+    now = clock.now()
+    expires = now + datetime.timedelta(seconds=lease_seconds)
+    rows = []
+    
+    try:
+        db.execute_prepared(cur, "sched_claim_candidates", (
+            list(exclude_profiles or []), list(exclude_accounts or []), limit,
+            now, list(exclude_platforms or [])
+        ))
+        candidates = sorted(cur.fetchall(), key=lambda c: c[1])
+        
+        for schedule_id, profile_id in candidates:
+            db.execute_prepared(cur, "sched_lease_profile", (profile_id, schedule_id, worker_name, expires, now))
+            if not cur.fetchone():
+                continue
+            db.execute_prepared(cur, "sched_claim_post", (schedule_id, worker_name, expires, now))
+            row = cur.fetchone()
+            if row:
+                rows.append(row)
+            else:
+                db.execute_prepared(cur, "sched_release_profile", (schedule_id,))
+        conn.commit()
+    except Exception as e:
+        print(f"   ❌ Failed to claim posts: {e}")
+        conn.rollback()
+        rows = []
+    finally:
+        cur.close()
+    
+    posts = [
+        {
+            "schedule_id": row[0],
+            "queue_id": row[1],
+            "account_id": row[2],
+            "platform": row[3],
+            "scheduled_time": row[4],
+            "path": row[5],
+            "title": row[6],
+            "desc": row[7] or "",
+            "link": row[8] or "",
+            "account_name": row[9],
+            "profile_id": row[10]
+        }
+        for row in rows
+    ]
+    posts.sort(key=lambda p: p['scheduled_time'])
+    return posts
+
+def reclaim_expired_leases(conn):
+    """Clear leases left behind by workers that died mid-post"""
+    cur = conn.cursor()
+    
+    try:
+        cur.execute("""
+            UPDATE platform_schedules
+            SET claimed_by = NULL, lease_expires_at = NULL
+            WHERE claimed_by IS NOT NULL
+              AND lease_expires_at < %s
+              AND posted = FALSE
+            RETURNING id
+        """, (clock.now(),))
+        reclaimed = cur.fetchall()
+        cur.execute("DELETE FROM profile_leases WHERE lease_expires_at < %s", (clock.now(),))
+        conn.commit()
+    except Exception as e:
+        print(f"   ❌ Failed to reclaim leases: {e}")
+        conn.rollback()
+        reclaimed = []
+    finally:
+        cur.close()
+    
+    if reclaimed:
+        print(f"\n♻️ Reclaimed {len(reclaimed)} expired lease(s)")
+    return len(reclaimed)
+
+def update_post_status(conn, schedule_id, success=True, error_msg=None, account_id=None):
+    """
+    Update schedule status. Failures are classified (utils/error_classifier.py):
+    retryable errors come back after an exponential backoff, a logged-out
+    account is parked with all its pending posts, rejected media fails for good.
+    """
     cur = conn.cursor()
     
     try:
+        # Free the profile first: claims take the profile lease before the row
+        db.execute_prepared(cur, "sched_release_profile", (schedule_id,))
         if success:
-            cur.execute("""
-                UPDATE platform_schedules 
-                SET posted = TRUE, posted_at = NOW()
-                WHERE id = %s
-            """, (schedule_id,))
+            db.execute_prepared(cur, "sched_mark_posted", (schedule_id, clock.now()))
             print(f"   💾 Database updated: Post marked as DONE")
         else:
-            cur.execute("""
-                UPDATE platform_schedules 
-                SET retry_count = retry_count + 1,
-                    error_message = %s
-                WHERE id = %s
-            """, (error_msg, schedule_id))
-            print(f"   ⚠️ Retry count incremented. Error: {error_msg}")
+            error_class = error_classifier.classify(error_msg)
+            action = error_classifier.action_for(error_class)
+            now = clock.now()
+            
+            if action == error_classifier.FAIL:
+                next_attempt = None
+            elif action == error_classifier.PARK:
+                next_attempt = now + datetime.timedelta(seconds=error_classifier.PARK_SECONDS)
+            else:
+                cur.execute("SELECT retry_count FROM platform_schedules WHERE id = %s", (schedule_id,))
+                row = cur.fetchone()
+                delay = error_classifier.backoff_seconds(error_class, row[0] if row else 0)
+                next_attempt = now + datetime.timedelta(seconds=delay)
+            
+            db.execute_prepared(cur, "sched_mark_failed", (error_msg, schedule_id, action, error_class, next_attempt))
+            
+            if action == error_classifier.FAIL:
+                print(f"   🚫 Failed permanently ({error_class}). Error: {error_msg}")
+            elif action == error_classifier.PARK:
+                if account_id is not None:
+                    db.execute_prepared(cur, "sched_park_account", (account_id, next_attempt))
+                print(f"   🅿️ Account parked until {next_attempt.strftime('%I:%M %p')} ({error_class}). Error: {error_msg}")
+            else:
+                print(f"   ⚠️ Retry at {next_attempt.strftime('%I:%M %p')} ({error_class}). Error: {error_msg}")
         
+        db.execute_prepared(cur, "sched_complete_job", (schedule_id, clock.now()))
         conn.commit()
     except Exception as e:
         print(f"   ❌ Failed to update DB: {e}")
@@ -176,144 +590,639 @@ def update_post_status(conn, schedule_id, success=True, error_msg=None):
     finally:
         cur.close()
 
+def record_attempt(conn, post, timer, worker, success=True, error_msg=None):
+    """Store one post attempt with its per-stage timings in post_attempts"""
+    cur = conn.cursor()
+    stage_columns = ", ".join(f"{stage}_ms" for stage in spans.STAGES)
+    stage_values = [timer.stage_ms(stage) for stage in spans.STAGES]
+    stage_placeholders = ", ".join(["%s"] * len(spans.STAGES))
+    
+    try:
+        cur.execute(f"""
+            INSERT INTO post_attempts
+                (schedule_id, account_id, platform, profile_id, worker,
+                 started_at, finished_at, outcome, error_message, total_ms, {stage_columns})
+            VALUES (%s, %s, %s, %s, %s, to_timestamp(%s)::timestamp, to_timestamp(%s)::timestamp,
+                    %s, %s, %s, {stage_placeholders})
+        """, [
+            post['schedule_id'], post['account_id'], post['platform'], post['profile_id'], worker,
+            timer.started_at, timer.finished_at, "success" if success else "failed", error_msg,
+            timer.total_ms(),
+        ] + stage_values)
+        conn.commit()
+    except Exception as e:
+        print(f"   ⚠️ Could not record attempt timings: {e}")
+        conn.rollback()
+    finally:
+        cur.close()
+
 def check_for_new_jobs(conn):
-    """Check for jobs that don't have schedules yet and create them"""
+    """Schedule new jobs and catch up accounts that were added or re-enabled"""
+    reconcile_schedules(conn)
+
+def reconcile_schedules(conn):
+    """
+    Incrementally bring platform_schedules up to date.
+    Each account remembers the highest job id it has been scheduled through
+    (social_accounts.scheduled_through). Only accounts behind the newest job
+    are touched, and only for the jobs they are missing that are still being
+    posted (completed_at IS NULL, see complete_finished_jobs), so the cost
+    follows the number of new and pending jobs/accounts rather than the size
+    of social_queue. New accounts start at 0 and so catch up on every video
+    still going out.
+    """
+    cur = conn.cursor()
+    
+    cur.execute("SELECT COALESCE(MAX(id), 0) FROM social_queue")
+    high_water = cur.fetchone()[0]
+    
+    # Accounts grouped by how far behind they are
+    cur.execute("""
+        SELECT sa.scheduled_through, array_agg(sa.id ORDER BY sa.id)
+        FROM social_accounts sa
+        JOIN platform_windows pw ON sa.platform = pw.platform
+        WHERE sa.enabled = TRUE AND pw.enabled = TRUE
+          AND sa.scheduled_through < %s
+        GROUP BY sa.scheduled_through
+        ORDER BY sa.scheduled_through
+    """, (high_water,))
+    groups = cur.fetchall()
+    
+    for marker, account_ids in groups:
+        cur.execute("""
+            SELECT id FROM social_queue
+            WHERE id > %s AND id <= %s AND completed_at IS NULL
+            ORDER BY id
+        """, (marker, high_water))
+        job_ids = [row[0] for row in cur.fetchall()]
+        
+        if not job_ids:
+            cur.execute("""
+                UPDATE social_accounts SET scheduled_through = %s WHERE id = ANY(%s)
+            """, (high_water, account_ids))
+            conn.commit()
+            continue
+        
+        if len(job_ids) <= 10:
+            print(f"\n🆕 Scheduling job(s) {', '.join(f'#{j}' for j in job_ids)} for {len(account_ids)} account(s)")
+        else:
+            print(f"\n🆕 Scheduling {len(job_ids)} jobs (#{job_ids[0]} … #{job_ids[-1]}) for {len(account_ids)} account(s)")
+        create_schedules_for_jobs(conn, job_ids, account_ids, mark_through=high_water)
+    
+    cur.close()
+
+def sweep_unscheduled_jobs(conn):
+    """
+    Safety net for reconcile_schedules: find jobs with no schedules at all
+    (e.g. a job whose id was committed after a higher one, or whose file
+    could not be probed yet) and schedule them.
+    This scans social_queue, so it only runs at startup and once an hour.
+    """
     cur = conn.cursor()
     
     query = """
         SELECT sq.id 
         FROM social_queue sq
-        WHERE NOT EXISTS (
+        WHERE sq.completed_at IS NULL
+          AND NOT EXISTS (
             SELECT 1 FROM platform_schedules ps WHERE ps.queue_id = sq.id
         )
+          AND NOT EXISTS (
+            SELECT 1 FROM platform_schedules_archive psa WHERE psa.queue_id = sq.id
+        )
+        ORDER BY sq.id
     """
     
     cur.execute(query)
     rows = cur.fetchall()
     cur.close()
     
-    for row in rows:
-        job_id = row[0]
-        print(f"\n🆕 New job detected: #{job_id}")
-        create_schedules_for_job(conn, job_id)
+    if not rows:
+        return
+    
+    job_ids = [row[0] for row in rows]
+    print(f"\n🧹 Sweep found {len(job_ids)} unscheduled job(s)")
+    create_schedules_for_jobs(conn, job_ids)
+
+def complete_finished_jobs(conn):
+    """
+    Stamp completed_at on jobs with nothing left to post that
+    update_post_status missed (see complete_finished_jobs() in setup.sql).
+    """
+    cur = conn.cursor()
+    
+    try:
+        cur.execute("SELECT complete_finished_jobs(%s)", (clock.now(),))
+        stamped = cur.fetchone()[0]
+        conn.commit()
+    except Exception as e:
+        print(f"   ⚠️ Could not mark finished jobs: {e}")
+        conn.rollback()
+        stamped = 0
+    finally:
+        cur.close()
+    
+    if stamped:
+        print(f"\n🏁 Marked {stamped} finished job(s) complete")
+    return stamped
+
+def archive_finished_schedules(conn):
+    """
+    Move posted and failed-out schedules older than ARCHIVE_AFTER_HOURS into
+    the monthly platform_schedules_archive partitions, in ARCHIVE_BATCH-row
+    transactions, so scheduler polls only ever touch live work.
+    """
+    cur = conn.cursor()
+    cutoff = clock.now() - datetime.timedelta(hours=ARCHIVE_AFTER_HOURS)
+    total = 0
+    
+    try:
+        while True:
+            cur.execute("SELECT archive_finished_schedules(%s, %s)", (cutoff, ARCHIVE_BATCH))
+            moved = cur.fetchone()[0]
+            conn.commit()
+            total += moved
+            if moved < ARCHIVE_BATCH:
+                break
+    except Exception as e:
+        print(f"   ⚠️ Archiving stopped: {e}")
+        conn.rollback()
+    finally:
+        cur.close()
+    
+    if total:
+        print(f"\n🗄️ Archived {total} finished schedule(s)")
+    return total
+
+def open_listen_connection():
+    """Open a dedicated autocommit connection that LISTENs for queue/account changes"""
+    try:
+        conn = db.connect()
+    except Exception as e:
+        print(f"❌ Database Connection Failed: {e}")
+        return None
+    
+    try:
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        cur = conn.cursor()
+        cur.execute(f"LISTEN {NOTIFY_CHANNEL}")
+        cur.close()
+        print(f"👂 Listening for changes on '{NOTIFY_CHANNEL}'")
+        return conn
+    except Exception as e:
+        print(f"⚠️ LISTEN failed, falling back to polling: {e}")
+        conn.close()
+        return None
 
-def inject_config_for_platform(platform, job_data, profile_id):
-    """Inject job data and profile ID into bot modules"""
+def wait_for_changes(listen_conn, timeout):
+    """Block until a notification arrives or `timeout` seconds pass. Returns the payloads."""
+    if select.select([listen_conn], [], [], timeout) == ([], [], []):
+        return []
     
-    # Import config here to modify it
-    import config.config as config
+    listen_conn.poll()
+    payloads = [n.payload for n in listen_conn.notifies]
+    listen_conn.notifies.clear()
+    return payloads
+
+def wake_workers():
+    """Cut short the idle sleep of every waiting worker"""
+    with _wakeup:
+        _wakeup.notify_all()
+    for loop, event in _async_wakeups:
+        loop.call_soon_threadsafe(event.set)
+
+def idle_wait(seconds):
+    """Sleep up to `seconds`, returning early if wake_workers() is called"""
+    with _wakeup:
+        _wakeup.wait(seconds)
+
+def build_flow_kwargs(platform, job_data):
+    """Build the keyword arguments a platform flow needs for this job"""
     
     if platform == "YouTube Shorts":
-        config.YT_TITLE = job_data['title']
-        config.YT_DESC = job_data['desc']
-        config.YT_VIDEO_PATH = job_data['path']
-        config.YT_PROFILE_ID = profile_id
+        return {"video_path": job_data['path'], "title": job_data['title']}
     
     elif platform == "LinkedIn Video":
-        config.LI_CAPTION = job_data['title']
-        config.LI_MEDIA_PATH = job_data['path']
-        config.LI_PROFILE_ID = profile_id
+        return {"media_path": job_data['path'], "caption": job_data['title']}
     
     elif platform == "TikTok":
-        config.TT_CAPTION = job_data['title']
-        config.TT_MEDIA_PATH = job_data['path']
-        config.TT_PROFILE_ID = profile_id
+        return {"media_path": job_data['path'], "caption": job_data['title']}
     
     elif platform == "Pinterest Idea":
-        config.PIN_TITLE = job_data['title']
-        config.PIN_DESCRIPTION = job_data['desc']
-        config.PIN_MEDIA_PATH = job_data['path']
-        config.PIN_PROFILE_ID = profile_id
-        config.PIN_BOARD = "Cats"
+        return {
+            "media_path": job_data['path'],
+            "title": job_data['title'],
+            "description": job_data['desc'],
+            "board": "Cats",
+            "link": job_data['link'],
+        }
     
     elif platform == "Twitter":
-        config.TWITTER_CAPTION = job_data['title']
-        config.TWITTER_MEDIA_PATH = job_data['path']
-        config.TWITTER_PROFILE_ID = profile_id
+        return {"media_path": job_data['path'], "caption": job_data['title']}
+    
+    return {}
+
+def worker_name(worker_id):
+    """Name a worker uniquely across hosts, e.g. 'studio-pc:4312:W2'"""
+    return f"{socket.gethostname()}:{os.getpid()}:W{worker_id}"
+
+def load_rate_limits(conn, seed=False):
+    """
+    Give rate_limiter the current platform_windows delays. With `seed`, also
+    start every account's spacing from its last post, so a restart doesn't
+    let all accounts post at once.
+    """
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT platform, min_delay_minutes, max_delay_minutes FROM platform_windows")
+        rate_limiter.set_windows({platform: (low, high) for platform, low, high in cur.fetchall()})
+        
+        if seed:
+            cur.execute("""
+                SELECT sa.id, sa.platform, st.last_posted_at
+                FROM social_accounts sa
+                JOIN account_stats st ON st.account_id = sa.id
+                WHERE sa.enabled = TRUE
+            """)
+            rate_limiter.seed(cur.fetchall(), clock.now())
+        conn.commit()
+    except Exception as e:
+        print(f"⚠️ Could not load rate limits: {e}")
+        conn.rollback()
+    finally:
+        cur.close()
+
+def claim_next_post(conn, worker_id):
+    """Lease the next due post, reserve its profile and spend its rate-limit tokens"""
+    with _dispatch_lock:
+        now = clock.now()
+        limited_accounts, limited_platforms = rate_limiter.blocked(now)
+        # Profiles kept warm by another worker stay with that worker
+        held = {p for p, owner in _warm_profiles.items() if owner != worker_id}
+        posts = claim_due_posts(conn, worker_name(worker_id), 1, _busy_profiles | held, limited_accounts,
+                                exclude_platforms=limited_platforms)
+        post = posts[0] if posts else None
+        if post:
+            _busy_profiles.add(post['profile_id'])
+            rate_limiter.take(post['account_id'], post['platform'], now)
+        return post
+
+def release_post(post):
+    """Free the profile for the next post"""
+    with _dispatch_lock:
+        _busy_profiles.discard(post['profile_id'])
+
+def idle_seconds():
+    """How long an idle worker sleeps: until the next rate-limit token at most"""
+    seconds = min(IDLE_POLL_SECONDS, WARM_IDLE_SECONDS)
+    now = clock.now()
+    ready = rate_limiter.next_ready(now)
+    if ready:
+        seconds = min(seconds, max(1, (ready - now).total_seconds()))
+    return seconds
+
+def print_next_slot(post, tag=""):
+    ready = rate_limiter.account_ready_at(post['account_id'], clock.now())
+    print(f"\n💤 {tag}{post['account_name']} can post again at {ready.strftime('%I:%M %p')}")
+
+def sync_warm_profiles(worker_id, sessions):
+    """Publish which profiles this worker's session manager holds open"""
+    open_now = set(sessions.open_profiles())
+    with _dispatch_lock:
+        for profile_id in [p for p, owner in _warm_profiles.items() if owner == worker_id]:
+            if profile_id not in open_now:
+                del _warm_profiles[profile_id]
+        for profile_id in open_now:
+            _warm_profiles[profile_id] = worker_id
+
+def print_post_header(post, tag=""):
+    print(f"\n🎬 {tag}POSTING NOW")
+    print(f"   Platform: {post['platform']}")
+    print(f"   Account: {post['account_name']}")
+    print(f"   Profile ID: {post['profile_id'][:20]}...")
+    print(f"   Job ID: #{post['queue_id']}")
+    print(f"   Title: {post['title']}")
+    print(f"   Scheduled: {post['scheduled_time'].strftime('%I:%M %p')}")
+    print(f"   Actual: {clock.now().strftime('%I:%M %p')}")
+
+def record_result(post, success, error_msg, timer, worker_id, tag=""):
+    """Write the outcome of a post back to platform_schedules and log the attempt"""
+    conn = db.get_db_connection()
+    if not conn:
+        print(f"   ❌ {tag}Could not record result; the lease will expire and the post retry")
+        return
+    try:
+        record_attempt(conn, post, timer, worker_name(worker_id), success, error_msg)
+        update_post_status(conn, post['schedule_id'], success, error_msg, post['account_id'])
+    finally:
+        db.release_connection(conn)
+
+def claim_post(worker_id, tag=""):
+    """Borrow a connection just long enough to lease the next post"""
+    conn = db.get_db_connection()
+    if not conn:
+        print(f"⏳ {tag}Database unavailable, will retry")
+        return None
+    try:
+        return claim_next_post(conn, worker_id)
+    finally:
+        db.release_connection(conn)
+
+def preflight_failed(post, worker_id, tag, problems):
+    """
+    Record a failed preflight as a failed attempt (no browser time spent) and
+    give back the post's rate-limit tokens. True if it failed.
+    """
+    if not problems:
+        return False
+    rate_limiter.refund(post['account_id'], post['platform'], clock.now())
+    error_msg = "Preflight: " + "; ".join(problems)
+    print(f"   🚫 {tag}{error_msg} (browser not opened)")
+    timer = spans.StageTimer()
+    timer.stop()
+    record_result(post, False, error_msg, timer, worker_id, tag)
+    return True
+
+def run_post(post, sessions, worker_id, tag=""):
+    """Run one post through its bot flow on a (possibly warm) profile session and record the result"""
+    platform = post['platform']
+    print_post_header(post, tag)
+    
+    # Get bot flow
+    if platform not in FLOW_MAP:
+        print(f"   ❌ Unknown platform: {platform}")
+        rate_limiter.refund(post['account_id'], platform, clock.now())
+        return
+    
+    flow = FLOW_MAP[platform]
+    
+    # Catch files the platform would reject before a browser is opened
+    if preflight_failed(post, worker_id, tag, preflight.check(post['path'], platform)):
+        return
+    
+    # Wait a bit before posting (human behavior)
+    wait_time = random.randint(*PRE_POST_WAIT)
+    print(f"   ⏳ {tag}Waiting {wait_time}s before posting...")
+    clock.sleep(wait_time)
+    
+    # Execute bot
+    success = False
+    error_msg = None
+    
+    # Upload from the local staged copy when the prefetcher has one
+    with media_stage.get_stager().use(post['path']) as media_path:
+        timer = spans.start()
+        try:
+            with sessions.page(post['profile_id']) as page:
+                flow(page, **build_flow_kwargs(platform, dict(post, path=media_path)))
+            success = True
+            print(f"   ✅ {tag}{platform} ({post['account_name']}) posted successfully!")
+        except Exception as e:
+            error_msg = str(e)
+            print(f"   ❌ {tag}{platform} ({post['account_name']}) failed: {e}")
+        finally:
+            spans.finish()
+    
+    print(f"   ⏱️ {tag}Attempt took {timer.total_ms() / 1000:.1f}s")
+    record_result(post, success, error_msg, timer, worker_id, tag)
+
+def upcoming_media(conn):
+    """Distinct video files of posts due in the next STAGE_LOOKAHEAD_MINUTES, soonest first"""
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT sq.video_path
+        FROM platform_schedules ps
+        JOIN social_queue sq ON sq.id = ps.queue_id
+        WHERE ps.posted = FALSE
+          AND ps.retry_count < 3
+          AND COALESCE(ps.next_attempt_at, ps.scheduled_time) <= %s
+        GROUP BY sq.video_path
+        ORDER BY MIN(COALESCE(ps.next_attempt_at, ps.scheduled_time))
+    """, (clock.now() + datetime.timedelta(minutes=STAGE_LOOKAHEAD_MINUTES),))
+    paths = [row[0] for row in cur.fetchall()]
+    cur.close()
+    return paths
+
+def prefetch_loop():
+    """Keep the local media cache ahead of the schedule (one copy per file, however many accounts)"""
+    stager = media_stage.get_stager()
+    
+    while True:
+        conn = db.get_db_connection()
+        paths = []
+        if conn:
+            try:
+                paths = upcoming_media(conn)
+            except Exception as e:
+                print(f"⚠️ Prefetch lookup failed: {e}")
+            finally:
+                db.release_connection(conn)
+        
+        for path in paths:
+            try:
+                stager.stage(path)
+            except Exception as e:
+                print(f"⚠️ Prefetch of {path} failed: {e}")
+        
+        clock.sleep(PREFETCH_SECONDS)
+
+def worker_loop(worker_id):
+    """Keep claiming and posting due posts until the process exits"""
+    tag = f"[W{worker_id}] "
+    sessions = profile_sessions.ProfileSessionManager(WARM_PROFILES_PER_WORKER, WARM_IDLE_SECONDS)
+    
+    while True:
+        # One bad iteration must not kill the worker thread; a post it had
+        # leased is picked up again once the lease expires
+        try:
+            sessions.evict_idle()
+            sync_warm_profiles(worker_id, sessions)
+            
+            post = claim_post(worker_id, tag)
+            
+            if not post:
+                wait = idle_seconds()
+                print(f"\n⏰ {tag}No posts ready. Next check in {wait:.0f}s... ({clock.now().strftime('%I:%M %p')})")
+                idle_wait(wait)
+                continue
+            
+            try:
+                run_post(post, sessions, worker_id, tag)
+            finally:
+                sync_warm_profiles(worker_id, sessions)
+                release_post(post)
+                print_next_slot(post, tag)
+        except Exception as e:
+            print(f"\n❌ {tag}Worker error: {e}. Carrying on in {ERROR_BACKOFF_SECONDS}s")
+            clock.sleep(ERROR_BACKOFF_SECONDS)
+
+async def run_post_async(post, engine, worker_id, tag=""):
+    """asyncio version of run_post: the flow runs on the shared engine"""
+    platform = post['platform']
+    print_post_header(post, tag)
+    
+    if platform not in ASYNC_FLOW_MAP:
+        print(f"   ❌ Unknown platform: {platform}")
+        rate_limiter.refund(post['account_id'], platform, clock.now())
+        return
+    
+    problems = await asyncio.to_thread(preflight.check, post['path'], platform)
+    if problems:
+        await asyncio.to_thread(preflight_failed, post, worker_id, tag, problems)
+        return
+    
+    wait_time = random.randint(*PRE_POST_WAIT)
+    print(f"   ⏳ {tag}Waiting {wait_time}s before posting...")
+    await asyncio.sleep(wait_time)
+    
+    success = False
+    error_msg = None
+    
+    stager = media_stage.get_stager()
+    media_path, staged_key = await asyncio.to_thread(stager.acquire, post['path'])
+    
+    timer = spans.start()
+    try:
+        await engine.run(post['profile_id'], ASYNC_FLOW_MAP[platform],
+                         **build_flow_kwargs(platform, dict(post, path=media_path)))
+        success = True
+        print(f"   ✅ {tag}{platform} ({post['account_name']}) posted successfully!")
+    except Exception as e:
+        error_msg = str(e)
+        print(f"   ❌ {tag}{platform} ({post['account_name']}) failed: {e}")
+    finally:
+        spans.finish()
+        stager.release(staged_key)
+    
+    print(f"   ⏱️ {tag}Attempt took {timer.total_ms() / 1000:.1f}s")
+    await asyncio.to_thread(record_result, post, success, error_msg, timer, worker_id, tag)
+
+async def async_worker(worker_id, engine, wakeup):
+    """One asyncio worker: same claim and rate-limit rules as worker_loop"""
+    tag = f"[A{worker_id}] "
+    
+    while True:
+        try:
+            await engine.evict_idle()
+            post = await asyncio.to_thread(claim_post, worker_id, tag)
+            
+            if not post:
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), idle_seconds())
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            try:
+                await run_post_async(post, engine, worker_id, tag)
+            finally:
+                release_post(post)
+                print_next_slot(post, tag)
+        except Exception as e:
+            print(f"\n❌ {tag}Worker error: {e}. Carrying on in {ERROR_BACKOFF_SECONDS}s")
+            await asyncio.sleep(ERROR_BACKOFF_SECONDS)
+
+async def run_async_workers(workers):
+    """Run `workers` async workers on one event loop and one Playwright driver"""
+    wakeup = asyncio.Event()
+    _async_wakeups.append((asyncio.get_running_loop(), wakeup))
+    
+    engine = async_engine.AsyncPostingEngine(workers, ASYNC_MAX_OPEN, WARM_IDLE_SECONDS)
+    async with engine:
+        await asyncio.gather(*(async_worker(i, engine, wakeup) for i in range(1, workers + 1)))
+
+def parse_workers(argv):
+    """Read --workers N from the command line"""
+    if "--workers" in argv:
+        idx = argv.index("--workers")
+        try:
+            return max(1, int(argv[idx + 1]))
+        except (IndexError, ValueError):
+            print("❌ --workers needs a number, using 1")
+    return DEFAULT_WORKERS
 
-def main():
+def main(workers=DEFAULT_WORKERS, use_async=False):
     print("=" * 60)
     print("🤖 MULTI-ACCOUNT SOCIAL MEDIA SCHEDULER")
     print("=" * 60)
     print("Features:")
     print("  ✅ Multiple accounts per platform")
-    print("  ✅ Random posting times per account")
+    print("  ✅ Random posting times per account, levelled to worker capacity")
     print("  ✅ Smart retry logic")
     print("  ✅ Auto-schedule new videos")
+    print(f"  ✅ {workers} {'async ' if use_async else ''}worker(s), one profile per worker")
     print("=" * 60)
     
+    global capacity_workers
+    capacity_workers = workers
+    
+    conn = db.get_db_connection()
+    if conn:
+        try:
+            load_rate_limits(conn, seed=True)
+        finally:
+            db.release_connection(conn)
+    
+    if use_async:
+        # All workers share one event loop and one Playwright driver
+        t = threading.Thread(target=asyncio.run, args=(run_async_workers(workers),), daemon=True)
+        t.start()
+    else:
+        for worker_id in range(1, workers + 1):
+            t = threading.Thread(target=worker_loop, args=(worker_id,), daemon=True)
+            t.start()
+    
+    # Copy upcoming uploads off slow shares before their posts come up
+    threading.Thread(target=prefetch_loop, daemon=True).start()
+    
+    # Main thread keeps schedules in sync with new jobs and wakes
+    # workers as soon as the database reports a change
+    listen_conn = None
+    changed = False
+    last_sweep = 0
+    
     while True:
-        conn = get_db_connection()
-        if not conn:
-            print("⏳ Retrying database connection in 60s...")
-            time.sleep(60)
-            continue
-        
-        # Check for new jobs first
-        check_for_new_jobs(conn)
+        if listen_conn is None or listen_conn.closed:
+            listen_conn = open_listen_connection()
         
-        # Fetch next ready post
-        post = fetch_next_pending_post(conn)
+        conn = db.get_db_connection()
+        if conn:
+            try:
+                reclaim_expired_leases(conn)
+                load_rate_limits(conn)
+                check_for_new_jobs(conn)
+                if clock.timestamp() - last_sweep >= SWEEP_SECONDS:
+                    sweep_unscheduled_jobs(conn)
+                    complete_finished_jobs(conn)
+                    archive_finished_schedules(conn)
+                    last_sweep = clock.timestamp()
+            except Exception as e:
+                # release_connection rolls back; the next pass tries again
+                print(f"❌ Schedule maintenance failed: {e}")
+            finally:
+                db.release_connection(conn)
         
-        if not post:
-            conn.close()
-            print(f"\n⏰ No posts ready. Next check in 5 minutes... ({datetime.datetime.now().strftime('%I:%M %p')})")
-            time.sleep(300)
-            continue
-        
-        platform = post['platform']
-        print(f"\n🎬 POSTING NOW")
-        print(f"   Platform: {platform}")
-        print(f"   Account: {post['account_name']}")
-        print(f"   Profile ID: {post['profile_id'][:20]}...")
-        print(f"   Job ID: #{post['queue_id']}")
-        print(f"   Title: {post['title']}")
-        print(f"   Scheduled: {post['scheduled_time'].strftime('%I:%M %p')}")
-        print(f"   Actual: {datetime.datetime.now().strftime('%I:%M %p')}")
+        # Schedules have caught up with the change, let idle workers look
+        if changed:
+            wake_workers()
+            changed = False
         
-        # Get bot function
-        if platform not in BOT_MAP:
-            print(f"   ❌ Unknown platform: {platform}")
-            conn.close()
+        if not listen_conn:
+            clock.sleep(JOB_CHECK_SECONDS)
             continue
         
-        bot_func = BOT_MAP[platform]
-        
-        # Inject config with the specific profile ID
-        inject_config_for_platform(platform, post, post['profile_id'])
-        
-        # Try force reset
         try:
-            force_reset.force_reset(post['profile_id'])
-        except:
-            pass
-        
-        # Wait a bit before posting (human behavior)
-        wait_time = random.randint(10, 30)
-        print(f"   ⏳ Waiting {wait_time}s before posting...")
-        time.sleep(wait_time)
-        
-        # Execute bot
-        success = False
-        error_msg = None
-        
-        try:
-            bot_func()
-            success = True
-            print(f"   ✅ {platform} ({post['account_name']}) posted successfully!")
+            changes = wait_for_changes(listen_conn, JOB_CHECK_SECONDS)
         except Exception as e:
-            error_msg = str(e)
-            print(f"   ❌ {platform} ({post['account_name']}) failed: {e}")
-        
-        # Update database
-        update_post_status(conn, post['schedule_id'], success, error_msg)
-        
-        conn.close()
+            print(f"⚠️ Lost LISTEN connection: {e}")
+            listen_conn.close()
+            listen_conn = None
+            continue
         
-        # Random delay before next post (2-8 minutes)
-        delay = random.randint(120, 480)
-        print(f"\n💤 Next check in {delay//60} minutes...")
-        time.sleep(delay)
+        if changes:
+            print(f"\n🔔 Change detected: {', '.join(sorted(set(changes)))}")
+            changed = True
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(parse_workers(sys.argv), "--async" in sys.argv)
\ No newline at end of file
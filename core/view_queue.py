@@ -1,98 +1,140 @@
-import psycopg2
-import config.db_config as db_config
+import core.db as db
+import utils.spans as spans
 from datetime import datetime
 
-def get_db_connection():
-    try:
-        conn = psycopg2.connect(
-            host=db_config.DB_HOST,
-            database=db_config.DB_NAME,
-            user=db_config.DB_USER,
-            password=db_config.DB_PASS,
-            port=db_config.DB_PORT
-        )
-        return conn
-    except Exception as e:
-        print(f"❌ Database Connection Failed: {e}")
-        return None
+# Rows per round trip when streaming through a server-side cursor
+STREAM_BATCH = 1000
+
+# --status filters (schedule rows shown, and videos that have at least one)
+STATUS_FILTERS = {
+    "pending": "ps.posted = FALSE AND ps.retry_count < 3",
+    "done": "ps.posted = TRUE",
+    "failed": "ps.posted = FALSE AND ps.retry_count >= 3",
+}
 
-def view_queue_status():
-    """Show all videos and their posting status by account"""
-    conn = get_db_connection()
+def view_queue_status(limit=None, since=None, job_id=None, status=None):
+    """
+    Show videos and their posting status by account, live and archived.
+    One query, streamed through a named server-side cursor, so only the
+    rows that get printed are read: newest `limit` videos, added on or
+    after `since`, only job `job_id`, and only `status` rows.
+    """
+    conn = db.get_db_connection()
     if not conn:
         return
     
-    cur = conn.cursor()
-    
-    # Get all videos
-    cur.execute("""
-        SELECT id, title, video_path, created_at
-        FROM social_queue
-        ORDER BY created_at DESC
-    """)
-    
-    videos = cur.fetchall()
+    status_sql = STATUS_FILTERS[status] if status else "TRUE"
+    cur = conn.cursor(name="view_queue_status")
+    cur.itersize = STREAM_BATCH
+    
+    cur.execute(f"""
+        WITH videos AS (
+            SELECT sq.id, sq.title, sq.video_path, sq.created_at
+            FROM social_queue sq
+            WHERE (%(job_id)s::int IS NULL OR sq.id = %(job_id)s::int)
+              AND (%(since)s::timestamp IS NULL OR sq.created_at >= %(since)s::timestamp)
+              AND (%(status)s::text IS NULL OR EXISTS (
+                  SELECT 1 FROM platform_schedules_all ps
+                  WHERE ps.queue_id = sq.id AND {status_sql}
+              ))
+            ORDER BY sq.created_at DESC, sq.id DESC
+            LIMIT %(limit)s
+        ),
+        enabled_accounts AS (
+            SELECT id, platform, account_name FROM social_accounts WHERE enabled = TRUE
+        ),
+        progress AS (
+            SELECT ps.queue_id, COUNT(*) AS posted
+            FROM platform_schedules_all ps
+            JOIN enabled_accounts ea ON ea.id = ps.account_id
+            WHERE ps.posted = TRUE AND ps.queue_id IN (SELECT id FROM videos)
+            GROUP BY ps.queue_id
+        )
+        SELECT 
+            v.id, v.title, v.video_path, v.created_at,
+            COALESCE(p.posted, 0),
+            (SELECT COUNT(*) FROM enabled_accounts),
+            ea.platform, ea.account_name,
+            ps.posted, ps.scheduled_time, ps.retry_count,
+            ps.next_attempt_at, ps.error_class
+        FROM videos v
+        CROSS JOIN enabled_accounts ea
+        LEFT JOIN progress p ON p.queue_id = v.id
+        LEFT JOIN platform_schedules_all ps ON ps.account_id = ea.id AND ps.queue_id = v.id
+        WHERE {status_sql}
+        ORDER BY v.created_at DESC, v.id DESC, ea.platform, ea.account_name
+    """, {"job_id": job_id, "since": since, "status": status, "limit": limit})
     
     print("\n" + "=" * 100)
     print("📊 SOCIAL MEDIA QUEUE STATUS (MULTI-ACCOUNT)")
     print("=" * 100)
     
-    if not videos:
-        print("📭 Queue is empty. Add videos using add_video.py")
-        print("=" * 100)
-        cur.close()
-        conn.close()
-        return
+    current_video = None
+    current_platform = None
     
-    for video_id, title, path, created in videos:
-        # Get posting status for this video across all accounts
-        cur.execute("""
-            SELECT 
-                sa.platform,
-                sa.account_name,
-                ps.posted,
-                ps.scheduled_time
-            FROM social_accounts sa
-            LEFT JOIN platform_schedules ps ON sa.id = ps.account_id AND ps.queue_id = %s
-            WHERE sa.enabled = TRUE
-            ORDER BY sa.platform, sa.account_name
-        """, (video_id,))
+    for row in cur:
+        (video_id, title, path, created, completed, total_accounts,
+         platform, account_name, posted, scheduled_time, retries,
+         next_attempt, error_class) = row
         
-        accounts_status = cur.fetchall()
+        if video_id != current_video:
+            print(f"\n🎬 Job #{video_id}: {title}")
+            print(f"   📁 {path}")
+            print(f"   📅 Added: {created.strftime('%b %d, %I:%M %p')}")
+            print(f"   📊 Progress: {completed}/{total_accounts} accounts posted")
+            print(f"   Status by Account:")
+            current_video = video_id
+            current_platform = None
         
-        # Count completed
-        total_accounts = len(accounts_status)
-        completed = sum(1 for _, _, posted, _ in accounts_status if posted)
+        if platform != current_platform:
+            print(f"\n      {platform}:")
+            current_platform = platform
         
-        print(f"\n🎬 Job #{video_id}: {title}")
-        print(f"   📁 {path}")
-        print(f"   📅 Added: {created.strftime('%b %d, %I:%M %p')}")
-        print(f"   📊 Progress: {completed}/{total_accounts} accounts posted")
-        print(f"   Status by Account:")
+        if posted:
+            status_text = "✅ Posted"
+        elif scheduled_time and retries >= 3:
+            status_text = f"❌ Failed after {retries} tries"
+        elif next_attempt:
+            status_text = f"🔁 Retrying at {next_attempt.strftime('%I:%M %p on %b %d')} ({error_class})"
+        elif scheduled_time:
+            status_text = f"⏳ Scheduled for {scheduled_time.strftime('%I:%M %p on %b %d')}"
+        else:
+            status_text = "❓ Not scheduled"
         
-        current_platform = None
-        for platform, account_name, posted, scheduled_time in accounts_status:
-            if platform != current_platform:
-                print(f"\n      {platform}:")
-                current_platform = platform
-            
-            if posted:
-                status = "✅ Posted"
-            elif scheduled_time:
-                status = f"⏳ Scheduled for {scheduled_time.strftime('%I:%M %p on %b %d')}"
-            else:
-                status = "❓ Not scheduled"
-            
-            print(f"         • {account_name}: {status}")
+        print(f"         • {account_name}: {status_text}")
+    
+    if current_video is None:
+        if limit or since or job_id or status:
+            print("📭 No videos match these filters.")
+        else:
+            print("📭 Queue is empty. Add videos using add_video.py")
     
     print("\n" + "=" * 100)
     
     cur.close()
-    conn.close()
+    db.release_connection(conn)
+
+def parse_status_filters(argv):
+    """Read --limit N, --since YYYY-MM-DD, --job ID and --status pending|done|failed"""
+    filters = {}
+    
+    if "--limit" in argv:
+        filters["limit"] = int(argv[argv.index("--limit") + 1])
+    if "--since" in argv:
+        filters["since"] = datetime.strptime(argv[argv.index("--since") + 1], "%Y-%m-%d")
+    if "--job" in argv:
+        filters["job_id"] = int(argv[argv.index("--job") + 1])
+    if "--status" in argv:
+        status = argv[argv.index("--status") + 1]
+        if status not in STATUS_FILTERS:
+            raise ValueError(f"--status must be one of: {', '.join(STATUS_FILTERS)}")
+        filters["status"] = status
+    
+    return filters
 
 def view_upcoming_posts():
     """Show scheduled posts with account info"""
-    conn = get_db_connection()
+    conn = db.get_db_connection()
     if not conn:
         return
     
@@ -104,14 +146,15 @@ def view_upcoming_posts():
             sq.title, 
             sa.platform, 
             sa.account_name,
-            ps.scheduled_time, 
+            COALESCE(ps.next_attempt_at, ps.scheduled_time), 
             ps.posted, 
-            ps.retry_count
+            ps.retry_count,
+            ps.error_class
         FROM platform_schedules ps
         JOIN social_queue sq ON ps.queue_id = sq.id
         JOIN social_accounts sa ON ps.account_id = sa.id
-        WHERE ps.posted = FALSE AND sa.enabled = TRUE
-        ORDER BY ps.scheduled_time ASC
+        WHERE ps.posted = FALSE AND ps.retry_count < 3 AND sa.enabled = TRUE
+        ORDER BY COALESCE(ps.next_attempt_at, ps.scheduled_time) ASC
         LIMIT 20
     """)
     
@@ -125,13 +168,13 @@ def view_upcoming_posts():
         print("📭 No upcoming posts scheduled.")
         print("=" * 100)
         cur.close()
-        conn.close()
+        db.release_connection(conn)
         return
     
     now = datetime.now()
     
     for row in rows:
-        job_id, title, platform, account_name, scheduled, posted, retries = row
+        job_id, title, platform, account_name, scheduled, posted, retries, error_class = row
         
         # Calculate time until post
         time_diff = scheduled - now
@@ -149,6 +192,8 @@ def view_upcoming_posts():
             status = f"📆 In {days} days"
         
         retry_info = f" (Retry #{retries})" if retries > 0 else ""
+        if error_class:
+            retry_info += f" [last error: {error_class}]"
         
         print(f"\n{status}")
         print(f"   🎬 Job #{job_id}: {title[:50]}...")
@@ -159,52 +204,36 @@ def view_upcoming_posts():
     print("\n" + "=" * 100)
     
     cur.close()
-    conn.close()
+    db.release_connection(conn)
 
 def view_stats():
-    """Show overall statistics"""
-    conn = get_db_connection()
+    """Show overall statistics (totals come from the stat_counters table)"""
+    conn = db.get_db_connection()
     if not conn:
         return
     
     cur = conn.cursor()
     
-    # Total videos
-    cur.execute("SELECT COUNT(*) FROM social_queue")
-    total_videos = cur.fetchone()[0]
-    
-    # Total accounts
-    cur.execute("SELECT COUNT(*) FROM social_accounts WHERE enabled = TRUE")
-    total_accounts = cur.fetchone()[0]
-    
-    # Total possible posts (videos × accounts)
-    total_possible = total_videos * total_accounts
-    
-    # Completed posts
-    cur.execute("SELECT COUNT(*) FROM platform_schedules WHERE posted = TRUE")
-    completed = cur.fetchone()[0]
-    
-    # Pending posts
-    cur.execute("SELECT COUNT(*) FROM platform_schedules WHERE posted = FALSE")
-    pending = cur.fetchone()[0]
-    
-    # Posts in next hour
+    # Counters plus the posts due soon (same due rule as the claim query, on its index)
     cur.execute("""
-        SELECT COUNT(*) FROM platform_schedules 
+        SELECT name, value FROM stat_counters
+        UNION ALL
+        SELECT 'due_next_hour', COUNT(*) FROM platform_schedules
         WHERE posted = FALSE 
-          AND scheduled_time <= NOW() + INTERVAL '1 hour'
+          AND retry_count < 3
+          AND COALESCE(next_attempt_at, scheduled_time) <= NOW() + INTERVAL '1 hour'
     """)
-    next_hour = cur.fetchone()[0]
+    counters = dict(cur.fetchall())
     
-    # Accounts breakdown
-    cur.execute("""
-        SELECT platform, COUNT(*) 
-        FROM social_accounts 
-        WHERE enabled = TRUE 
-        GROUP BY platform 
-        ORDER BY platform
-    """)
-    accounts_by_platform = cur.fetchall()
+    total_videos = counters.get('videos', 0)
+    accounts_by_platform = sorted(
+        (name.split(':', 1)[1], count) for name, count in counters.items()
+        if name.startswith('accounts:') and count
+    )
+    total_accounts = sum(count for _, count in accounts_by_platform)
+    
+    # Total possible posts (videos × accounts)
+    total_possible = total_videos * total_accounts
     
     print("\n" + "=" * 60)
     print("📈 STATISTICS")
@@ -212,20 +241,21 @@ def view_stats():
     print(f"Total Videos:        {total_videos}")
     print(f"Total Accounts:      {total_accounts}")
     print(f"Possible Posts:      {total_possible}")
-    print(f"Completed Posts:     {completed}")
-    print(f"Pending Posts:       {pending}")
-    print(f"Due in Next Hour:    {next_hour}")
+    print(f"Completed Posts:     {counters.get('posts_completed', 0)}")
+    print(f"Pending Posts:       {counters.get('posts_pending', 0)}")
+    print(f"Failed Posts:        {counters.get('posts_failed', 0)}")
+    print(f"Due in Next Hour:    {counters.get('due_next_hour', 0)}")
     print("\n📊 Accounts by Platform:")
     for platform, count in accounts_by_platform:
         print(f"   • {platform}: {count} account(s)")
     print("=" * 60)
     
     cur.close()
-    conn.close()
+    db.release_connection(conn)
 
 def view_accounts():
     """Show all accounts and their status"""
-    conn = get_db_connection()
+    conn = db.get_db_connection()
     if not conn:
         return
     
@@ -233,15 +263,18 @@ def view_accounts():
     
     cur.execute("""
         SELECT 
-            id,
-            platform,
-            account_name,
-            bitbrowser_profile_id,
-            enabled,
-            (SELECT COUNT(*) FROM platform_schedules ps WHERE ps.account_id = sa.id AND ps.posted = TRUE) as posts_made,
-            (SELECT COUNT(*) FROM platform_schedules ps WHERE ps.account_id = sa.id AND ps.posted = FALSE) as posts_pending
+            sa.id,
+            sa.platform,
+            sa.account_name,
+            sa.bitbrowser_profile_id,
+            sa.enabled,
+            COALESCE(st.posted, 0) as posts_made,
+            COALESCE(st.pending, 0) as posts_pending,
+            COALESCE(st.failed, 0) as posts_failed,
+            st.last_posted_at
         FROM social_accounts sa
-        ORDER BY platform, account_name
+        LEFT JOIN account_stats st ON sa.id = st.account_id
+        ORDER BY sa.platform, sa.account_name
     """)
     
     rows = cur.fetchall()
@@ -254,12 +287,12 @@ def view_accounts():
         print("📭 No accounts found. Add some using account_manager.py!")
         print("=" * 100)
         cur.close()
-        conn.close()
+        db.release_connection(conn)
         return
     
     current_platform = None
     for row in rows:
-        account_id, platform, name, profile_id, enabled, posts_made, posts_pending = row
+        account_id, platform, name, profile_id, enabled, posts_made, posts_pending, posts_failed, last_posted_at = row
         
         if platform != current_platform:
             print(f"\n🎯 {platform}:")
@@ -271,29 +304,103 @@ def view_accounts():
         print(f"   [{account_id}] {name}")
         print(f"       Profile: {profile_short}")
         print(f"       Status: {status}")
-        print(f"       Posts: {posts_made} completed, {posts_pending} pending")
+        print(f"       Posts: {posts_made} completed, {posts_pending} pending, {posts_failed} failed")
+        if last_posted_at:
+            print(f"       Last post: {last_posted_at.strftime('%b %d, %I:%M %p')}")
     
     print("\n" + "=" * 100)
     
     cur.close()
-    conn.close()
+    db.release_connection(conn)
+
+PERF_WINDOW_DAYS = 7
+
+def format_ms(value):
+    if value is None:
+        return "-"
+    return f"{value / 1000:.1f}s"
+
+def view_perf():
+    """Show p50/p95/p99 timings per platform and per stage from post_attempts"""
+    conn = db.get_db_connection()
+    if not conn:
+        return
+    
+    cur = conn.cursor()
+    
+    columns = ["total"] + spans.STAGES
+    percentiles = ",\n            ".join(
+        f"percentile_cont(ARRAY[0.5, 0.95, 0.99]) WITHIN GROUP (ORDER BY {column}_ms)"
+        for column in columns
+    )
+    
+    cur.execute(f"""
+        SELECT 
+            platform,
+            COUNT(*),
+            COUNT(*) FILTER (WHERE outcome = 'success'),
+            {percentiles}
+        FROM post_attempts
+        WHERE started_at >= NOW() - make_interval(days => %s)
+        GROUP BY platform
+        ORDER BY platform
+    """, (PERF_WINDOW_DAYS,))
+    
+    rows = cur.fetchall()
+    
+    print("\n" + "=" * 60)
+    print(f"⏱️  POSTING PERFORMANCE (last {PERF_WINDOW_DAYS} days)")
+    print("=" * 60)
+    
+    if not rows:
+        print("📭 No attempts recorded yet. Timings appear once the scheduler posts.")
+        print("=" * 60)
+        cur.close()
+        db.release_connection(conn)
+        return
+    
+    for row in rows:
+        platform, attempts, succeeded = row[:3]
+        
+        print(f"\n🎯 {platform}: {attempts} attempt(s), {succeeded * 100 // attempts}% successful")
+        print(f"   {'Stage':<14}{'p50':>9}{'p95':>9}{'p99':>9}")
+        for column, values in zip(columns, row[3:]):
+            p50, p95, p99 = values if values else (None, None, None)
+            print(f"   {column:<14}{format_ms(p50):>9}{format_ms(p95):>9}{format_ms(p99):>9}")
+    
+    print("\n" + "=" * 60)
+    
+    cur.close()
+    db.release_connection(conn)
 
 if __name__ == "__main__":
     import sys
     
     if len(sys.argv) > 1:
-        if sys.argv[1] == "--upcoming":
+        if sys.argv[1] in ("--limit", "--since", "--job", "--status"):
+            try:
+                view_queue_status(**parse_status_filters(sys.argv))
+            except (ValueError, IndexError) as e:
+                print(f"❌ Invalid filter: {e}")
+        elif sys.argv[1] == "--upcoming":
             view_upcoming_posts()
         elif sys.argv[1] == "--stats":
             view_stats()
         elif sys.argv[1] == "--accounts":
             view_accounts()
+        elif sys.argv[1] == "--perf":
+            view_perf()
         elif sys.argv[1] == "--help":
             print("Usage:")
             print("  python view_queue.py              # Show all videos and status")
+            print("  python view_queue.py --limit 10   # Only the newest 10 videos")
+            print("  python view_queue.py --since 2024-01-26 --status pending")
+            print("                                    # Filter by date added and status (pending|done|failed)")
+            print("  python view_queue.py --job 5      # Only job #5")
             print("  python view_queue.py --upcoming   # Show upcoming scheduled posts")
             print("  python view_queue.py --stats      # Show statistics")
             print("  python view_queue.py --accounts   # Show all accounts")
+            print("  python view_queue.py --perf       # Show posting timings per platform and stage")
             print("  python view_queue.py --help       # Show this help")
     else:
         view_queue_status()
@@ -20,9 +20,19 @@ CREATE TABLE IF NOT EXISTS social_queue (
     description TEXT,
     link TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    completed_at TIMESTAMP
+    completed_at TIMESTAMP,
+    content_hash CHAR(64),
+    media_info JSONB,
+    skip_platforms TEXT[] DEFAULT '{}'
 );
 
+-- SHA-256 of the video file (set by add_video.py); the same clip is queued once
+ALTER TABLE social_queue ADD COLUMN IF NOT EXISTS content_hash CHAR(64);
+
+-- Preflight: what the file is (duration, size, codec...) and platforms it can't go to
+ALTER TABLE social_queue ADD COLUMN IF NOT EXISTS media_info JSONB;
+ALTER TABLE social_queue ADD COLUMN IF NOT EXISTS skip_platforms TEXT[] DEFAULT '{}';
+
 -- Social media accounts table
 CREATE TABLE IF NOT EXISTS social_accounts (
     id SERIAL PRIMARY KEY,
@@ -31,9 +41,14 @@ CREATE TABLE IF NOT EXISTS social_accounts (
     bitbrowser_profile_id VARCHAR(100) NOT NULL,
     enabled BOOLEAN DEFAULT TRUE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    scheduled_through INTEGER DEFAULT 0,
     UNIQUE(platform, account_name)
 );
 
+-- Highest social_queue.id each account has schedules for (see reconcile_schedules).
+-- New accounts start at 0 and catch up on the videos still being posted.
+ALTER TABLE social_accounts ADD COLUMN IF NOT EXISTS scheduled_through INTEGER DEFAULT 0;
+
 -- Platform schedules table (tracks posting per account)
 CREATE TABLE IF NOT EXISTS platform_schedules (
     id SERIAL PRIMARY KEY,
@@ -45,9 +60,37 @@ CREATE TABLE IF NOT EXISTS platform_schedules (
     posted_at TIMESTAMP,
     error_message TEXT,
     retry_count INTEGER DEFAULT 0,
+    claimed_by VARCHAR(100),
+    lease_expires_at TIMESTAMP,
+    next_attempt_at TIMESTAMP,
+    error_class VARCHAR(30),
     UNIQUE(queue_id, account_id)
 );
 
+-- Lease columns for existing installs (a worker "claims" a row while posting)
+ALTER TABLE platform_schedules ADD COLUMN IF NOT EXISTS claimed_by VARCHAR(100);
+ALTER TABLE platform_schedules ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP;
+
+-- One row per BitBrowser profile a worker is posting with. Claims insert here
+-- before leasing a platform_schedules row, so two schedulers (or two rows in
+-- one claim) never get the same profile: the primary key makes a concurrent
+-- claim wait for the first one instead of missing its uncommitted lease.
+CREATE TABLE IF NOT EXISTS profile_leases (
+    bitbrowser_profile_id VARCHAR(100) PRIMARY KEY,
+    schedule_id INTEGER NOT NULL REFERENCES platform_schedules(id) ON DELETE CASCADE,
+    claimed_by VARCHAR(100) NOT NULL,
+    lease_expires_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_profile_leases_schedule 
+ON profile_leases(schedule_id);
+
+-- Retry columns for existing installs. After a failure the row is not due again
+-- until next_attempt_at (backoff, or the account is parked); error_class is the
+-- utils/error_classifier.py class of the last error.
+ALTER TABLE platform_schedules ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMP;
+ALTER TABLE platform_schedules ADD COLUMN IF NOT EXISTS error_class VARCHAR(30);
+
 -- Platform posting windows configuration
 CREATE TABLE IF NOT EXISTS platform_windows (
     id SERIAL PRIMARY KEY,
@@ -59,6 +102,65 @@ CREATE TABLE IF NOT EXISTS platform_windows (
     enabled BOOLEAN DEFAULT TRUE
 );
 
+-- One row per posting attempt with per-stage timings in ms (see utils/spans.py).
+-- Stages that did not happen (e.g. browser_open on a warm profile) stay NULL.
+CREATE TABLE IF NOT EXISTS post_attempts (
+    id SERIAL PRIMARY KEY,
+    schedule_id INTEGER,
+    account_id INTEGER,
+    platform VARCHAR(50) NOT NULL,
+    profile_id VARCHAR(100),
+    worker VARCHAR(100),
+    started_at TIMESTAMP NOT NULL,
+    finished_at TIMESTAMP,
+    outcome VARCHAR(20) NOT NULL,
+    error_message TEXT,
+    total_ms INTEGER,
+    browser_open_ms INTEGER,
+    cdp_connect_ms INTEGER,
+    navigate_ms INTEGER,
+    upload_ms INTEGER,
+    caption_ms INTEGER,
+    publish_ms INTEGER,
+    verify_ms INTEGER,
+    close_ms INTEGER
+);
+
+-- Per-account rollup of platform_schedules, kept current by triggers (section 5).
+-- failed = not posted and out of retries (retry_count >= 3).
+CREATE TABLE IF NOT EXISTS account_stats (
+    account_id INTEGER PRIMARY KEY REFERENCES social_accounts(id) ON DELETE CASCADE,
+    posted INTEGER NOT NULL DEFAULT 0,
+    pending INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    last_posted_at TIMESTAMP
+);
+
+-- Finished platform_schedules rows (posted, or out of retries) are moved here by
+-- archive_finished_schedules() so the hot table only holds work still to do.
+-- Partitioned by month of scheduled_time; partitions are created as needed.
+CREATE TABLE IF NOT EXISTS platform_schedules_archive (
+    id INTEGER NOT NULL,
+    queue_id INTEGER REFERENCES social_queue(id) ON DELETE CASCADE,
+    account_id INTEGER REFERENCES social_accounts(id) ON DELETE CASCADE,
+    platform VARCHAR(50) NOT NULL,
+    scheduled_time TIMESTAMP NOT NULL,
+    posted BOOLEAN DEFAULT FALSE,
+    posted_at TIMESTAMP,
+    error_message TEXT,
+    retry_count INTEGER DEFAULT 0,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, scheduled_time)
+) PARTITION BY RANGE (scheduled_time);
+
+-- Global totals for view_stats / get_posting_stats(), kept current by triggers
+-- (section 5). Names: videos, posts_completed, posts_pending, posts_failed and
+-- accounts:<platform> for enabled accounts.
+CREATE TABLE IF NOT EXISTS stat_counters (
+    name VARCHAR(100) PRIMARY KEY,
+    value BIGINT NOT NULL DEFAULT 0
+);
+
 -- 2. CREATE INDEXES FOR PERFORMANCE
 -- ====================================================================
 
@@ -68,9 +170,34 @@ ON platform_schedules(posted, scheduled_time);
 CREATE INDEX IF NOT EXISTS idx_platform_schedules_account 
 ON platform_schedules(account_id);
 
+-- Only unposted rows with retries left are ever due; keep that index small
+-- A row is due at next_attempt_at if it has one (retry backoff), else scheduled_time
+DROP INDEX IF EXISTS idx_platform_schedules_due;
+CREATE INDEX IF NOT EXISTS idx_platform_schedules_next_attempt 
+ON platform_schedules((COALESCE(next_attempt_at, scheduled_time))) WHERE posted = FALSE AND retry_count < 3;
+
+CREATE INDEX IF NOT EXISTS idx_platform_schedules_archive_job 
+ON platform_schedules_archive(queue_id, account_id);
+
+CREATE INDEX IF NOT EXISTS idx_platform_schedules_lease 
+ON platform_schedules(lease_expires_at) WHERE claimed_by IS NOT NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_social_queue_content_hash 
+ON social_queue(content_hash);
+
+-- Videos still being posted (completed_at is set once nothing is left to post)
+CREATE INDEX IF NOT EXISTS idx_social_queue_pending 
+ON social_queue(id) WHERE completed_at IS NULL;
+
 CREATE INDEX IF NOT EXISTS idx_social_accounts_platform 
 ON social_accounts(platform, enabled);
 
+CREATE INDEX IF NOT EXISTS idx_post_attempts_platform 
+ON post_attempts(platform, started_at);
+
+CREATE INDEX IF NOT EXISTS idx_post_attempts_schedule 
+ON post_attempts(schedule_id);
+
 -- 3. INSERT PLATFORM SETTINGS (9 AM - 5 PM DEFAULT)
 -- ====================================================================
 
@@ -91,19 +218,31 @@ DO UPDATE SET
 -- 4. CREATE HELPFUL VIEWS
 -- ====================================================================
 
--- View to see all accounts with stats
-CREATE OR REPLACE VIEW accounts_overview AS
+-- Every schedule row, live or archived, for reporting
+CREATE OR REPLACE VIEW platform_schedules_all AS
+SELECT id, queue_id, account_id, platform, scheduled_time, posted, posted_at,
+       error_message, retry_count, FALSE AS archived, next_attempt_at, error_class
+FROM platform_schedules
+UNION ALL
+SELECT id, queue_id, account_id, platform, scheduled_time, posted, posted_at,
+       error_message, retry_count, TRUE AS archived, NULL::TIMESTAMP, NULL::VARCHAR(30)
+FROM platform_schedules_archive;
+
+-- View to see all accounts with stats (reads the account_stats rollup)
+DROP VIEW IF EXISTS accounts_overview;
+CREATE VIEW accounts_overview AS
 SELECT 
     sa.id,
     sa.platform,
     sa.account_name,
     sa.bitbrowser_profile_id,
     sa.enabled,
-    COUNT(ps.id) FILTER (WHERE ps.posted = TRUE) as posts_made,
-    COUNT(ps.id) FILTER (WHERE ps.posted = FALSE) as posts_pending
+    COALESCE(st.posted, 0) as posts_made,
+    COALESCE(st.pending, 0) as posts_pending,
+    COALESCE(st.failed, 0) as posts_failed,
+    st.last_posted_at
 FROM social_accounts sa
-LEFT JOIN platform_schedules ps ON sa.id = ps.account_id
-GROUP BY sa.id, sa.platform, sa.account_name, sa.bitbrowser_profile_id, sa.enabled
+LEFT JOIN account_stats st ON sa.id = st.account_id
 ORDER BY sa.platform, sa.account_name;
 
 -- View to see pending posts ready to post now
@@ -121,9 +260,10 @@ FROM platform_schedules ps
 JOIN social_queue sq ON ps.queue_id = sq.id
 JOIN social_accounts sa ON ps.account_id = sa.id
 WHERE ps.posted = FALSE 
-    AND ps.scheduled_time <= NOW()
+    AND ps.retry_count < 3
+    AND COALESCE(ps.next_attempt_at, ps.scheduled_time) <= NOW()
     AND sa.enabled = TRUE
-ORDER BY ps.scheduled_time ASC;
+ORDER BY COALESCE(ps.next_attempt_at, ps.scheduled_time) ASC;
 
 -- View to see queue status by account
 CREATE OR REPLACE VIEW queue_status_by_account AS
@@ -151,19 +291,351 @@ RETURNS TABLE (
 ) AS $$
 BEGIN
     RETURN QUERY
-    SELECT 'Total Videos'::TEXT, COUNT(*)::BIGINT FROM social_queue
+    SELECT 'Total Videos'::TEXT, COALESCE(SUM(value), 0)::BIGINT FROM stat_counters WHERE name = 'videos'
+    UNION ALL
+    SELECT 'Total Accounts'::TEXT, COALESCE(SUM(value), 0)::BIGINT FROM stat_counters WHERE name LIKE 'accounts:%'
     UNION ALL
-    SELECT 'Total Accounts'::TEXT, COUNT(*)::BIGINT FROM social_accounts WHERE enabled = TRUE
+    SELECT 'Posts Completed'::TEXT, COALESCE(SUM(value), 0)::BIGINT FROM stat_counters WHERE name = 'posts_completed'
     UNION ALL
-    SELECT 'Posts Completed'::TEXT, COUNT(*)::BIGINT FROM platform_schedules WHERE posted = TRUE
+    SELECT 'Posts Pending'::TEXT, COALESCE(SUM(value), 0)::BIGINT FROM stat_counters WHERE name = 'posts_pending'
     UNION ALL
-    SELECT 'Posts Pending'::TEXT, COUNT(*)::BIGINT FROM platform_schedules WHERE posted = FALSE
+    SELECT 'Posts Failed'::TEXT, COALESCE(SUM(value), 0)::BIGINT FROM stat_counters WHERE name = 'posts_failed'
     UNION ALL
     SELECT 'Posts Due Now'::TEXT, COUNT(*)::BIGINT FROM platform_schedules 
-        WHERE posted = FALSE AND scheduled_time <= NOW();
+        WHERE posted = FALSE AND retry_count < 3
+          AND COALESCE(next_attempt_at, scheduled_time) <= NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+-- Wake the scheduler (LISTEN sm_bot_changes) when videos or accounts change
+CREATE OR REPLACE FUNCTION notify_scheduler()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('sm_bot_changes', TG_TABLE_NAME || ':' || TG_OP);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_social_queue_notify ON social_queue;
+CREATE TRIGGER trg_social_queue_notify
+AFTER INSERT ON social_queue
+FOR EACH STATEMENT EXECUTE FUNCTION notify_scheduler();
+
+DROP TRIGGER IF EXISTS trg_social_accounts_notify ON social_accounts;
+CREATE TRIGGER trg_social_accounts_notify
+AFTER INSERT OR DELETE OR UPDATE OF platform, bitbrowser_profile_id, enabled ON social_accounts
+FOR EACH STATEMENT EXECUTE FUNCTION notify_scheduler();
+
+DROP TRIGGER IF EXISTS trg_platform_windows_notify ON platform_windows;
+CREATE TRIGGER trg_platform_windows_notify
+AFTER INSERT OR UPDATE OR DELETE ON platform_windows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_scheduler();
+
+-- Keep account_stats in step with platform_schedules. Statement-level triggers
+-- with transition tables, so a bulk insert of schedules costs one upsert per
+-- account rather than one per row.
+CREATE OR REPLACE FUNCTION apply_account_stats()
+RETURNS TRIGGER AS $$
+DECLARE
+    changes TEXT;
+BEGIN
+    -- Rows moving into the archive are still counted
+    IF current_setting('sm_bot.archiving', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        changes := 'SELECT *, 1 AS sign FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        changes := 'SELECT *, -1 AS sign FROM old_rows';
+    ELSE
+        changes := 'SELECT *, 1 AS sign FROM new_rows UNION ALL SELECT *, -1 AS sign FROM old_rows';
+    END IF;
+
+    -- The join skips accounts being deleted (their stats row cascades away)
+    EXECUTE format($sql$
+        INSERT INTO account_stats AS st (account_id, posted, pending, failed, last_posted_at)
+        SELECT
+            c.account_id,
+            SUM(CASE WHEN c.posted THEN c.sign ELSE 0 END),
+            SUM(CASE WHEN NOT c.posted AND c.retry_count < 3 THEN c.sign ELSE 0 END),
+            SUM(CASE WHEN NOT c.posted AND c.retry_count >= 3 THEN c.sign ELSE 0 END),
+            MAX(c.posted_at) FILTER (WHERE c.posted AND c.sign = 1)
+        FROM (%s) c
+        JOIN social_accounts sa ON sa.id = c.account_id
+        GROUP BY c.account_id
+        HAVING SUM(CASE WHEN c.posted THEN c.sign ELSE 0 END) <> 0
+            OR SUM(CASE WHEN NOT c.posted AND c.retry_count < 3 THEN c.sign ELSE 0 END) <> 0
+            OR SUM(CASE WHEN NOT c.posted AND c.retry_count >= 3 THEN c.sign ELSE 0 END) <> 0
+        ORDER BY c.account_id
+        ON CONFLICT (account_id) DO UPDATE SET
+            posted = st.posted + EXCLUDED.posted,
+            pending = st.pending + EXCLUDED.pending,
+            failed = st.failed + EXCLUDED.failed,
+            last_posted_at = GREATEST(st.last_posted_at, EXCLUDED.last_posted_at)
+    $sql$, changes);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_account_stats_insert ON platform_schedules;
+CREATE TRIGGER trg_account_stats_insert
+AFTER INSERT ON platform_schedules
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_account_stats();
+
+DROP TRIGGER IF EXISTS trg_account_stats_update ON platform_schedules;
+CREATE TRIGGER trg_account_stats_update
+AFTER UPDATE ON platform_schedules
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_account_stats();
+
+DROP TRIGGER IF EXISTS trg_account_stats_delete ON platform_schedules;
+CREATE TRIGGER trg_account_stats_delete
+AFTER DELETE ON platform_schedules
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_account_stats();
+
+DROP TRIGGER IF EXISTS trg_account_stats_archive_delete ON platform_schedules_archive;
+CREATE TRIGGER trg_account_stats_archive_delete
+AFTER DELETE ON platform_schedules_archive
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_account_stats();
+
+-- Recount account_stats from scratch (run by this script; also fixes any drift)
+CREATE OR REPLACE FUNCTION rebuild_account_stats()
+RETURNS VOID AS $$
+BEGIN
+    LOCK TABLE platform_schedules, platform_schedules_archive IN SHARE MODE;
+    DELETE FROM account_stats;
+    INSERT INTO account_stats (account_id, posted, pending, failed, last_posted_at)
+    SELECT
+        sa.id,
+        COUNT(ps.id) FILTER (WHERE ps.posted),
+        COUNT(ps.id) FILTER (WHERE NOT ps.posted AND ps.retry_count < 3),
+        COUNT(ps.id) FILTER (WHERE NOT ps.posted AND ps.retry_count >= 3),
+        MAX(ps.posted_at) FILTER (WHERE ps.posted)
+    FROM social_accounts sa
+    LEFT JOIN platform_schedules_all ps ON sa.id = ps.account_id
+    GROUP BY sa.id;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT rebuild_account_stats();
+
+-- Keep stat_counters in step with social_queue, social_accounts and
+-- platform_schedules. Statements that change nothing counted (lease claims,
+-- caption edits) leave the counter rows untouched.
+CREATE OR REPLACE FUNCTION apply_stat_counters()
+RETURNS TRIGGER AS $$
+DECLARE
+    changes TEXT;
+    deltas TEXT;
+BEGIN
+    -- Rows moving into the archive are still counted
+    IF current_setting('sm_bot.archiving', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        changes := 'SELECT *, 1 AS sign FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        changes := 'SELECT *, -1 AS sign FROM old_rows';
+    ELSE
+        changes := 'SELECT *, 1 AS sign FROM new_rows UNION ALL SELECT *, -1 AS sign FROM old_rows';
+    END IF;
+
+    IF TG_TABLE_NAME = 'social_queue' THEN
+        deltas := 'SELECT ''videos'' AS name, c.sign AS delta FROM (%s) c';
+    ELSIF TG_TABLE_NAME = 'social_accounts' THEN
+        deltas := 'SELECT ''accounts:'' || c.platform AS name, c.sign AS delta FROM (%s) c WHERE c.enabled';
+    ELSE
+        deltas := 'SELECT CASE WHEN c.posted THEN ''posts_completed''
+                               WHEN c.retry_count < 3 THEN ''posts_pending''
+                               ELSE ''posts_failed'' END AS name,
+                          c.sign AS delta
+                   FROM (%s) c';
+    END IF;
+
+    EXECUTE format($sql$
+        INSERT INTO stat_counters AS sc (name, value)
+        SELECT d.name, SUM(d.delta)
+        FROM (%s) d
+        GROUP BY d.name
+        HAVING SUM(d.delta) <> 0
+        ORDER BY d.name
+        ON CONFLICT (name) DO UPDATE SET value = sc.value + EXCLUDED.value
+    $sql$, format(deltas, changes));
+
+    RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
 
+DROP TRIGGER IF EXISTS trg_social_queue_counters_insert ON social_queue;
+CREATE TRIGGER trg_social_queue_counters_insert
+AFTER INSERT ON social_queue
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_stat_counters();
+
+DROP TRIGGER IF EXISTS trg_social_queue_counters_delete ON social_queue;
+CREATE TRIGGER trg_social_queue_counters_delete
+AFTER DELETE ON social_queue
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_stat_counters();
+
+DROP TRIGGER IF EXISTS trg_social_accounts_counters_insert ON social_accounts;
+CREATE TRIGGER trg_social_accounts_counters_insert
+AFTER INSERT ON social_accounts
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_stat_counters();
+
+DROP TRIGGER IF EXISTS trg_social_accounts_counters_update ON social_accounts;
+CREATE TRIGGER trg_social_accounts_counters_update
+AFTER UPDATE ON social_accounts
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_stat_counters();
+
+DROP TRIGGER IF EXISTS trg_social_accounts_counters_delete ON social_accounts;
+CREATE TRIGGER trg_social_accounts_counters_delete
+AFTER DELETE ON social_accounts
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_stat_counters();
+
+DROP TRIGGER IF EXISTS trg_platform_schedules_counters_insert ON platform_schedules;
+CREATE TRIGGER trg_platform_schedules_counters_insert
+AFTER INSERT ON platform_schedules
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_stat_counters();
+
+DROP TRIGGER IF EXISTS trg_platform_schedules_counters_update ON platform_schedules;
+CREATE TRIGGER trg_platform_schedules_counters_update
+AFTER UPDATE ON platform_schedules
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_stat_counters();
+
+DROP TRIGGER IF EXISTS trg_platform_schedules_counters_delete ON platform_schedules;
+CREATE TRIGGER trg_platform_schedules_counters_delete
+AFTER DELETE ON platform_schedules
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_stat_counters();
+
+DROP TRIGGER IF EXISTS trg_platform_schedules_archive_counters_delete ON platform_schedules_archive;
+CREATE TRIGGER trg_platform_schedules_archive_counters_delete
+AFTER DELETE ON platform_schedules_archive
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION apply_stat_counters();
+
+-- Recount stat_counters from scratch (run by this script; also fixes any drift)
+CREATE OR REPLACE FUNCTION rebuild_stat_counters()
+RETURNS VOID AS $$
+BEGIN
+    LOCK TABLE social_queue, social_accounts, platform_schedules, platform_schedules_archive IN SHARE MODE;
+    DELETE FROM stat_counters;
+    INSERT INTO stat_counters (name, value)
+    SELECT 'videos', COUNT(*) FROM social_queue
+    UNION ALL
+    SELECT 'accounts:' || platform, COUNT(*) FROM social_accounts WHERE enabled GROUP BY platform
+    UNION ALL
+    SELECT 'posts_completed', COUNT(*) FROM platform_schedules_all WHERE posted
+    UNION ALL
+    SELECT 'posts_pending', COUNT(*) FROM platform_schedules_all WHERE NOT posted AND retry_count < 3
+    UNION ALL
+    SELECT 'posts_failed', COUNT(*) FROM platform_schedules_all WHERE NOT posted AND retry_count >= 3;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT rebuild_stat_counters();
+
+-- Monthly archive partition, e.g. platform_schedules_archive_2024_01
+CREATE OR REPLACE FUNCTION create_archive_partition(part_month DATE)
+RETURNS VOID AS $$
+DECLARE
+    first_day DATE := date_trunc('month', part_month)::DATE;
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF platform_schedules_archive FOR VALUES FROM (%L) TO (%L)',
+        'platform_schedules_archive_' || to_char(first_day, 'YYYY_MM'),
+        first_day,
+        (first_day + INTERVAL '1 month')::DATE
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Move up to batch_size rows that finished before cutoff into the archive.
+-- Returns how many moved; call again until it returns less than batch_size.
+CREATE OR REPLACE FUNCTION archive_finished_schedules(cutoff TIMESTAMP, batch_size INTEGER)
+RETURNS INTEGER AS $$
+DECLARE
+    ids INTEGER[];
+    part_month DATE;
+    moved INTEGER;
+BEGIN
+    SELECT array_agg(id) INTO ids
+    FROM (
+        SELECT id FROM platform_schedules
+        WHERE (posted = TRUE OR retry_count >= 3)
+          AND claimed_by IS NULL
+          AND COALESCE(posted_at, scheduled_time) < cutoff
+        ORDER BY id
+        LIMIT batch_size
+        FOR UPDATE SKIP LOCKED
+    ) batch;
+
+    IF ids IS NULL THEN
+        RETURN 0;
+    END IF;
+
+    FOR part_month IN
+        SELECT DISTINCT date_trunc('month', scheduled_time)::DATE
+        FROM platform_schedules WHERE id = ANY(ids)
+    LOOP
+        PERFORM create_archive_partition(part_month);
+    END LOOP;
+
+    PERFORM set_config('sm_bot.archiving', 'on', true);
+
+    WITH moved_rows AS (
+        DELETE FROM platform_schedules WHERE id = ANY(ids)
+        RETURNING id, queue_id, account_id, platform, scheduled_time,
+                  posted, posted_at, error_message, retry_count
+    )
+    INSERT INTO platform_schedules_archive
+        (id, queue_id, account_id, platform, scheduled_time, posted, posted_at, error_message, retry_count)
+    SELECT * FROM moved_rows;
+    GET DIAGNOSTICS moved = ROW_COUNT;
+
+    PERFORM set_config('sm_bot.archiving', 'off', true);
+    RETURN moved;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Stamp completed_at on videos with nothing left to post: they have schedules
+-- (live or archived) and every live one is posted or out of retries.
+-- reconcile_schedules only catches new accounts up on videos without it.
+-- Returns how many videos were stamped.
+CREATE OR REPLACE FUNCTION complete_finished_jobs(done_at TIMESTAMP)
+RETURNS INTEGER AS $$
+DECLARE
+    stamped INTEGER;
+BEGIN
+    UPDATE social_queue sq
+    SET completed_at = done_at
+    WHERE sq.completed_at IS NULL
+      AND (EXISTS (SELECT 1 FROM platform_schedules ps WHERE ps.queue_id = sq.id)
+           OR EXISTS (SELECT 1 FROM platform_schedules_archive psa WHERE psa.queue_id = sq.id))
+      AND NOT EXISTS (
+          SELECT 1 FROM platform_schedules ps
+          WHERE ps.queue_id = sq.id AND ps.posted = FALSE AND ps.retry_count < 3
+      );
+    GET DIAGNOSTICS stamped = ROW_COUNT;
+    RETURN stamped;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Existing installs never set completed_at; stamp the videos that are done
+SELECT complete_finished_jobs(CURRENT_TIMESTAMP::TIMESTAMP);
+
 -- 6. ADD YOUR ACCOUNTS
 -- ====================================================================
 -- ⚠️ IMPORTANT: EDIT THIS SECTION WITH YOUR ACTUAL PROFILE IDs!
@@ -229,10 +701,14 @@ SELECT
         WHEN tablename = 'social_accounts' THEN 'Stores your accounts'
         WHEN tablename = 'platform_schedules' THEN 'Tracks posting schedules'
         WHEN tablename = 'platform_windows' THEN 'Posting time windows'
+        WHEN tablename = 'post_attempts' THEN 'Timings of every posting attempt'
+        WHEN tablename = 'account_stats' THEN 'Post counts per account'
+        WHEN tablename = 'stat_counters' THEN 'Overall totals for --stats'
+        WHEN tablename = 'platform_schedules_archive' THEN 'Finished schedules, by month'
     END as description
 FROM pg_tables
 WHERE schemaname = 'public' 
-    AND tablename IN ('social_queue', 'social_accounts', 'platform_schedules', 'platform_windows')
+    AND tablename IN ('social_queue', 'social_accounts', 'platform_schedules', 'platform_windows', 'post_attempts', 'account_stats', 'stat_counters', 'platform_schedules_archive')
 ORDER BY tablename;
 
 -- Show accounts added
@@ -274,5 +750,6 @@ SELECT * FROM get_posting_stats();
 -- - View accounts: python view_queue.py --accounts
 -- - View upcoming: python view_queue.py --upcoming
 -- - View stats: python view_queue.py --stats
+-- - View timings: python view_queue.py --perf
 -- - Manage accounts: python account_manager.py
 -- ====================================================================
\ No newline at end of file
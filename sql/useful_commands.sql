@@ -8,4 +8,11 @@ SELECT platform, COUNT(*) FROM social_accounts GROUP BY platform;
 DELETE FROM platform_schedules WHERE posted = FALSE;
 
 -- See errors
-SELECT platform, error_message FROM platform_schedules WHERE retry_count > 0;
\ No newline at end of file
+SELECT platform, error_message FROM platform_schedules WHERE retry_count > 0;
+
+-- See posts currently leased by a scheduler worker
+SELECT id, platform, claimed_by, lease_expires_at FROM platform_schedules WHERE claimed_by IS NOT NULL;
+
+-- Release all leases (only when no scheduler is running)
+UPDATE platform_schedules SET claimed_by = NULL, lease_expires_at = NULL WHERE claimed_by IS NOT NULL;
+DELETE FROM profile_leases;
@@ -0,0 +1,40 @@
+import os
+import sys
+import pytest
+
+# Tests import the app the same way the scripts do (core.db, utils.preflight, ...)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+@pytest.fixture
+def scratch_db(monkeypatch):
+    """
+    Database tests run against the throwaway database in SM_BOT_TEST_DSN
+    (e.g. "dbname=sm_bot_test"), loaded with setup/setup.sql and emptied.
+    db.connect() opens connections to it; they are closed after the test.
+    Skipped when the variable is unset.
+    """
+    dsn = os.environ.get("SM_BOT_TEST_DSN")
+    if not dsn:
+        pytest.skip("set SM_BOT_TEST_DSN to a scratch Postgres database")
+    psycopg2 = pytest.importorskip("psycopg2")
+    import core.db as db
+
+    conn = psycopg2.connect(dsn)
+    conn.autocommit = True
+    cur = conn.cursor()
+    with open(os.path.join(ROOT, "setup", "setup.sql")) as f:
+        cur.execute(f.read())
+    cur.execute("TRUNCATE profile_leases, platform_schedules, social_queue, social_accounts RESTART IDENTITY CASCADE")
+    cur.close()
+    conn.close()
+
+    opened = []
+    def connect():
+        opened.append(psycopg2.connect(dsn, connection_factory=db.PooledConnection))
+        return opened[-1]
+
+    monkeypatch.setattr(db, "connect", connect)
+    yield db
+    for conn in opened:
+        conn.close()
\ No newline at end of file
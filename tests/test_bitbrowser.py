@@ -0,0 +1,37 @@
+import pytest
+
+pytest.importorskip("requests")
+config = pytest.importorskip("config.config")
+
+import utils.bitbrowser as bitbrowser
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    def open(self, profile_id):
+        self.calls.append(("open", profile_id))
+        return "ws://client"
+
+    def close(self, profile_id):
+        self.calls.append(("close", profile_id))
+        return True
+
+def test_profiles_go_through_the_shared_client(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(bitbrowser, "get_client", lambda api_url=None: client)
+    monkeypatch.setattr(config, "open_browser", lambda profile_id: "ws://hook", raising=False)
+    monkeypatch.delattr(config, "CUSTOM_BROWSER_HOOKS", raising=False)
+
+    assert bitbrowser.open_profile("p1") == "ws://client"
+    assert bitbrowser.close_profile("p1") is True
+    assert client.calls == [("open", "p1"), ("close", "p1")]
+
+def test_config_hooks_only_when_asked(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(bitbrowser, "get_client", lambda api_url=None: client)
+    monkeypatch.setattr(config, "open_browser", lambda profile_id: "ws://hook", raising=False)
+    monkeypatch.setattr(config, "CUSTOM_BROWSER_HOOKS", True, raising=False)
+
+    assert bitbrowser.open_profile("p1") == "ws://hook"
+    assert client.calls == []
\ No newline at end of file
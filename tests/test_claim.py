@@ -0,0 +1,66 @@
+import threading
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("playwright")
+pytest.importorskip("config.config")
+pytest.importorskip("config.db_config")
+
+import core.db_scheduler as scheduler
+
+def add_due_posts(db):
+    """Two accounts on one BitBrowser profile, each with two posts due"""
+    conn = db.connect()
+    cur = conn.cursor()
+    cur.execute("""
+        INSERT INTO social_accounts (platform, account_name, bitbrowser_profile_id)
+        VALUES ('TikTok', 'a', 'shared'), ('Twitter', 'b', 'shared'), ('TikTok', 'c', 'own')
+    """)
+    cur.execute("INSERT INTO social_queue (video_path, title) VALUES ('x.mp4', 'x'), ('y.mp4', 'y')")
+    cur.execute("""
+        INSERT INTO platform_schedules (queue_id, account_id, platform, scheduled_time)
+        SELECT q, a, sa.platform, NOW() - INTERVAL '1 hour'
+        FROM generate_series(1, 2) q, generate_series(1, 3) a
+        JOIN social_accounts sa ON sa.id = a
+    """)
+    conn.commit()
+    conn.close()
+
+def test_concurrent_claims_never_share_a_profile(scratch_db):
+    add_due_posts(scratch_db)
+    first, second = scratch_db.connect(), scratch_db.connect()
+
+    # hostA's claim transaction stays open until `committed` is set
+    committing, committed = threading.Event(), threading.Event()
+    commit = first.commit
+    first.commit = lambda: (committing.set(), committed.wait(10), commit())
+
+    claims = {}
+    def claim(name, conn):
+        claims[name] = scheduler.claim_due_posts(conn, name, limit=1, exclude_profiles=["own"])
+
+    a = threading.Thread(target=claim, args=("hostA", first))
+    a.start()
+    committing.wait(10)
+    b = threading.Thread(target=claim, args=("hostB", second))
+    b.start()
+    b.join(1)
+    committed.set()
+    a.join(10)
+    b.join(10)
+
+    assert [p['profile_id'] for p in claims["hostA"]] == ["shared"]
+    assert claims["hostB"] == []
+
+def test_batch_claims_one_post_per_profile(scratch_db):
+    add_due_posts(scratch_db)
+    conn = scratch_db.connect()
+
+    posts = scheduler.claim_due_posts(conn, "hostA", limit=4)
+    assert sorted(p['profile_id'] for p in posts) == ["own", "shared"]
+
+    # The profiles stay leased until each post's status is recorded
+    assert scheduler.claim_due_posts(conn, "hostB", limit=4) == []
+    shared = next(p for p in posts if p['profile_id'] == "shared")
+    scheduler.update_post_status(conn, shared['schedule_id'], True)
+    assert [p['profile_id'] for p in scheduler.claim_due_posts(conn, "hostB", limit=4)] == ["shared"]
\ No newline at end of file
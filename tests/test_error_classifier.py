@@ -0,0 +1,46 @@
+import pytest
+import utils.error_classifier as ec
+
+@pytest.mark.parametrize("message, error_class", [
+    # Playwright locator/selector failures, including selectors that mention logging in
+    ('Locator.click: Timeout 30000ms exceeded.\nCall log:\n  - waiting for get_by_role("button", name="Log in")',
+     ec.SELECTOR_MISSING),
+    ('Page.wait_for_selector: Timeout 60000ms exceeded.\nCall log:\n  - waiting for locator("text=Sign in") to be visible',
+     ec.SELECTOR_MISSING),
+    ('Locator.click: Error: strict mode violation: locator("button") resolved to 3 elements',
+     ec.SELECTOR_MISSING),
+    # Network, browser and BitBrowser hiccups
+    ('Page.goto: net::ERR_CONNECTION_RESET at https://x.com/home\nCall log:\n  - navigating to "https://x.com/home", waiting until "load"',
+     ec.TRANSIENT),
+    ('Page.goto: Timeout 60000ms exceeded.\nCall log:\n  - navigating to "https://www.tiktok.com/upload", waiting until "load"',
+     ec.TRANSIENT),
+    ("Target page, context or browser has been closed", ec.TRANSIENT),
+    ("BitBrowser Failed: browser is starting", ec.TRANSIENT),
+    ("/browser/open failed: HTTPConnectionPool(host='127.0.0.1', port=54345): Read timed out.", ec.TRANSIENT),
+    ("Response status 503 from upload endpoint", ec.TRANSIENT),
+    ("Preflight: can't read /mnt/share/video.mp4 (No such file or directory)", ec.TRANSIENT),
+    # Lost sessions
+    ("Session expired, please log in again", ec.LOGGED_OUT),
+    ("Page redirected to https://accounts.google.com/ServiceLogin?continue=studio", ec.LOGGED_OUT),
+    ("Landed on https://www.linkedin.com/checkpoint/challenge", ec.LOGGED_OUT),
+    # Files the platform won't take
+    ("Preflight: landscape 1920x1080 (needs vertical); 200s long (max 180s)", ec.MEDIA_REJECTED),
+    ("Unsupported video format", ec.MEDIA_REJECTED),
+    # Numbers that only look like HTTP 5xx codes
+    ("Upload of clip_5023.mp4 did not finish", ec.UNKNOWN),
+    ("Post id 1502 not found in feed", ec.UNKNOWN),
+    ("", ec.UNKNOWN),
+])
+def test_classify(message, error_class):
+    assert ec.classify(message) == error_class
+
+def test_actions():
+    assert ec.action_for(ec.LOGGED_OUT) == ec.PARK
+    assert ec.action_for(ec.MEDIA_REJECTED) == ec.FAIL
+    assert ec.action_for(ec.SELECTOR_MISSING) == ec.RETRY
+    assert ec.action_for(ec.UNKNOWN) == ec.RETRY
+
+def test_backoff_grows_and_is_capped():
+    first = ec.backoff_seconds(ec.TRANSIENT, 0)
+    assert ec.BACKOFF_BASE[ec.TRANSIENT] * 0.5 <= first <= ec.BACKOFF_BASE[ec.TRANSIENT] * 1.5
+    assert ec.backoff_seconds(ec.TRANSIENT, 20) <= ec.MAX_BACKOFF * 1.5
\ No newline at end of file
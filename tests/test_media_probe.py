@@ -0,0 +1,69 @@
+import struct
+import pytest
+import utils.media_probe as media_probe
+
+def box(box_type, payload=b""):
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+def full_box(box_type, version, payload):
+    return box(box_type, bytes([version, 0, 0, 0]) + payload)
+
+def video_trak(width, height):
+    matrix = struct.pack(">9i", 0x10000, 0, 0, 0, 0x10000, 0, 0, 0, 0x40000000)
+    tkhd = full_box(b"tkhd", 0, bytes(20) + bytes(16) + matrix + struct.pack(">II", width << 16, height << 16))
+    hdlr = full_box(b"hdlr", 0, bytes(4) + b"vide" + bytes(12))
+    stsd = full_box(b"stsd", 0, struct.pack(">I", 1) + struct.pack(">I4s", 16, b"avc1") + bytes(8))
+    stbl = box(b"stbl", stsd)
+    minf = box(b"minf", stbl)
+    mdia = box(b"mdia", hdlr + minf)
+    return box(b"trak", tkhd + mdia)
+
+def mp4(width=1080, height=1920, seconds=42):
+    ftyp = box(b"ftyp", b"isom" + bytes(4))
+    mvhd = full_box(b"mvhd", 0, struct.pack(">IIII", 0, 0, 1000, seconds * 1000) + bytes(80))
+    moov = box(b"moov", mvhd + video_trak(width, height))
+    return ftyp + moov + box(b"mdat", bytes(64))
+
+def write(tmp_path, data):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(data)
+    return str(path)
+
+def test_probe_reads_duration_resolution_and_codec(tmp_path):
+    info = media_probe.probe(write(tmp_path, mp4()))
+    assert info["container"] == "mp4"
+    assert info["duration"] == 42
+    assert (info["width"], info["height"]) == (1080, 1920)
+    assert info["video_codec"] == "avc1"
+
+def test_probe_ignores_other_containers(tmp_path):
+    assert media_probe.probe(write(tmp_path, b"RIFF" + bytes(60))) is None
+
+@pytest.mark.parametrize("cut", [30, 60, 120, 200])
+def test_truncated_file_raises_probe_error(tmp_path, cut):
+    # Copies that stopped part way through the moov box
+    data = mp4()
+    with pytest.raises(media_probe.ProbeError):
+        media_probe.probe(write(tmp_path, data[:len(data) - cut]))
+
+def test_truncated_largesize_box_raises_probe_error(tmp_path):
+    # size == 1 announces a 64-bit size that the file ends before
+    ftyp = box(b"ftyp", b"isom" + bytes(4))
+    with pytest.raises(media_probe.ProbeError):
+        media_probe.probe(write(tmp_path, ftyp + struct.pack(">I4s", 1, b"mdat") + b"\x00\x00"))
+
+def fragmented_mp4(mehd_seconds=None):
+    # Fragmented files leave the mvhd duration at 0; mvex/mehd may hold the real one
+    ftyp = box(b"ftyp", b"iso6" + bytes(4))
+    mvhd = full_box(b"mvhd", 0, struct.pack(">IIII", 0, 0, 1000, 0) + bytes(80))
+    mvex = b""
+    if mehd_seconds is not None:
+        mvex = box(b"mvex", full_box(b"mehd", 0, struct.pack(">I", mehd_seconds * 1000)))
+    moov = box(b"moov", mvhd + mvex + video_trak(1080, 1920))
+    return ftyp + moov + box(b"moof", bytes(16)) + box(b"mdat", bytes(64))
+
+def test_fragmented_file_without_duration_reports_none(tmp_path):
+    assert media_probe.probe(write(tmp_path, fragmented_mp4()))["duration"] is None
+
+def test_fragmented_file_uses_mehd_duration(tmp_path):
+    assert media_probe.probe(write(tmp_path, fragmented_mp4(mehd_seconds=12)))["duration"] == 12
\ No newline at end of file
@@ -0,0 +1,44 @@
+import os
+import pytest
+
+pytest.importorskip("config.config")
+
+import utils.media_stage as media_stage
+
+@pytest.fixture
+def stager(tmp_path):
+    stager = media_stage.MediaStager(str(tmp_path / "cache"), max_bytes=100)
+    stager.cache_dev = -1       # Treat tmp_path as slow storage so files get staged
+    return stager
+
+def test_acquire_during_eviction_never_gets_a_deleted_copy(tmp_path, stager, monkeypatch):
+    source = tmp_path / "video.mp4"
+    source.write_bytes(b"x" * 80)
+    staged = stager.stage(str(source))
+    assert staged and os.path.exists(staged)
+
+    # An upload starts right as the copy is being deleted
+    rmtree = media_stage.shutil.rmtree
+    acquired = []
+    def slow_rmtree(path, ignore_errors=False):
+        acquired.append(stager.acquire(str(source)))
+        rmtree(path, ignore_errors=ignore_errors)
+    monkeypatch.setattr(media_stage.shutil, "rmtree", slow_rmtree)
+
+    stager.evict(incoming=80)
+    (path, key), = acquired
+    assert path == str(source)
+    assert os.path.exists(path)
+    stager.release(key)
+
+def test_pinned_copies_are_kept_and_leftovers_cleared(tmp_path, stager):
+    source = tmp_path / "video.mp4"
+    source.write_bytes(b"x" * 80)
+    stager.stage(str(source))
+    leftover = tmp_path / "cache" / f"abc.123{media_stage.EVICTED}"
+    leftover.mkdir()
+
+    with stager.use(str(source)) as path:
+        stager.evict(incoming=80)
+        assert os.path.exists(path) and path != str(source)
+    assert not leftover.exists()
\ No newline at end of file
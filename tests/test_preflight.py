@@ -0,0 +1,61 @@
+import pytest
+
+pytest.importorskip("config.config")
+
+import utils.preflight as preflight
+import utils.error_classifier as error_classifier
+from utils.file_cache import FileCache
+from tests.test_media_probe import mp4, fragmented_mp4
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(preflight, "_cache", FileCache(str(tmp_path / "cache.json"), preflight.probe_file))
+
+def write(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+def test_unknown_duration_skips_duration_limits(tmp_path):
+    path = write(tmp_path, "fragmented.mp4", fragmented_mp4())
+    assert preflight.check(path, "TikTok") == []
+
+def test_half_copied_file_is_retried_not_rejected(tmp_path):
+    data = mp4()
+    path = write(tmp_path, "copying.mp4", data[:len(data) - 60])
+
+    problems = preflight.check(path, "TikTok")
+    assert len(problems) == 1
+    error_class = error_classifier.classify("Preflight: " + problems[0])
+    assert error_classifier.action_for(error_class) == error_classifier.RETRY
+
+def test_probe_errors_are_not_stored_and_probed_again(tmp_path, scratch_db):
+    pytest.importorskip("playwright")
+    import core.db_scheduler as scheduler
+
+    data = mp4()
+    path = write(tmp_path, "copying.mp4", data[:12])
+    conn = scratch_db.connect()
+    cur = conn.cursor()
+    cur.execute("""
+        INSERT INTO social_accounts (platform, account_name, bitbrowser_profile_id)
+        VALUES ('TikTok', 'a', 'a')
+    """)
+    cur.execute("INSERT INTO social_queue (video_path, title) VALUES (%s, 'x') RETURNING id", (path,))
+    job = cur.fetchone()[0]
+    conn.commit()
+
+    # No moov box yet: nothing stored, nothing scheduled
+    scheduler.reconcile_schedules(conn)
+    cur.execute("SELECT media_info, skip_platforms FROM social_queue WHERE id = %s", (job,))
+    assert cur.fetchone() == (None, [])
+    cur.execute("SELECT COUNT(*) FROM platform_schedules")
+    assert cur.fetchone()[0] == 0
+
+    # The copy finished: the sweep probes it again and schedules it
+    write(tmp_path, "copying.mp4", data)
+    scheduler.sweep_unscheduled_jobs(conn)
+    cur.execute("SELECT media_info->>'duration' FROM social_queue WHERE id = %s", (job,))
+    assert float(cur.fetchone()[0]) == 42
+    cur.execute("SELECT COUNT(*) FROM platform_schedules WHERE queue_id = %s", (job,))
+    assert cur.fetchone()[0] == 1
\ No newline at end of file
@@ -0,0 +1,27 @@
+import datetime
+import pytest
+
+pytest.importorskip("config.config")
+
+import utils.rate_limit as rate_limit
+
+NOW = datetime.datetime(2026, 1, 1, 9, 0)
+
+def limiter():
+    limits = rate_limit.RateLimiter()
+    limits.set_windows({"TikTok": (30, 60)})
+    return limits
+
+def test_take_blocks_only_that_account():
+    limits = limiter()
+    limits.take(1, "TikTok", NOW)
+    assert limits.blocked(NOW) == ([1], [])
+    ready = limits.account_ready_at(1, NOW)
+    assert NOW + datetime.timedelta(minutes=30) <= ready <= NOW + datetime.timedelta(minutes=60)
+
+def test_refund_gives_tokens_back():
+    limits = limiter()
+    limits.take(1, "TikTok", NOW)
+    limits.refund(1, "TikTok", NOW)
+    assert limits.blocked(NOW) == ([], [])
+    assert limits.platforms["TikTok"].tokens == rate_limit.DEFAULT_PLATFORM_LIMIT["burst"]
\ No newline at end of file
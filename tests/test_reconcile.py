@@ -0,0 +1,60 @@
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("playwright")
+pytest.importorskip("config.config")
+pytest.importorskip("config.db_config")
+
+import core.db_scheduler as scheduler
+
+def add_account(cur, name):
+    cur.execute("""
+        INSERT INTO social_accounts (platform, account_name, bitbrowser_profile_id)
+        VALUES ('TikTok', %s, %s) RETURNING id
+    """, (name, name))
+    return cur.fetchone()[0]
+
+def add_job(cur, name):
+    cur.execute("INSERT INTO social_queue (video_path, title) VALUES (%s, %s) RETURNING id", (name, name))
+    return cur.fetchone()[0]
+
+def jobs_of(cur, account_id):
+    cur.execute("SELECT queue_id FROM platform_schedules WHERE account_id = %s ORDER BY queue_id", (account_id,))
+    return [row[0] for row in cur.fetchall()]
+
+def test_new_account_catches_up_on_pending_jobs_only(scratch_db):
+    conn = scratch_db.connect()
+    cur = conn.cursor()
+    first = add_account(cur, "first")
+    done, pending = add_job(cur, "done.mp4"), add_job(cur, "pending.mp4")
+    conn.commit()
+    scheduler.reconcile_schedules(conn)
+    assert jobs_of(cur, first) == [done, pending]
+
+    cur.execute("SELECT id FROM platform_schedules WHERE queue_id = %s", (done,))
+    scheduler.update_post_status(conn, cur.fetchone()[0], True)
+
+    # Added after both jobs were queued: only the one still going out is scheduled
+    second = add_account(cur, "second")
+    conn.commit()
+    scheduler.reconcile_schedules(conn)
+    assert jobs_of(cur, second) == [pending]
+
+    cur.execute("SELECT scheduled_through FROM social_accounts WHERE id = %s", (second,))
+    assert cur.fetchone()[0] == pending
+
+def test_complete_finished_jobs_catches_missed_jobs(scratch_db):
+    conn = scratch_db.connect()
+    cur = conn.cursor()
+    add_account(cur, "first")
+    job = add_job(cur, "done.mp4")
+    conn.commit()
+    scheduler.reconcile_schedules(conn)
+
+    # Finished without update_post_status (e.g. two last posts racing)
+    cur.execute("UPDATE platform_schedules SET retry_count = 3 WHERE queue_id = %s", (job,))
+    conn.commit()
+    assert scheduler.complete_finished_jobs(conn) == 1
+
+    cur.execute("SELECT completed_at IS NOT NULL FROM social_queue WHERE id = %s", (job,))
+    assert cur.fetchone()[0]
\ No newline at end of file
@@ -0,0 +1,72 @@
+import datetime
+from contextlib import contextmanager
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("playwright")
+pytest.importorskip("config.config")
+pytest.importorskip("config.db_config")
+
+import core.db_scheduler as scheduler
+import bots.twitter_poster as twitter_poster
+from utils.media_stage import MediaStager
+
+class BrokenPage:
+    """Playwright page whose navigation fails, like a dropped connection"""
+
+    def __init__(self):
+        self.screenshots = []
+
+    def goto(self, url, **kwargs):
+        raise RuntimeError("net::ERR_CONNECTION_RESET at https://x.com/home")
+
+    def screenshot(self, path):
+        self.screenshots.append(path)
+
+class FakeSessions:
+    def __init__(self, page):
+        self._page = page
+
+    @contextmanager
+    def page(self, profile_id):
+        yield self._page
+
+def make_post(path):
+    return {
+        "schedule_id": 7,
+        "queue_id": 3,
+        "account_id": 11,
+        "platform": "Twitter",
+        "scheduled_time": datetime.datetime(2026, 1, 1, 9, 0),
+        "path": str(path),
+        "title": "Test video",
+        "desc": "",
+        "link": "",
+        "account_name": "test-account",
+        "profile_id": "profile-0000000000000000000",
+    }
+
+def test_flow_exception_is_recorded_as_failure(monkeypatch, tmp_path):
+    video = tmp_path / "video.mp4"
+    video.write_bytes(b"not really a video")
+
+    statuses = []
+    attempts = []
+    monkeypatch.setattr(scheduler, "PRE_POST_WAIT", (0, 0))
+    monkeypatch.setattr(scheduler.preflight, "check", lambda path, platform: [])
+    monkeypatch.setattr(scheduler.media_stage, "get_stager", lambda: MediaStager(cache_dir=str(tmp_path / "cache")))
+    monkeypatch.setattr(scheduler.db, "get_db_connection", lambda: object())
+    monkeypatch.setattr(scheduler.db, "release_connection", lambda conn: None)
+    monkeypatch.setattr(scheduler, "record_attempt",
+                        lambda conn, post, timer, worker, success=True, error_msg=None: attempts.append(success))
+    monkeypatch.setattr(scheduler, "update_post_status",
+                        lambda conn, schedule_id, success=True, error_msg=None, account_id=None:
+                        statuses.append((schedule_id, success, error_msg, account_id)))
+    monkeypatch.setitem(scheduler.FLOW_MAP, "Twitter", twitter_poster.post_twitter)
+
+    page = BrokenPage()
+    scheduler.run_post(make_post(video), FakeSessions(page), 1)
+
+    assert page.screenshots == ["twitter_error.png"]
+    assert attempts == [False]
+    assert statuses == [(7, False, "net::ERR_CONNECTION_RESET at https://x.com/home", 11)]
\ No newline at end of file
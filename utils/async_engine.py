@@ -0,0 +1,165 @@
+import time
+import asyncio
+from playwright.async_api import async_playwright
+from utils.bitbrowser import get_async_client
+import utils.spans as spans
+
+class AsyncProfileSession:
+    """One open BitBrowser profile with a live CDP connection (asyncio side)"""
+
+    def __init__(self, profile_id, ws_url, browser):
+        self.profile_id = profile_id
+        self.ws_url = ws_url
+        self.browser = browser
+        self.last_used = time.time()
+        self.uses = 0
+
+    async def get_page(self):
+        """Reuse the profile's first tab (opening one if it has none)"""
+        context = self.browser.contexts[0]
+        return context.pages[0] if context.pages else await context.new_page()
+
+    async def is_healthy(self):
+        try:
+            if not self.browser.is_connected():
+                return False
+            page = await self.get_page()
+            await page.evaluate("1")
+            return True
+        except Exception:
+            return False
+
+class AsyncPostingEngine:
+    """
+    Drives many BitBrowser profiles from one event loop.
+
+    A single long-lived async_playwright driver is started once and shared by
+    every flow. Profiles stay connected between runs (LRU cap + idle timeout,
+    like utils/profile_sessions.py), a per-profile lock keeps one flow per
+    profile at a time, and a semaphore caps how many flows run at once.
+    """
+
+    def __init__(self, max_concurrency=8, max_open=10, idle_timeout=600):
+        self.max_open = max_open
+        self.idle_timeout = idle_timeout
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._playwright = None
+        self._bitbrowser = get_async_client()
+        self._sessions = {}        # profile_id -> AsyncProfileSession
+        self._locks = {}           # profile_id -> asyncio.Lock
+
+    async def start(self):
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        return self
+
+    async def stop(self):
+        for profile_id in list(self._sessions):
+            await self._close(profile_id)
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    def _lock(self, profile_id):
+        if profile_id not in self._locks:
+            self._locks[profile_id] = asyncio.Lock()
+        return self._locks[profile_id]
+
+    async def _open(self, profile_id):
+        """Open and connect, hard-resetting the profile once if that fails"""
+        for attempt in range(2):
+            try:
+                spans.mark("browser_open")
+                ws_url = await self._bitbrowser.open(profile_id)
+                spans.mark("cdp_connect")
+                browser = await self._playwright.chromium.connect_over_cdp(ws_url)
+                print(f"   🌐 Opened profile {profile_id[:20]}...")
+                return AsyncProfileSession(profile_id, ws_url, browser)
+            except Exception as e:
+                if attempt == 1:
+                    raise
+                print(f"   ⚠️ Could not connect to profile ({e}). Hard reset...")
+                await self._hard_reset(profile_id)
+
+    async def _hard_reset(self, profile_id):
+        await self._bitbrowser.close(profile_id)
+        await self._bitbrowser.wait_until_closed(profile_id, timeout=10)
+
+    async def _close(self, profile_id):
+        session = self._sessions.pop(profile_id, None)
+        if session is None:
+            return
+        spans.mark("close")
+        try:
+            await session.browser.close()
+        except Exception:
+            pass
+        await self._bitbrowser.close(profile_id)
+
+    async def _make_room(self):
+        """Close least recently used idle sessions until one more fits under max_open"""
+        idle = sorted(
+            (s for p, s in self._sessions.items() if not self._lock(p).locked()),
+            key=lambda s: s.last_used,
+        )
+        while len(self._sessions) >= self.max_open and idle:
+            session = idle.pop(0)
+            print(f"   🧊 Closing least recently used profile {session.profile_id[:20]}...")
+            await self._close(session.profile_id)
+
+    async def _acquire(self, profile_id):
+        """Warm session if healthy, otherwise a fresh one (caller holds the profile lock)"""
+        session = self._sessions.get(profile_id)
+
+        if session and await session.is_healthy():
+            print(f"   🔥 Reusing warm session (use #{session.uses + 1})")
+            return session
+
+        if session:
+            print("   ♻️ Warm session failed health check. Hard reset...")
+            await self._close(profile_id)
+            await self._hard_reset(profile_id)
+
+        await self._make_room()
+        session = await self._open(profile_id)
+        self._sessions[profile_id] = session
+        return session
+
+    async def run(self, profile_id, flow, **kwargs):
+        """Run one async bot flow (e.g. post_tiktok_async) on `profile_id`"""
+        async with self._slots:
+            async with self._lock(profile_id):
+                session = await self._acquire(profile_id)
+                try:
+                    page = await session.get_page()
+                    return await flow(page, **kwargs)
+                finally:
+                    session.uses += 1
+                    session.last_used = time.time()
+
+    async def run_many(self, jobs):
+        """
+        Run many flows concurrently. `jobs` is a list of
+        (profile_id, flow, kwargs) tuples; results (or exceptions) come back in order.
+        """
+        return await asyncio.gather(
+            *(self.run(profile_id, flow, **kwargs) for profile_id, flow, kwargs in jobs),
+            return_exceptions=True,
+        )
+
+    async def evict_idle(self):
+        """Close sessions that have not been used for idle_timeout seconds"""
+        now = time.time()
+        for profile_id, session in list(self._sessions.items()):
+            if now - session.last_used >= self.idle_timeout and not self._lock(profile_id).locked():
+                print(f"   🧊 Closing idle profile {profile_id[:20]}...")
+                await self._close(profile_id)
+
+    def open_profiles(self):
+        return list(self._sessions)
\ No newline at end of file
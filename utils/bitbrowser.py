@@ -0,0 +1,205 @@
+import time
+import asyncio
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeouts in seconds. Opening a profile launches a browser,
+# so it gets a longer read timeout than the other calls.
+OPEN_TIMEOUT = (3, 60)
+CLOSE_TIMEOUT = (3, 15)
+STATUS_TIMEOUT = (3, 5)
+
+class BitBrowserError(Exception):
+    """The BitBrowser local API failed or returned something unusable"""
+
+class BitBrowserClient:
+    """
+    Client for the BitBrowser local API.
+    Keep-alive sessions are shared by every call (and every thread), each
+    call has a timeout, and connection errors / 5xx replies are retried a
+    bounded number of times with backoff. /browser/open is not idempotent
+    (a slow open that is sent again can launch the profile twice), so it
+    only retries when the request never reached the API.
+    """
+
+    def __init__(self, api_url, pool_size=10, retries=2, backoff=0.5):
+        self.api_url = api_url.rstrip("/")
+        self.session = self._session(pool_size, Retry(
+            total=retries,
+            connect=retries,
+            read=1,
+            backoff_factor=backoff,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(["POST"]),
+            raise_on_status=False,
+        ))
+        self.open_session = self._session(pool_size, Retry(
+            total=retries,
+            connect=retries,
+            read=0,
+            status=0,
+            backoff_factor=backoff,
+            allowed_methods=frozenset(["POST"]),
+            raise_on_status=False,
+        ))
+
+    def _session(self, pool_size, retry):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _post(self, path, payload, timeout, session=None):
+        try:
+            resp = (session or self.session).post(f"{self.api_url}{path}", json=payload, timeout=timeout)
+            return resp.json()
+        except requests.RequestException as e:
+            raise BitBrowserError(f"{path} failed: {e}") from e
+        except ValueError as e:
+            raise BitBrowserError(f"{path} returned invalid JSON") from e
+
+    def open(self, profile_id):
+        """Open a profile and return its CDP websocket URL"""
+        resp = self._post("/browser/open", {"id": profile_id}, OPEN_TIMEOUT, self.open_session)
+
+        if not resp.get('success', False):
+            raise BitBrowserError(f"BitBrowser Failed: {resp.get('msg', 'Unknown Error')}")
+
+        ws = resp['data']['ws']
+        if isinstance(ws, dict) and 'selenium' in ws:
+            return ws['selenium']
+        elif isinstance(ws, str):
+            return ws
+        raise BitBrowserError(f"Unknown WS format: {ws}")
+
+    def close(self, profile_id):
+        """Close a profile. Returns False (and says why) instead of raising."""
+        try:
+            resp = self._post("/browser/close", {"id": profile_id}, CLOSE_TIMEOUT)
+        except BitBrowserError as e:
+            print(f"   ⚠️ Close failed for {profile_id[:20]}: {e}")
+            return False
+
+        if not resp.get('success', False):
+            print(f"   ⚠️ Close failed for {profile_id[:20]}: {resp.get('msg', 'Unknown Error')}")
+            return False
+        return True
+
+    def alive_pids(self, profile_ids):
+        """Map each open profile ID to its browser PID (closed profiles are left out)"""
+        resp = self._post("/browser/pids/alive", {"ids": list(profile_ids)}, STATUS_TIMEOUT)
+        if not resp.get('success', False):
+            raise BitBrowserError(f"Status query failed: {resp.get('msg', 'Unknown Error')}")
+        return resp.get('data') or {}
+
+    def is_open(self, profile_id):
+        return profile_id in self.alive_pids([profile_id])
+
+    def wait_until_closed(self, profile_id, timeout=15, interval=0.25):
+        """Poll the profile status until it is closed. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if not self.is_open(profile_id):
+                    return True
+            except BitBrowserError:
+                pass
+            time.sleep(interval)
+        return False
+
+    def wait_until_open(self, profile_id, timeout=30, interval=0.25):
+        """Poll the profile status until it is open. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if self.is_open(profile_id):
+                    return True
+            except BitBrowserError:
+                pass
+            time.sleep(interval)
+        return False
+
+class AsyncBitBrowserClient:
+    """
+    asyncio front end for BitBrowserClient.
+    Calls run in the default executor and share the sync client's
+    connection pool, so sync and async callers can be mixed freely.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    async def open(self, profile_id):
+        return await asyncio.to_thread(self.client.open, profile_id)
+
+    async def close(self, profile_id):
+        return await asyncio.to_thread(self.client.close, profile_id)
+
+    async def alive_pids(self, profile_ids):
+        return await asyncio.to_thread(self.client.alive_pids, profile_ids)
+
+    async def is_open(self, profile_id):
+        return profile_id in await self.alive_pids([profile_id])
+
+    async def wait_until_closed(self, profile_id, timeout=15, interval=0.25):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if not await self.is_open(profile_id):
+                    return True
+            except BitBrowserError:
+                pass
+            await asyncio.sleep(interval)
+        return False
+
+    async def wait_until_open(self, profile_id, timeout=30, interval=0.25):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if await self.is_open(profile_id):
+                    return True
+            except BitBrowserError:
+                pass
+            await asyncio.sleep(interval)
+        return False
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_client(api_url=None):
+    """Shared client per API URL (defaults to config.API_URL)"""
+    if api_url is None:
+        import config.config as config
+        api_url = config.API_URL
+
+    with _clients_lock:
+        if api_url not in _clients:
+            _clients[api_url] = BitBrowserClient(api_url)
+        return _clients[api_url]
+
+def get_async_client(api_url=None):
+    return AsyncBitBrowserClient(get_client(api_url))
+
+def _use_config_hooks():
+    import config.config as config
+    return config if getattr(config, "CUSTOM_BROWSER_HOOKS", False) else None
+
+def open_profile(profile_id):
+    """
+    Open a profile through the shared client and return its CDP websocket
+    URL. config.py's open_browser() is only used with CUSTOM_BROWSER_HOOKS = True.
+    """
+    config = _use_config_hooks()
+    if config:
+        return config.open_browser(profile_id)
+    return get_client().open(profile_id)
+
+def close_profile(profile_id):
+    """Close a profile through the shared client (or config.py's close_browser(), see open_profile)"""
+    config = _use_config_hooks()
+    if config:
+        return config.close_browser(profile_id)
+    return get_client().close(profile_id)
\ No newline at end of file
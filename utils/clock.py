@@ -0,0 +1,63 @@
+import time
+import datetime
+import threading
+
+class SystemClock:
+    """Real wall-clock time (the default)"""
+
+    def now(self):
+        return datetime.datetime.now()
+
+    def time(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+class VirtualClock:
+    """
+    Simulated time for benchmarks: sleep() advances the clock instantly
+    instead of blocking, so a week of scheduling runs in minutes.
+    """
+
+    def __init__(self, start=None):
+        self._now = start or datetime.datetime.now()
+        self._lock = threading.Lock()
+
+    def now(self):
+        with self._lock:
+            return self._now
+
+    def time(self):
+        return self.now().timestamp()
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def advance(self, seconds):
+        with self._lock:
+            self._now += datetime.timedelta(seconds=seconds)
+
+    def advance_to(self, moment):
+        with self._lock:
+            if moment > self._now:
+                self._now = moment
+
+_clock = SystemClock()
+
+def set_clock(clock):
+    """Swap the clock used by the scheduler (e.g. a VirtualClock in simulations)"""
+    global _clock
+    _clock = clock
+
+def get_clock():
+    return _clock
+
+def now():
+    return _clock.now()
+
+def sleep(seconds):
+    _clock.sleep(seconds)
+
+def timestamp():
+    return _clock.time()
\ No newline at end of file
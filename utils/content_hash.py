@@ -0,0 +1,30 @@
+import os
+import hashlib
+from utils.file_cache import FileCache
+
+CHUNK_SIZE = 1024 * 1024    # Bytes read per chunk while hashing
+
+# Default cache file, next to the repo (git-ignored)
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".hash_cache.json")
+
+def hash_file(path):
+    """SHA-256 of a file's contents, read in CHUNK_SIZE pieces into one reused buffer"""
+    digest = hashlib.sha256()
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            digest.update(view[:n])
+    return digest.hexdigest()
+
+class HashCache(FileCache):
+    """Content hashes by (path, size, mtime): unchanged files are never re-read"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        super().__init__(path, hash_file)
+
+    def hash(self, path):
+        return self.get(path)
\ No newline at end of file
@@ -0,0 +1,64 @@
+import re
+import random
+
+# Error classes stored in platform_schedules.error_class
+TRANSIENT = "transient"                # network, timeouts, browser/BitBrowser hiccups
+SELECTOR_MISSING = "selector_missing"  # page changed or never finished loading
+LOGGED_OUT = "logged_out"              # profile lost its session
+MEDIA_REJECTED = "media_rejected"      # the file itself can't go to this platform
+UNKNOWN = "unknown"
+
+# What the scheduler does next
+RETRY = "retry"     # try again after a backoff
+PARK = "park"       # hold every post of the account until someone logs it back in
+FAIL = "fail"       # give up on this post now
+
+# First match wins. Playwright locator errors quote the selector (which can
+# say "Log in"), so selectors and timeouts are checked before LOGGED_OUT.
+PATTERNS = [
+    (TRANSIENT, r"can't read .* \("),    # share offline; the file may come back
+    (MEDIA_REJECTED, r"^preflight:|unsupported (video|file|format)|file (is )?too (large|big)|"
+                     r"video (is )?too (long|short)|aspect ratio|couldn.t process"),
+    (SELECTOR_MISSING, r"waiting for (locator|selector|get_by)|strict mode violation|"
+                       r"element is not (attached|visible)|no element"),
+    (TRANSIENT, r"net::err_|\btimeout \d+ms exceeded|timed out|connection (reset|refused|aborted)|"
+                r"\becon(nreset|nrefused|naborted)\b|socket|target .*closed|browser has been closed|"
+                r"bitbrowser failed|status query failed|/browser/\w+ failed|"
+                r"\b(http|status)[ :]*50[234]\b|\b50[234] (bad gateway|service unavailable|gateway time-?out)\b"),
+    (LOGGED_OUT, r"logged out|not logged in|session (has )?expired|please (log|sign) ?in|"
+                 r"(log|sign) ?in (is )?required|accounts\.google\.com|/(login|signin|checkpoint)\b"),
+]
+_COMPILED = [(error_class, re.compile(pattern, re.IGNORECASE)) for error_class, pattern in PATTERNS]
+
+ACTIONS = {
+    TRANSIENT: RETRY,
+    SELECTOR_MISSING: RETRY,
+    UNKNOWN: RETRY,
+    LOGGED_OUT: PARK,
+    MEDIA_REJECTED: FAIL,
+}
+
+# First retry delay per class in seconds; doubles with every retry
+BACKOFF_BASE = {
+    TRANSIENT: 120,
+    SELECTOR_MISSING: 900,
+    UNKNOWN: 300,
+}
+MAX_BACKOFF = 6 * 3600
+PARK_SECONDS = 6 * 3600
+
+def classify(error_msg):
+    """Error class for an error message (UNKNOWN if nothing matches)"""
+    for error_class, pattern in _COMPILED:
+        if pattern.search(error_msg or ""):
+            return error_class
+    return UNKNOWN
+
+def action_for(error_class):
+    return ACTIONS.get(error_class, RETRY)
+
+def backoff_seconds(error_class, retry_count):
+    """Exponential backoff with ±50% jitter, so failing posts don't all come back at once"""
+    base = BACKOFF_BASE.get(error_class, BACKOFF_BASE[UNKNOWN])
+    delay = min(base * 2 ** retry_count, MAX_BACKOFF)
+    return delay * random.uniform(0.5, 1.5)
\ No newline at end of file
@@ -0,0 +1,51 @@
+import os
+import json
+import threading
+
+class FileCache:
+    """
+    Remembers compute(path) by (path, size, mtime) so files that have not
+    changed are never read again. Safe to use from a thread pool; call
+    save() to write it back to disk as JSON.
+    """
+
+    def __init__(self, path, compute):
+        self.path = path
+        self.compute = compute
+        self.entries = {}       # path -> [size, mtime_ns, value]
+        self.dirty = False
+        self.lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def get(self, path):
+        """compute(path), from the cache when size and mtime still match"""
+        st = os.stat(path)
+        key = os.path.abspath(path)
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            return entry[2]
+
+        value = self.compute(path)
+        with self.lock:
+            self.entries[key] = [st.st_size, st.st_mtime_ns, value]
+            self.dirty = True
+        return value
+
+    def save(self):
+        """Write the cache if anything changed (atomically, so a crash can't corrupt it)"""
+        with self.lock:
+            if not self.dirty:
+                return
+            tmp = self.path + ".tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(self.entries, f)
+                os.replace(tmp, self.path)
+                self.dirty = False
+            except OSError as e:
+                print(f"⚠️ Could not save {os.path.basename(self.path)}: {e}")
\ No newline at end of file
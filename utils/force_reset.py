@@ -1,6 +1,6 @@
-import requests
 import time
 import config.config as config
+from utils.bitbrowser import get_client
 
 def force_reset(profile_id=None):
     """
@@ -12,24 +12,24 @@ def force_reset(profile_id=None):
     
     print(f"--- FORCE RESET FOR PROFILE: {profile_id} ---")
 
+    client = get_client(config.API_URL)
+
     # Step 1: Force Close
     print("Step 1: Sending CLOSE command...")
-    try:
-        close_resp = requests.post(
-            f"{config.API_URL}/browser/close", 
-            json={"id": profile_id},
-            timeout=10
-        ).json()
-        print(f"   Response: {close_resp.get('msg', 'Closed')}")
-    except Exception as e:
-        print(f"   Close failed (this is OK if already closed): {e}")
+    if client.close(profile_id):
+        print("   Response: Closed")
+    else:
+        print("   Close failed (this is OK if already closed)")
 
     # Step 2: Wait for cleanup
-    print("Step 2: Waiting 5 seconds for BitBrowser cleanup...")
-    time.sleep(5)
+    print("Step 2: Waiting for BitBrowser to report the profile closed...")
+    if client.wait_until_closed(profile_id, timeout=10):
+        print("   Profile is closed.")
+    else:
+        print("   Still reported open after 10s, continuing anyway.")
 
     # Step 3: Try to open (optional - most bots open it themselves)
-    # We don't open here because each bot does it via config.open_browser()
+    # We don't open here because each bot does it via utils.bitbrowser.open_profile()
     print("Step 3: Reset complete. Profile ready for next use.")
     print("=" * 50)
 
@@ -0,0 +1,145 @@
+import time
+import random
+import asyncio
+
+# Characters sent to the browser per driver call
+CHUNK_SIZE = 120
+
+# Types one chunk inside the page. Each character is inserted with
+# execCommand('insertText'), which fires the same beforeinput/input events
+# as a keypress, then the page waits that character's delay. Returns how
+# many characters it typed. It stops early at a newline (typed as an Enter
+# press from Python) or if the focused element refuses the insert.
+_TYPE_CHUNK_JS = """
+async ([chars, delays]) => {
+    const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+    for (let i = 0; i < chars.length; i++) {
+        if (chars[i] === "\\n" || !document.execCommand("insertText", false, chars[i])) {
+            return i;
+        }
+        await sleep(delays[i]);
+    }
+    return chars.length;
+}
+"""
+
+class KeystrokeProfile:
+    """
+    Inter-key timing: every key waits uniform(key_delay) seconds, and
+    `pause_chance` of keys add a uniform(pause) "thinking" pause on top.
+    """
+
+    def __init__(self, key_delay=(0.05, 0.15), pause_chance=0.1, pause=(0.2, 0.5)):
+        self.key_delay = key_delay
+        self.pause_chance = pause_chance
+        self.pause = pause
+
+    def delay(self):
+        delay = random.uniform(*self.key_delay)
+        if random.random() < self.pause_chance:
+            delay += random.uniform(*self.pause)
+        return delay
+
+    def mean_delay(self):
+        return sum(self.key_delay) / 2 + self.pause_chance * sum(self.pause) / 2
+
+# The per-character timings each bot used before typing was batched
+PROFILES = {
+    "youtube": KeystrokeProfile(pause_chance=0.05, pause=(0.3, 0.7)),
+    "linkedin": KeystrokeProfile(pause_chance=0.08, pause=(0.3, 0.8)),
+    "tiktok": KeystrokeProfile(pause_chance=0.1, pause=(0.2, 0.5)),
+    "twitter": KeystrokeProfile(pause_chance=0.1, pause=(0.2, 0.5)),
+    "pinterest": KeystrokeProfile(pause_chance=0.1, pause=(0.2, 0.5)),
+}
+
+def _chunks(text, size):
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+def _profile(platform):
+    return PROFILES.get(platform, KeystrokeProfile())
+
+# --- SYNC ---
+
+def type_text(page, text, platform=None, chunk_size=CHUNK_SIZE):
+    """Type into the focused element one chunk per driver call, with per-key timing applied in the page"""
+    profile = _profile(platform)
+
+    for chunk in _chunks(text, chunk_size):
+        delays = [round(profile.delay() * 1000) for _ in chunk]
+        done = 0
+        while done < len(chunk):
+            typed = page.evaluate(_TYPE_CHUNK_JS, [chunk[done:], delays[done:]])
+            done += typed
+            if done >= len(chunk):
+                break
+            if chunk[done] == "\n":
+                page.keyboard.press("Enter")
+                time.sleep(delays[done] / 1000)
+                done += 1
+            else:
+                # Element does not take inserted text: let the driver press the keys
+                page.keyboard.type(chunk[done:], delay=profile.mean_delay() * 1000)
+                done = len(chunk)
+
+def insert_text(page, text):
+    """Paste-style insert of the whole text in one call (no key events), for long fields"""
+    page.keyboard.insert_text(text)
+
+def type_into(page, selector, text, platform=None, mode="keys", clear=False):
+    """
+    Focus `selector` and enter `text`.
+    mode="keys" types with the platform's timing, mode="insert" inserts it at once.
+    """
+    try:
+        page.locator(selector).first.click()
+    except Exception:
+        pass
+
+    if clear:
+        page.keyboard.press("Control+A")
+        page.keyboard.press("Backspace")
+
+    if mode == "insert":
+        insert_text(page, text)
+    else:
+        type_text(page, text, platform)
+
+# --- ASYNC ---
+
+async def type_text_async(page, text, platform=None, chunk_size=CHUNK_SIZE):
+    profile = _profile(platform)
+
+    for chunk in _chunks(text, chunk_size):
+        delays = [round(profile.delay() * 1000) for _ in chunk]
+        done = 0
+        while done < len(chunk):
+            typed = await page.evaluate(_TYPE_CHUNK_JS, [chunk[done:], delays[done:]])
+            done += typed
+            if done >= len(chunk):
+                break
+            if chunk[done] == "\n":
+                await page.keyboard.press("Enter")
+                await asyncio.sleep(delays[done] / 1000)
+                done += 1
+            else:
+                await page.keyboard.type(chunk[done:], delay=profile.mean_delay() * 1000)
+                done = len(chunk)
+
+async def insert_text_async(page, text):
+    await page.keyboard.insert_text(text)
+
+async def type_into_async(page, selector, text, platform=None, mode="keys", clear=False):
+    try:
+        await page.locator(selector).first.click()
+    except Exception:
+        pass
+
+    if clear:
+        await page.keyboard.press("Control+A")
+        await page.keyboard.press("Backspace")
+
+    if mode == "insert":
+        await insert_text_async(page, text)
+    else:
+        await type_text_async(page, text, platform)
\ No newline at end of file
@@ -0,0 +1,149 @@
+import os
+import struct
+
+class ProbeError(Exception):
+    """The file claims to be MP4/MOV but its boxes can't be read (truncated or corrupt)"""
+
+def read_exact(f, n):
+    """Read exactly n bytes; a short read means the file ends mid-box"""
+    data = f.read(n)
+    if len(data) < n:
+        raise ProbeError("file ends in the middle of a box (truncated?)")
+    return data
+
+def read_boxes(f, start, end):
+    """(type, payload start, box end) for each ISO-BMFF box between start and end"""
+    boxes = []
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        size, box_type = struct.unpack(">I4s", read_exact(f, 8))
+        header = 8
+        if size == 1:
+            size = struct.unpack(">Q", read_exact(f, 8))[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header or pos + size > end:
+            raise ProbeError(f"'{box_type.decode('latin-1')}' box runs past the end of the file")
+        boxes.append((box_type, pos + header, pos + size))
+        pos += size
+    return boxes
+
+def find_box(f, start, end, box_type):
+    for found, payload, box_end in read_boxes(f, start, end):
+        if found == box_type:
+            return payload, box_end
+    return None
+
+def find_path(f, start, end, path):
+    """Follow nested boxes, e.g. [b"mdia", b"minf", b"stbl", b"stsd"]"""
+    for box_type in path:
+        found = find_box(f, start, end, box_type)
+        if found is None:
+            return None
+        start, end = found
+    return start, end
+
+def read_mvhd(f, start):
+    """(timescale, duration) of the movie; duration None if the file doesn't say"""
+    f.seek(start)
+    version = read_exact(f, 4)[0]
+    if version == 1:
+        _, _, timescale, duration = struct.unpack(">QQIQ", read_exact(f, 28))
+        unknown = 0xFFFFFFFFFFFFFFFF
+    else:
+        _, _, timescale, duration = struct.unpack(">IIII", read_exact(f, 16))
+        unknown = 0xFFFFFFFF
+    return timescale, (duration if duration not in (0, unknown) else None)
+
+def read_mehd(f, start):
+    """Duration of a fragmented movie (mvex/mehd), in mvhd timescale units"""
+    f.seek(start)
+    version = read_exact(f, 4)[0]
+    if version == 1:
+        return struct.unpack(">Q", read_exact(f, 8))[0] or None
+    return struct.unpack(">I", read_exact(f, 4))[0] or None
+
+def read_tkhd(f, start):
+    """Display width and height of a track, with 90°/270° rotation applied"""
+    f.seek(start)
+    version = read_exact(f, 4)[0]
+    f.seek(start + (36 if version == 1 else 24) + 16)
+    matrix = struct.unpack(">9i", read_exact(f, 36))
+    width, height = (value >> 16 for value in struct.unpack(">II", read_exact(f, 8)))
+    if matrix[0] == 0 and abs(matrix[1]) == 0x10000:
+        width, height = height, width
+    return width, height
+
+def read_handler(f, trak):
+    found = find_path(f, trak[0], trak[1], [b"mdia", b"hdlr"])
+    if found is None:
+        return None
+    f.seek(found[0] + 8)
+    return read_exact(f, 4)
+
+def read_codec(f, trak):
+    """Sample entry format of a track, e.g. 'avc1', 'hvc1', 'mp4a'"""
+    found = find_path(f, trak[0], trak[1], [b"mdia", b"minf", b"stbl", b"stsd"])
+    if found is None:
+        return None
+    f.seek(found[0] + 8)
+    entry = read_exact(f, 8)
+    return entry[4:8].decode("latin-1").strip()
+
+def probe(path):
+    """
+    Read duration, resolution and codecs from an MP4/MOV file's boxes. Only
+    box headers and the small moov box are read; mdat is skipped by seeking.
+    Returns None for other containers and raises ProbeError for broken files.
+    Fragmented files often leave the mvhd duration at 0; their mehd duration
+    is used instead, and "duration" is None when neither gives one.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = f.read(12)
+        if len(head) < 12 or head[4:8] != b"ftyp":
+            return None
+
+        moov = find_box(f, 0, size, b"moov")
+        if moov is None:
+            raise ProbeError("no 'moov' box (upload or copy not finished?)")
+
+        info = {
+            "container": "mov" if head[8:12] == b"qt  " else "mp4",
+            "size": size,
+            "duration": None,
+            "width": None,
+            "height": None,
+            "video_codec": None,
+            "audio_codec": None,
+        }
+
+        timescale = duration = None
+        try:
+            for box_type, payload, box_end in read_boxes(f, moov[0], moov[1]):
+                if box_type == b"mvhd":
+                    timescale, movie_duration = read_mvhd(f, payload)
+                    duration = movie_duration or duration
+                elif box_type == b"mvex":
+                    mehd = find_box(f, payload, box_end, b"mehd")
+                    if mehd and duration is None:
+                        duration = read_mehd(f, mehd[0])
+                elif box_type == b"trak":
+                    handler = read_handler(f, (payload, box_end))
+                    if handler == b"vide" and info["video_codec"] is None:
+                        tkhd = find_box(f, payload, box_end, b"tkhd")
+                        if tkhd:
+                            info["width"], info["height"] = read_tkhd(f, tkhd[0])
+                        info["video_codec"] = read_codec(f, (payload, box_end))
+                    elif handler == b"soun" and info["audio_codec"] is None:
+                        info["audio_codec"] = read_codec(f, (payload, box_end))
+        except (struct.error, IndexError) as e:
+            raise ProbeError(f"corrupt 'moov' box ({e})") from e
+        if timescale and duration:
+            info["duration"] = duration / timescale
+
+    if info["video_codec"] is None:
+        raise ProbeError("no video track")
+    return info
\ No newline at end of file
@@ -0,0 +1,185 @@
+import os
+import shutil
+import uuid
+import hashlib
+import threading
+from contextlib import contextmanager
+import config.config as config
+
+COPY_CHUNK = 8 * 1024 * 1024    # Bytes per read/write while copying
+EVICTED = ".evicted"            # Suffix of folders renamed out of the cache, pending deletion
+
+# Override in config.py
+CACHE_DIR = getattr(config, "MEDIA_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".sm_bot_media"))
+CACHE_GB = getattr(config, "MEDIA_CACHE_GB", 20)
+
+def copy_file(source, target):
+    """Streamed chunked copy through a temp file, renamed into place when complete"""
+    tmp = target + ".part"
+    buffer = bytearray(COPY_CHUNK)
+    view = memoryview(buffer)
+    try:
+        with open(source, "rb", buffering=0) as src, open(tmp, "wb") as dst:
+            while True:
+                n = src.readinto(buffer)
+                if not n:
+                    break
+                dst.write(view[:n])
+        os.replace(tmp, target)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+class MediaStager:
+    """
+    Size-capped local LRU copy of upload media that lives on slow storage
+    (network shares). stage() copies a file once, however many accounts post
+    it; use() hands back the local copy, or the original path if it isn't
+    staged. Files on the same drive as the cache are never copied.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=int(CACHE_GB * 1024 ** 3)):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.copying = {}       # key -> threading.Event set when the copy ends
+        self.pinned = {}        # key -> posts currently uploading it
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dev = os.stat(cache_dir).st_dev
+
+    def _key(self, source):
+        """(path, size, mtime) identify a version of a file, so edited files are re-staged"""
+        st = os.stat(source)
+        if st.st_dev == self.cache_dev:
+            return None
+        ident = f"{os.path.abspath(source)}|{st.st_size}|{st.st_mtime_ns}"
+        return hashlib.sha1(ident.encode("utf-8")).hexdigest()
+
+    def _target(self, key, source):
+        # Keep the original file name: some platforms use it as the default title
+        return os.path.join(self.cache_dir, key, os.path.basename(source))
+
+    def stage(self, source):
+        """Copy `source` into the cache unless it's already there or local. Returns the local path or None."""
+        try:
+            key = self._key(source)
+        except OSError:
+            return None
+        if key is None:
+            return None
+        target = self._target(key, source)
+
+        with self.lock:
+            if os.path.exists(target):
+                return target
+            done = self.copying.get(key)
+            if done is None:
+                done = self.copying[key] = threading.Event()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            done.wait()
+            return target if os.path.exists(target) else None
+
+        try:
+            size = os.path.getsize(source)
+            if size > self.max_bytes:
+                return None
+            self.evict(size)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            copy_file(source, target)
+            return target
+        except OSError as e:
+            print(f"⚠️ Could not stage {source}: {e}")
+            return None
+        finally:
+            with self.lock:
+                del self.copying[key]
+            done.set()
+
+    def acquire(self, source):
+        """
+        Path to upload from: the staged copy (waiting for an in-flight copy
+        to finish) or `source` itself. Returns (path, key); the copy can't be
+        evicted until release(key).
+        """
+        try:
+            key = self._key(source)
+        except OSError:
+            key = None
+        if key is None:
+            return source, None
+
+        target = self._target(key, source)
+        with self.lock:
+            done = self.copying.get(key)
+            self.pinned[key] = self.pinned.get(key, 0) + 1
+        if done is not None:
+            done.wait()
+        if os.path.exists(target):
+            os.utime(target)        # Most recently used
+            return target, key
+        return source, key
+
+    def release(self, key):
+        if key is None:
+            return
+        with self.lock:
+            self.pinned[key] -= 1
+            if not self.pinned[key]:
+                del self.pinned[key]
+
+    @contextmanager
+    def use(self, source):
+        """`with stager.use(path) as local_path:` acquire() and release() around an upload"""
+        path, key = self.acquire(source)
+        try:
+            yield path
+        finally:
+            self.release(key)
+
+    def evict(self, incoming=0):
+        """Delete least recently used copies until `incoming` more bytes fit under the cap"""
+        entries = []
+        for key in os.listdir(self.cache_dir):
+            folder = os.path.join(self.cache_dir, key)
+            if key.endswith(EVICTED):
+                shutil.rmtree(folder, ignore_errors=True)     # Left over from an interrupted eviction
+                continue
+            try:
+                files = [os.path.join(folder, name) for name in os.listdir(folder)]
+                stats = [os.stat(path) for path in files]
+            except OSError:
+                continue
+            entries.append((max((st.st_mtime for st in stats), default=0), sum(st.st_size for st in stats), key, folder))
+
+        used = sum(size for _, size, _, _ in entries)
+        for _, size, key, folder in sorted(entries):
+            if used + incoming <= self.max_bytes:
+                break
+            # Rename under the lock so acquire() can't pin a copy that is about to go,
+            # then do the slow delete without holding up other uploads
+            tomb = f"{folder}.{uuid.uuid4().hex}{EVICTED}"
+            with self.lock:
+                if key in self.pinned or key in self.copying:
+                    continue
+                try:
+                    os.rename(folder, tomb)
+                except OSError:
+                    continue
+            shutil.rmtree(tomb, ignore_errors=True)
+            used -= size
+
+_stager = None
+_stager_lock = threading.Lock()
+
+def get_stager():
+    """The process-wide MediaStager (created on first use)"""
+    global _stager
+    with _stager_lock:
+        if _stager is None:
+            _stager = MediaStager()
+        return _stager
\ No newline at end of file
@@ -0,0 +1,119 @@
+import datetime
+import random
+
+SLOT_MINUTES = 10       # Load is counted per slot of this length
+CHOICES = 3             # Random candidate slots per post; the least loaded one wins
+PROFILE_GAP_SLOTS = 1   # A profile gets no other post this many slots before/after one
+MAX_DAYS = 7            # Look this many windows ahead before giving up on capacity
+
+def slot_of(moment):
+    return moment.replace(minute=moment.minute - moment.minute % SLOT_MINUTES, second=0, microsecond=0)
+
+def posting_window(min_hour, max_hour, now, day=0):
+    """
+    (start, end) of the next min_hour..max_hour window that isn't over yet,
+    `day` days later. None if min_hour >= max_hour.
+    """
+    start = now.replace(hour=min_hour, minute=0, second=0, microsecond=0)
+    end = now.replace(hour=max_hour, minute=0, second=0, microsecond=0)
+    if end <= start:
+        return None
+    if end <= now:
+        start += datetime.timedelta(days=1)
+        end += datetime.timedelta(days=1)
+    start = max(start, now)
+    if day:
+        start = start.replace(hour=min_hour, minute=0, second=0, microsecond=0) + datetime.timedelta(days=day)
+        end += datetime.timedelta(days=day)
+    return start, end
+
+class SchedulePlanner:
+    """
+    Picks posting times for a batch of new schedules. Each post samples a few
+    random slots in its platform window and takes the least loaded one that
+    has room (`capacity` posts per slot), keeps its profile clear of other
+    posts and its account `spacing_minutes` away from its other posts. Posts
+    only move to a later day when the whole window is full.
+    """
+
+    def __init__(self, now, capacity):
+        self.now = now
+        self.capacity = capacity
+        self.load = {}              # slot -> posts due in it
+        self.profile_slots = {}     # profile_id -> slots with a post
+        self.account_slots = {}     # account_id -> slots with a post
+
+    def occupy(self, slot, account_id, profile_id):
+        self.profile_slots.setdefault(profile_id, set()).add(slot)
+        self.account_slots.setdefault(account_id, []).append(slot)
+
+    def add_load(self, slot, count=1):
+        self.load[slot] = self.load.get(slot, 0) + count
+
+    def add_backlog(self, count):
+        """Overdue posts go out first: they fill the slots from now on at full capacity"""
+        slot = slot_of(self.now)
+        step = datetime.timedelta(minutes=SLOT_MINUTES)
+        while count > 0:
+            room = max(0, self.capacity - self.load.get(slot, 0))
+            taken = min(count, max(room, 1))
+            self.add_load(slot, taken)
+            count -= taken
+            slot += step
+
+    def _fits(self, slot, account_id, profile_id, spacing_minutes):
+        if self.load.get(slot, 0) >= self.capacity:
+            return False
+        busy = self.profile_slots.get(profile_id, ())
+        for k in range(-PROFILE_GAP_SLOTS, PROFILE_GAP_SLOTS + 1):
+            if slot + datetime.timedelta(minutes=k * SLOT_MINUTES) in busy:
+                return False
+        spacing = spacing_minutes * 60
+        return all(abs((slot - other).total_seconds()) >= spacing
+                   for other in self.account_slots.get(account_id, ()))
+
+    def _pick(self, slots, account_id, profile_id, spacing_minutes):
+        """Least loaded of CHOICES random slots that fit; every slot is tried if none of those do"""
+        sampled = random.sample(slots, min(CHOICES, len(slots)))
+        fitting = [s for s in sampled if self._fits(s, account_id, profile_id, spacing_minutes)]
+        if not fitting:
+            rest = [s for s in slots if s not in sampled]
+            random.shuffle(rest)
+            for slot in rest:
+                if self._fits(slot, account_id, profile_id, spacing_minutes):
+                    return slot
+            return None
+        return min(fitting, key=lambda s: self.load.get(s, 0))
+
+    def plan(self, account_id, profile_id, min_hour, max_hour, spacing_minutes=0):
+        """A posting time for one new schedule, booked into the planner"""
+        step = datetime.timedelta(minutes=SLOT_MINUTES)
+        first = None
+
+        for day in range(MAX_DAYS):
+            window = posting_window(min_hour, max_hour, self.now, day)
+            if window is None:
+                return None
+            start, end = window
+            if first is None:
+                first = window
+
+            slots = []
+            slot = slot_of(start)
+            while slot < end:
+                slots.append(slot)
+                slot += step
+
+            slot = self._pick(slots, account_id, profile_id, spacing_minutes)
+            if slot is not None:
+                low, high = max(slot, start), min(slot + step, end)
+                break
+        else:
+            # Every window is full: fall back to a plain random time in the first one
+            low, high = first
+
+        moment = low + datetime.timedelta(seconds=random.randint(0, max(0, int((high - low).total_seconds()) - 1)))
+        slot = slot_of(moment)
+        self.add_load(slot)
+        self.occupy(slot, account_id, profile_id)
+        return moment
\ No newline at end of file
@@ -0,0 +1,97 @@
+import os
+import config.config as config
+import utils.media_probe as media_probe
+from utils.file_cache import FileCache
+
+# Probe results are cached here by (path, size, mtime), next to the repo (git-ignored)
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".media_cache.json")
+
+# What each platform accepts. Override any value per platform with
+# PLATFORM_MEDIA_RULES in config.py. "vertical" means height >= width.
+PLATFORM_RULES = {
+    "YouTube Shorts": {"max_duration": 180, "orientation": "vertical"},
+    "TikTok": {"min_duration": 3, "max_duration": 600, "orientation": "vertical", "max_size_mb": 4096},
+    "Twitter": {"min_duration": 0.5, "max_duration": 140, "max_size_mb": 512, "video_codecs": ["avc1", "avc3"]},
+    "LinkedIn Video": {"min_duration": 3, "max_duration": 1800, "max_size_mb": 5120},
+    "Pinterest Idea": {"min_duration": 4, "max_duration": 900, "max_size_mb": 2048},
+}
+
+def probe_file(path):
+    """media_probe.probe() as a cacheable value: info dict, None, or {"error": ...}"""
+    try:
+        return media_probe.probe(path)
+    except media_probe.ProbeError as e:
+        return {"error": str(e)}
+
+_cache = None
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        _cache = FileCache(DEFAULT_CACHE_PATH, probe_file)
+    return _cache
+
+def rules_for(platform):
+    rules = dict(PLATFORM_RULES.get(platform, {}))
+    rules.update(getattr(config, "PLATFORM_MEDIA_RULES", {}).get(platform, {}))
+    return rules
+
+def problems_for(info, platform):
+    """Why `info` (a probe result) can't go to `platform`; empty if it can"""
+    if info is None:
+        return []       # Not MP4/MOV: nothing we can check, let the platform decide
+    if "error" in info:
+        return [info["error"]]
+
+    rules = rules_for(platform)
+    problems = []
+    duration = info.get("duration") or None     # 0 means the file didn't say
+    width, height = info.get("width"), info.get("height")
+
+    if duration is not None and "max_duration" in rules and duration > rules["max_duration"]:
+        problems.append(f"{duration:.0f}s long (max {rules['max_duration']}s)")
+    if duration is not None and "min_duration" in rules and duration < rules["min_duration"]:
+        problems.append(f"{duration:.1f}s long (min {rules['min_duration']}s)")
+    if "max_size_mb" in rules and info["size"] > rules["max_size_mb"] * 1024 * 1024:
+        problems.append(f"{info['size'] / 1024 / 1024:.0f} MB (max {rules['max_size_mb']} MB)")
+    if rules.get("orientation") == "vertical" and width and height and width > height:
+        problems.append(f"landscape {width}x{height} (needs vertical)")
+    if "video_codecs" in rules and info.get("video_codec") not in rules["video_codecs"]:
+        problems.append(f"codec {info.get('video_codec')} (needs {'/'.join(rules['video_codecs'])})")
+    return problems
+
+def blocked_platforms(info, platforms=None):
+    """{platform: problems} for every platform the file can't be posted to"""
+    blocked = {}
+    for platform in platforms or PLATFORM_RULES:
+        problems = problems_for(info, platform)
+        if problems:
+            blocked[platform] = problems
+    return blocked
+
+def probe(path):
+    """Cached probe result for `path` (raises OSError if the file can't be read)"""
+    return get_cache().get(path)
+
+def check(path, platform):
+    """
+    Problems that would make this upload fail; run before opening a browser.
+    A file that can't be read or probed (often a copy still in progress) is
+    reported as "can't read ...", which error_classifier retries.
+    """
+    try:
+        info = probe(path)
+    except OSError as e:
+        return [f"can't read {path} ({e.strerror})"]
+    finally:
+        get_cache().save()
+    if info and "error" in info:
+        return [f"can't read {path} ({info['error']})"]
+    return problems_for(info, platform)
+
+def describe(info):
+    """One line summary, e.g. '1080x1920 avc1, 42s, 18 MB'"""
+    if not info or "error" in info:
+        return "unknown format"
+    duration = f"{info['duration']:.0f}s" if info.get("duration") is not None else "?s"
+    return f"{info['width']}x{info['height']} {info['video_codec']}, {duration}, {info['size'] / 1024 / 1024:.0f} MB"
\ No newline at end of file
@@ -0,0 +1,131 @@
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from playwright.sync_api import sync_playwright
+import utils.force_reset as force_reset
+import utils.bitbrowser as bitbrowser
+import utils.spans as spans
+
+class ProfileSession:
+    """One open BitBrowser profile with a live CDP connection"""
+
+    def __init__(self, profile_id, ws_url, browser):
+        self.profile_id = profile_id
+        self.ws_url = ws_url
+        self.browser = browser
+        self.opened_at = time.time()
+        self.last_used = time.time()
+        self.uses = 0
+
+    def get_page(self):
+        """Reuse the profile's first tab (opening one if it has none)"""
+        context = self.browser.contexts[0]
+        return context.pages[0] if context.pages else context.new_page()
+
+    def is_healthy(self):
+        """The CDP connection is alive and the page still answers"""
+        try:
+            if not self.browser.is_connected():
+                return False
+            self.get_page().evaluate("1")
+            return True
+        except Exception:
+            return False
+
+class ProfileSessionManager:
+    """
+    Keeps recently used BitBrowser profiles open and connected over CDP so
+    back-to-back posts on the same profile skip the close/open/connect churn.
+
+    Playwright's sync objects belong to the thread that created them, so use
+    one manager per thread (the scheduler gives each worker its own).
+    """
+
+    def __init__(self, max_open=3, idle_timeout=600):
+        self.max_open = max_open
+        self.idle_timeout = idle_timeout
+        self._playwright = None
+        self._sessions = OrderedDict()   # profile_id -> ProfileSession, oldest first
+
+    def _driver(self):
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+        return self._playwright
+
+    def _open(self, profile_id):
+        """Open the profile in BitBrowser and connect, hard-resetting once on failure"""
+        for attempt in range(2):
+            try:
+                spans.mark("browser_open")
+                ws_url = bitbrowser.open_profile(profile_id)
+                spans.mark("cdp_connect")
+                browser = self._driver().chromium.connect_over_cdp(ws_url)
+                print(f"   🌐 Opened profile {profile_id[:20]}...")
+                return ProfileSession(profile_id, ws_url, browser)
+            except Exception as e:
+                if attempt == 1:
+                    raise
+                print(f"   ⚠️ Could not connect to profile ({e}). Hard reset...")
+                force_reset.force_reset(profile_id)
+
+    def _close(self, session):
+        spans.mark("close")
+        try:
+            session.browser.close()
+        except Exception:
+            pass
+        bitbrowser.close_profile(session.profile_id)
+
+    def _make_room(self):
+        """Close least recently used sessions until one more fits under max_open"""
+        while len(self._sessions) >= self.max_open:
+            profile_id, session = self._sessions.popitem(last=False)
+            print(f"   🧊 Closing least recently used profile {profile_id[:20]}...")
+            self._close(session)
+
+    @contextmanager
+    def page(self, profile_id):
+        """
+        Yield a ready page for `profile_id`.
+        A warm session is reused if its health check passes. A failed check
+        falls back to a hard reset (force_reset) and a fresh connection.
+        """
+        session = self._sessions.pop(profile_id, None)
+
+        if session and session.is_healthy():
+            print(f"   🔥 Reusing warm session (use #{session.uses + 1})")
+        else:
+            if session:
+                print("   ♻️ Warm session failed health check. Hard reset...")
+                self._close(session)
+                force_reset.force_reset(profile_id)
+            self._make_room()
+            session = self._open(profile_id)
+
+        try:
+            yield session.get_page()
+        finally:
+            session.uses += 1
+            session.last_used = time.time()
+            self._sessions[profile_id] = session
+
+    def evict_idle(self):
+        """Close sessions that have not been used for idle_timeout seconds"""
+        now = time.time()
+        for profile_id, session in list(self._sessions.items()):
+            if now - session.last_used >= self.idle_timeout:
+                print(f"   🧊 Closing idle profile {profile_id[:20]}...")
+                del self._sessions[profile_id]
+                self._close(session)
+
+    def open_profiles(self):
+        """Profile IDs currently held open by this manager"""
+        return list(self._sessions)
+
+    def close_all(self):
+        for session in self._sessions.values():
+            self._close(session)
+        self._sessions.clear()
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
\ No newline at end of file
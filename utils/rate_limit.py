@@ -0,0 +1,141 @@
+import datetime
+import random
+import threading
+import config.config as config
+
+# Platform-wide limit on top of each account's own spacing: at most `burst`
+# posts at once, refilled at `per_hour`. Override per platform in config.py
+# with PLATFORM_RATE_LIMITS = {"TikTok": {"burst": 2, "per_hour": 20}}.
+DEFAULT_PLATFORM_LIMIT = {"burst": 5, "per_hour": 60}
+
+# Used for platforms missing from platform_windows
+DEFAULT_DELAY_MINUTES = (30, 180)
+
+class TokenBucket:
+    """
+    Holds up to `capacity` tokens and gains one every `refill_seconds`
+    (a number, or a function drawing a new interval for every token).
+    """
+
+    def __init__(self, capacity, refill_seconds, now):
+        self.capacity = capacity
+        self.refill_seconds = refill_seconds
+        self.tokens = capacity
+        self.updated = now
+        self.interval = self._draw()
+
+    def _draw(self):
+        return self.refill_seconds() if callable(self.refill_seconds) else self.refill_seconds
+
+    def _refill(self, now):
+        while self.tokens < self.capacity and now >= self.updated + datetime.timedelta(seconds=self.interval):
+            self.updated += datetime.timedelta(seconds=self.interval)
+            self.tokens += 1
+            self.interval = self._draw()
+        if self.tokens >= self.capacity:
+            self.updated = now
+
+    def ready_at(self, now):
+        """When the next token is available (`now` if one is)"""
+        self._refill(now)
+        if self.tokens >= 1:
+            return now
+        return self.updated + datetime.timedelta(seconds=self.interval)
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+    def refund(self, now):
+        """Give back a token that was taken but not used"""
+        self._refill(now)
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def empty_since(self, moment):
+        """Start empty, as if the last token was taken at `moment`"""
+        self.tokens = 0
+        self.updated = moment
+        self.interval = self._draw()
+
+class RateLimiter:
+    """
+    One bucket per account (capacity 1, refilled after a random
+    min_delay_minutes..max_delay_minutes from platform_windows) and one per
+    platform. Accounts only wait on their own spacing and their platform's
+    limit, never on unrelated accounts.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.lock = threading.Lock()
+        self.delays = {}            # platform -> (min_delay_minutes, max_delay_minutes)
+        self.accounts = {}          # account_id -> TokenBucket
+        self.platforms = {}         # platform -> TokenBucket
+
+    def set_windows(self, delays):
+        """{platform: (min_delay_minutes, max_delay_minutes)}; new values apply from the next refill"""
+        with self.lock:
+            self.delays = dict(delays)
+
+    def _account_spacing(self, platform):
+        low, high = self.delays.get(platform, DEFAULT_DELAY_MINUTES)
+        return random.uniform(low, max(low, high)) * 60
+
+    def _account_bucket(self, account_id, platform, now):
+        bucket = self.accounts.get(account_id)
+        if bucket is None:
+            bucket = self.accounts[account_id] = TokenBucket(1, lambda: self._account_spacing(platform), now)
+        return bucket
+
+    def _platform_bucket(self, platform, now):
+        bucket = self.platforms.get(platform)
+        if bucket is None:
+            limit = dict(DEFAULT_PLATFORM_LIMIT)
+            limit.update(getattr(config, "PLATFORM_RATE_LIMITS", {}).get(platform, {}))
+            bucket = self.platforms[platform] = TokenBucket(limit["burst"], 3600 / limit["per_hour"], now)
+        return bucket
+
+    def seed(self, last_posts, now):
+        """Resume spacing after a restart from [(account_id, platform, last_posted_at)]"""
+        with self.lock:
+            for account_id, platform, last_posted_at in last_posts:
+                if last_posted_at is not None and account_id not in self.accounts:
+                    self._account_bucket(account_id, platform, now).empty_since(last_posted_at)
+
+    def blocked(self, now):
+        """(account ids, platforms) that have no token right now"""
+        if not self.enabled:
+            return [], []
+        with self.lock:
+            accounts = [acc for acc, bucket in self.accounts.items() if bucket.ready_at(now) > now]
+            platforms = [p for p, bucket in self.platforms.items() if bucket.ready_at(now) > now]
+        return accounts, platforms
+
+    def take(self, account_id, platform, now):
+        """Spend the account's and the platform's token for a post starting now"""
+        if not self.enabled:
+            return
+        with self.lock:
+            self._account_bucket(account_id, platform, now).take(now)
+            self._platform_bucket(platform, now).take(now)
+
+    def refund(self, account_id, platform, now):
+        """Undo take() for a post that never reached the platform (e.g. failed preflight)"""
+        if not self.enabled:
+            return
+        with self.lock:
+            for bucket in (self.accounts.get(account_id), self.platforms.get(platform)):
+                if bucket is not None:
+                    bucket.refund(now)
+
+    def next_ready(self, now):
+        """Earliest moment an empty bucket gets a token again, or None"""
+        with self.lock:
+            moments = [bucket.ready_at(now) for bucket in list(self.accounts.values()) + list(self.platforms.values())]
+        moments = [moment for moment in moments if moment > now]
+        return min(moments) if moments else None
+
+    def account_ready_at(self, account_id, now):
+        with self.lock:
+            bucket = self.accounts.get(account_id)
+            return bucket.ready_at(now) if bucket else now
\ No newline at end of file
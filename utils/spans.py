@@ -0,0 +1,60 @@
+import time
+import contextvars
+
+# Stages of one post attempt, in order. Each is a post_attempts column (<stage>_ms).
+STAGES = ["browser_open", "cdp_connect", "navigate", "upload", "caption", "publish", "verify", "close"]
+
+_current = contextvars.ContextVar("stage_timer", default=None)
+
+class StageTimer:
+    """
+    Splits one post attempt into stages. mark(stage) ends the running stage
+    and starts the next; a stage that comes up twice (e.g. a reconnect)
+    adds to its total. Durations are kept in milliseconds.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.durations = {}
+        self._stage = None
+        self._stage_start = None
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        if self._stage is not None:
+            elapsed = (now - self._stage_start) * 1000
+            self.durations[self._stage] = self.durations.get(self._stage, 0) + elapsed
+        self._stage = stage
+        self._stage_start = now
+
+    def stop(self):
+        """End the running stage (call when the flow returns or fails)"""
+        self.mark(None)
+        self.finished_at = time.time()
+
+    def total_ms(self):
+        return int((getattr(self, "finished_at", time.time()) - self.started_at) * 1000)
+
+    def stage_ms(self, stage):
+        value = self.durations.get(stage)
+        return int(value) if value is not None else None
+
+def start():
+    """Start timing an attempt in this thread / asyncio task"""
+    timer = StageTimer()
+    _current.set(timer)
+    return timer
+
+def mark(stage):
+    """Mark the start of `stage` on the current attempt (no-op outside one, e.g. run_*_bot)"""
+    timer = _current.get()
+    if timer is not None:
+        timer.mark(stage)
+
+def finish():
+    """Stop the current attempt's timer and detach it"""
+    timer = _current.get()
+    if timer is not None:
+        timer.stop()
+        _current.set(None)
+    return timer
\ No newline at end of file
@@ -0,0 +1,163 @@
+import re
+import time
+import asyncio
+import random
+import config.config as config
+
+# Human-like pauses are a separate budget from waiting on the page.
+# `scale` multiplies every pause a flow asks for and `budget` caps the
+# total seconds of pauses in one post. Override per platform with
+# HUMAN_JITTER in config.py.
+DEFAULT_JITTER = {"scale": 0.3, "budget": 12.0}
+PLATFORM_JITTER = {
+    "youtube": {"scale": 0.3, "budget": 12.0},
+    "linkedin": {"scale": 0.3, "budget": 10.0},
+    "tiktok": {"scale": 0.3, "budget": 10.0},
+    "pinterest": {"scale": 0.3, "budget": 8.0},
+    "twitter": {"scale": 0.3, "budget": 8.0},
+}
+
+class JitterBudget:
+    """
+    Random pauses for one post. Each pause(min, max) draws from the same
+    range the flows always used, scaled by `scale`, and stops once the
+    post has spent `budget` seconds pausing.
+    """
+
+    def __init__(self, platform):
+        settings = dict(DEFAULT_JITTER)
+        settings.update(PLATFORM_JITTER.get(platform, {}))
+        settings.update(getattr(config, "HUMAN_JITTER", {}).get(platform, {}))
+        self.scale = settings["scale"]
+        self.remaining = settings["budget"]
+
+    def _draw(self, min_seconds, max_seconds):
+        delay = min(random.uniform(min_seconds, max_seconds) * self.scale, self.remaining)
+        self.remaining -= delay
+        return max(delay, 0)
+
+    def pause(self, min_seconds=1.5, max_seconds=4.0):
+        time.sleep(self._draw(min_seconds, max_seconds))
+
+    async def pause_async(self, min_seconds=1.5, max_seconds=4.0):
+        await asyncio.sleep(self._draw(min_seconds, max_seconds))
+
+# --- SYNC WAITS ---
+# Each returns True when the condition is met and False on timeout, so
+# flows can keep their own fallbacks. Timeouts are in milliseconds.
+
+def wait_visible(locator, timeout=30000):
+    try:
+        locator.first.wait_for(state="visible", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+def wait_hidden(locator, timeout=30000):
+    try:
+        locator.first.wait_for(state="hidden", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+def wait_enabled(locator, timeout=30000):
+    """Wait until the element exists and is enabled (e.g. a Post button after upload)"""
+    try:
+        handle = locator.element_handle(timeout=timeout)
+        handle.wait_for_element_state("enabled", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+def wait_text(page, pattern, timeout=30000):
+    """Wait for text matching the regex `pattern`, e.g. an upload reaching 100% or a toast"""
+    return wait_visible(page.get_by_text(re.compile(pattern)), timeout)
+
+def wait_network_idle(page, timeout=15000):
+    try:
+        page.wait_for_load_state("networkidle", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+def wait_url_leaves(page, fragment, timeout=15000):
+    """Wait until the page URL no longer contains `fragment` (a redirect after posting)"""
+    if fragment not in page.url:
+        return True
+    try:
+        page.wait_for_url(lambda url: fragment not in url, timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+def wait_any(locators, timeout=30000):
+    """Wait for the first of several locators to show. Returns its index, or None on timeout."""
+    combined = locators[0]
+    for locator in locators[1:]:
+        combined = combined.or_(locator)
+    if not wait_visible(combined, timeout):
+        return None
+    for i, locator in enumerate(locators):
+        try:
+            if locator.first.is_visible():
+                return i
+        except Exception:
+            pass
+    return None
+
+# --- ASYNC WAITS (same behaviour, for the asyncio engine) ---
+
+async def wait_visible_async(locator, timeout=30000):
+    try:
+        await locator.first.wait_for(state="visible", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+async def wait_hidden_async(locator, timeout=30000):
+    try:
+        await locator.first.wait_for(state="hidden", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+async def wait_enabled_async(locator, timeout=30000):
+    try:
+        handle = await locator.element_handle(timeout=timeout)
+        await handle.wait_for_element_state("enabled", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+async def wait_text_async(page, pattern, timeout=30000):
+    return await wait_visible_async(page.get_by_text(re.compile(pattern)), timeout)
+
+async def wait_network_idle_async(page, timeout=15000):
+    try:
+        await page.wait_for_load_state("networkidle", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+async def wait_url_leaves_async(page, fragment, timeout=15000):
+    if fragment not in page.url:
+        return True
+    try:
+        await page.wait_for_url(lambda url: fragment not in url, timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+async def wait_any_async(locators, timeout=30000):
+    combined = locators[0]
+    for locator in locators[1:]:
+        combined = combined.or_(locator)
+    if not await wait_visible_async(combined, timeout):
+        return None
+    for i, locator in enumerate(locators):
+        try:
+            if await locator.first.is_visible():
+                return i
+        except Exception:
+            pass
+    return None
\ No newline at end of file